@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Reproducible benchmarks for the matcher and cross-reactivity hot paths.
+
+Usage:
+    python benchmarks/bench_hot_paths.py run --output results.json
+    python benchmarks/bench_hot_paths.py run --quick --output quick.json
+    python benchmarks/bench_hot_paths.py compare baseline.json results.json --threshold 10
+
+`run` scans a seeded synthetic corpus (short, long, allergen-dense and
+allergen-free labels) with the real vocabulary and synthetic vocabularies of
+increasing size, times each operation individually and writes throughput,
+p50/p99 latency and peak traced memory per benchmark to JSON. `compare` diffs
+two such files.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import yaml  # noqa: E402
+
+from corpus import LABEL_KINDS, add_ocr_noise, make_labels, synthetic_vocabulary  # noqa: E402
+from food_inspector.matcher import IngredientMatcher  # noqa: E402
+from food_inspector.cross_reactivity import CrossReactivityChecker  # noqa: E402
+
+DEFAULT_VOCAB_SIZES = [100, 1000, 10000, 100000]
+QUICK_VOCAB_SIZES = [100, 1000]
+
+
+def _percentile(sorted_samples: Sequence[int], fraction: float) -> float:
+    """Nearest-rank percentile of pre-sorted samples."""
+    index = min(len(sorted_samples) - 1, max(0, int(round(fraction * len(sorted_samples))) - 1))
+    return sorted_samples[index]
+
+
+def measure(func: Callable, inputs: Sequence, repeat: int) -> Dict[str, float]:
+    """
+    Time func over every input, `repeat` times, and measure its peak memory.
+
+    Latency is measured per call. Peak memory comes from a separate pass under
+    tracemalloc, so tracing overhead does not distort the timings.
+
+    Returns:
+        Dictionary of ops, throughput_per_s, p50_us, p99_us and peak_memory_bytes
+    """
+    perf_counter_ns = time.perf_counter_ns
+    samples: List[int] = []
+    started = perf_counter_ns()
+    for _ in range(repeat):
+        for item in inputs:
+            begin = perf_counter_ns()
+            func(item)
+            samples.append(perf_counter_ns() - begin)
+    elapsed_ns = perf_counter_ns() - started
+
+    tracemalloc.start()
+    for item in inputs:
+        func(item)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    samples.sort()
+    return {
+        'ops': len(samples),
+        'throughput_per_s': round(len(samples) / (elapsed_ns / 1e9), 1),
+        'p50_us': round(_percentile(samples, 0.50) / 1000, 2),
+        'p99_us': round(_percentile(samples, 0.99) / 1000, 2),
+        'peak_memory_bytes': peak,
+    }
+
+
+def _write_vocabulary(vocabulary: Dict[str, List[str]], directory: str, name: str) -> str:
+    """Write a synthetic vocabulary to a YAML file and return its path."""
+    path = os.path.join(directory, f'{name}.yaml')
+    with open(path, 'w') as f:
+        yaml.safe_dump(vocabulary, f)
+    return path
+
+
+def bench_matchers(args, results: Dict[str, Dict], workdir: str):
+    """Benchmark IngredientMatcher scans over every vocabulary and engine."""
+    vocabularies = [('real', None)]
+    for size in args.vocab_sizes:
+        vocabulary = synthetic_vocabulary(size, args.seed)
+        vocabularies.append((str(size), _write_vocabulary(vocabulary, workdir, f'vocab_{size}')))
+
+    for vocab_name, synonyms_file in vocabularies:
+        for engine in args.engines:
+            if engine == 'regex' and vocab_name != 'real' and int(vocab_name) > args.regex_max_vocab:
+                continue  # One regex pass per synonym: far too slow at this size
+
+            build_started = time.perf_counter()
+            matcher = IngredientMatcher(synonyms_file, engine=engine)
+            build_ms = round((time.perf_counter() - build_started) * 1000, 2)
+            print(f"vocab={vocab_name} engine={engine}: built in {build_ms} ms", file=sys.stderr)
+
+            terms = sorted(matcher.reverse_map)
+            categories = list(matcher.synonyms)
+            rng = random.Random(f'{args.seed}:{vocab_name}')
+            tag = f'engine={engine},vocab={vocab_name}'
+
+            results[f'build[{tag}]'] = {'build_ms': build_ms, 'synonyms': len(terms)}
+
+            for kind in LABEL_KINDS:
+                labels = make_labels(kind, args.labels, args.seed, terms)
+                results[f'scan_text[{tag},labels={kind}]'] = measure(matcher.scan_text, labels, args.repeat)
+
+            short_labels = make_labels('short', args.labels, args.seed, terms)
+            pairs = [(label, rng.choice(categories)) for label in short_labels]
+            results[f'find_allergen_category[{tag}]'] = measure(
+                lambda pair: matcher.find_allergen_category(*pair), pairs, args.repeat)
+
+            pairs = [(label, rng.choice(terms)) for label in short_labels]
+            results[f'find_ingredient[{tag}]'] = measure(
+                lambda pair: matcher.find_ingredient(*pair), pairs, args.repeat)
+
+
+def bench_fuzzy(args, results: Dict[str, Dict]):
+    """Benchmark OCR-tolerant scan_fuzzy against exact scan_text on noisy labels."""
+    for distance in args.fuzzy_distances:
+        matcher = IngredientMatcher(engine='automaton', fuzzy_max_distance=distance)
+        terms = sorted(matcher.reverse_map)
+        for kind in ('short', 'long'):
+            labels = add_ocr_noise(make_labels(kind, args.labels, args.seed, terms), args.seed)
+            results[f'scan_fuzzy[distance={distance},labels={kind}]'] = measure(
+                matcher.scan_fuzzy, labels, args.repeat)
+            results[f'scan_text[engine=automaton,fuzzy={distance},labels={kind}-ocr]'] = measure(
+                matcher.scan_text, labels, args.repeat)
+
+
+def bench_checker(args, results: Dict[str, Dict]):
+    """Benchmark CrossReactivityChecker queries."""
+    checker = CrossReactivityChecker()
+    rng = random.Random(f'{args.seed}:checker')
+    allergens = sorted({r.source for r in checker.rules} | {r.target for r in checker.rules} | {'unknown'})
+    confidences = [None, 'low', 'medium', 'high']
+    count = args.labels * 10
+
+    queries = [(rng.choice(allergens), rng.choice(confidences)) for _ in range(count)]
+    results['get_potential_reactions'] = measure(
+        lambda q: checker.get_potential_reactions(*q), queries, args.repeat)
+    results['get_sources_for_target'] = measure(
+        lambda q: checker.get_sources_for_target(*q), queries, args.repeat)
+
+    pairs = [(rng.choice(allergens), rng.choice(allergens)) for _ in range(count)]
+    results['check_cross_reactivity'] = measure(
+        lambda p: checker.check_cross_reactivity(*p), pairs, args.repeat)
+
+    levels = [rng.choice(confidences[1:]) for _ in range(count)]
+    results['get_rules_by_confidence'] = measure(checker.get_rules_by_confidence, levels, args.repeat)
+
+    warnings = [(rng.choice(allergens), rng.choice(confidences[1:])) for _ in range(count)]
+    results['format_warnings'] = measure(lambda q: checker.format_warnings(*q), warnings, args.repeat)
+
+
+def run(args):
+    """Run all benchmarks and write the JSON report."""
+    if args.quick:
+        args.vocab_sizes = args.vocab_sizes or QUICK_VOCAB_SIZES
+        args.labels = min(args.labels, 50)
+        args.repeat = 1
+    args.vocab_sizes = args.vocab_sizes or DEFAULT_VOCAB_SIZES
+
+    results: Dict[str, Dict] = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        bench_matchers(args, results, workdir)
+    bench_fuzzy(args, results)
+    bench_checker(args, results)
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'labels': args.labels,
+            'repeat': args.repeat,
+            'vocab_sizes': args.vocab_sizes,
+            'engines': args.engines,
+            'fuzzy_distances': args.fuzzy_distances,
+        },
+        'results': results,
+    }
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+        f.write('\n')
+    print(f"✓ Wrote {len(results)} benchmark results to {args.output}", file=sys.stderr)
+
+
+def compare(args) -> int:
+    """Print the differences between two reports; return an exit code."""
+    with open(args.baseline) as f:
+        baseline = json.load(f)['results']
+    with open(args.candidate) as f:
+        candidate = json.load(f)['results']
+
+    regressions = 0
+    print(f"{'benchmark':<70} {'throughput':>11} {'p50':>9} {'p99':>9} {'memory':>9}")
+    for name in sorted(set(baseline) & set(candidate)):
+        old, new = baseline[name], candidate[name]
+        if 'throughput_per_s' not in old or 'throughput_per_s' not in new:
+            continue
+
+        def change(key):
+            return (new[key] - old[key]) / old[key] * 100 if old[key] else 0.0
+
+        throughput = change('throughput_per_s')
+        flagged = throughput < -args.threshold or change('p99_us') > args.threshold
+        regressions += flagged
+        print(f"{name:<70} {throughput:+10.1f}% {change('p50_us'):+8.1f}% "
+              f"{change('p99_us'):+8.1f}% {change('peak_memory_bytes'):+8.1f}%"
+              f"{'  ✗' if flagged else ''}")
+
+    for name in sorted(set(baseline) ^ set(candidate)):
+        print(f"{name:<70} only in {'baseline' if name in baseline else 'candidate'}")
+
+    if regressions:
+        print(f"\n✗ {regressions} benchmark(s) regressed by more than {args.threshold}%")
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark food_inspector hot paths')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Run the benchmarks')
+    run_parser.add_argument('--output', default='bench_results.json', help='JSON report path')
+    run_parser.add_argument('--seed', type=int, default=1234, help='Corpus seed (default: 1234)')
+    run_parser.add_argument('--labels', type=int, default=200, help='Labels per corpus kind (default: 200)')
+    run_parser.add_argument('--repeat', type=int, default=3, help='Timed passes over each corpus (default: 3)')
+    run_parser.add_argument('--vocab-sizes', type=int, nargs='+',
+                            help=f'Synthetic vocabulary sizes (default: {DEFAULT_VOCAB_SIZES})')
+    run_parser.add_argument('--engines', nargs='+', default=['regex', 'automaton'],
+                            choices=['regex', 'automaton'], help='Matcher engines to benchmark')
+    run_parser.add_argument('--regex-max-vocab', type=int, default=1000,
+                            help='Largest synthetic vocabulary to run the regex engine on (default: 1000)')
+    run_parser.add_argument('--fuzzy-distances', type=int, nargs='*', default=[1, 2],
+                            help='Maximum edit distances to benchmark scan_fuzzy with (default: 1 2)')
+    run_parser.add_argument('--quick', action='store_true', help='Small, fast run for smoke testing')
+
+    compare_parser = subparsers.add_parser('compare', help='Diff two reports')
+    compare_parser.add_argument('baseline', help='Baseline JSON report')
+    compare_parser.add_argument('candidate', help='Candidate JSON report')
+    compare_parser.add_argument('--threshold', type=float, default=10.0,
+                                help='Flag throughput drops or p99 increases above this percentage (default: 10)')
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        run(args)
+    else:
+        sys.exit(compare(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the food_inspector package.
+
+Runs each import statement in fresh interpreters with ``-X importtime`` and
+reports the cumulative time attributed to the top-level ``food_inspector``
+import, so regressions in start-up cost are visible.
+
+Usage:
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --runs 30 --max-ms 1.0 --output import.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / 'src'
+
+STATEMENTS = {
+    'package': 'import food_inspector',
+    'matcher': 'from food_inspector import IngredientMatcher',
+    'checker': 'from food_inspector import CrossReactivityChecker',
+}
+
+
+def measure(statement: str):
+    """
+    Run a statement in a fresh interpreter.
+
+    Returns:
+        Tuple (cumulative food_inspector import time in ms, set of top-level
+        modules imported)
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(SRC_DIR), env.get('PYTHONPATH')]))
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        env=env, capture_output=True, text=True, check=True,
+    )
+
+    # Lines look like "import time:  self [us] | cumulative | name"
+    total_us = 0
+    modules = set()
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        name = fields[2].strip()
+        modules.add(name.split('.')[0])
+        if name == 'food_inspector' or name.startswith('food_inspector.'):
+            if fields[2].startswith(' ' * 2):
+                continue  # Nested import, already counted by its parent
+            total_us += int(fields[1])
+    return total_us / 1000, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure food_inspector import time')
+    parser.add_argument('--runs', type=int, default=15, help='Interpreter runs per statement (default: 15)')
+    parser.add_argument('--max-ms', type=float, help='Exit non-zero if the package import median exceeds this')
+    parser.add_argument('--output', type=str, help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    _, startup_modules = measure('pass')
+
+    results = {}
+    for label, statement in STATEMENTS.items():
+        runs = [measure(statement) for _ in range(args.runs)]
+        samples = [elapsed for elapsed, _ in runs]
+        results[label] = {
+            'statement': statement,
+            'min_ms': round(min(samples), 3),
+            'median_ms': round(statistics.median(samples), 3),
+            'imports': sorted(runs[0][1] - startup_modules),
+        }
+        print(f"{label:<10} median {results[label]['median_ms']:8.3f} ms   "
+              f"min {results[label]['min_ms']:8.3f} ms   ({statement})")
+        print(f"{'':<10} imports: {', '.join(results[label]['imports'])}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+
+    if args.max_ms is not None and results['package']['median_ms'] > args.max_ms:
+        print(f"✗ import food_inspector took {results['package']['median_ms']} ms "
+              f"(limit {args.max_ms} ms)", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+"""
+Seeded synthetic corpora for the benchmarks.
+
+Everything here is driven by an explicit random.Random, so the same seed
+always produces the same vocabularies and labels.
+"""
+
+import random
+from typing import Dict, List
+
+# Ordinary ingredients that never appear in the real or synthetic vocabularies
+FILLER_INGREDIENTS = [
+    'sugar', 'salt', 'water', 'vinegar', 'rice', 'potato starch', 'citric acid',
+    'ascorbic acid', 'natural flavors', 'paprika', 'turmeric', 'garlic powder',
+    'onion powder', 'black pepper', 'sunflower oil', 'cane sugar', 'tapioca',
+    'baking soda', 'yeast extract', 'tomato paste', 'carrot', 'celery salt',
+    'dextrose', 'xanthan gum', 'guar gum', 'pectin', 'beet juice', 'spinach',
+]
+
+LABEL_KINDS = ('short', 'long', 'dense', 'none')
+
+_SYLLABLES = [
+    'ba', 'ce', 'di', 'fo', 'gu', 'ha', 'je', 'ki', 'lo', 'mu', 'na', 'pe',
+    'qui', 'ro', 'su', 'ta', 've', 'wi', 'xo', 'yu', 'za', 'bri', 'clo', 'dra',
+]
+
+
+def _pseudo_word(rng: random.Random) -> str:
+    """Make a pronounceable nonsense word that cannot collide with fillers."""
+    return ''.join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))) + 'x'
+
+
+def synthetic_vocabulary(size: int, seed: int, synonyms_per_category: int = 25) -> Dict[str, List[str]]:
+    """
+    Build a synonym dictionary with exactly `size` distinct synonyms.
+
+    About a fifth of the synonyms are two-word phrases, like "milk solids" in
+    the real dictionary.
+
+    Args:
+        size: Total number of synonyms
+        seed: Random seed
+        synonyms_per_category: Synonyms per category
+
+    Returns:
+        Mapping of category name to synonyms, as in ingredient_synonyms.yaml
+    """
+    rng = random.Random(seed)
+    seen = set()
+    vocabulary: Dict[str, List[str]] = {}
+
+    while len(seen) < size:
+        term = _pseudo_word(rng)
+        if rng.random() < 0.2:
+            term += ' ' + _pseudo_word(rng)
+        if term in seen:
+            continue
+        seen.add(term)
+        category = f'category_{(len(seen) - 1) // synonyms_per_category:05d}'
+        vocabulary.setdefault(category, []).append(term)
+
+    return vocabulary
+
+
+def _item(rng: random.Random, terms: List[str], allergen_ratio: float) -> str:
+    """Pick one ingredient list item, maybe with a parenthesised sub-list."""
+    if terms and rng.random() < allergen_ratio:
+        item = rng.choice(terms)
+    else:
+        item = rng.choice(FILLER_INGREDIENTS)
+    if rng.random() < 0.1:
+        item = item.upper()
+    if rng.random() < 0.1:
+        item += ' (' + ', '.join(rng.choice(FILLER_INGREDIENTS) for _ in range(rng.randint(1, 3))) + ')'
+    return item
+
+
+def make_label(kind: str, rng: random.Random, terms: List[str]) -> str:
+    """
+    Make one ingredient label.
+
+    Args:
+        kind: 'short' (a few items), 'long' (several paragraphs), 'dense'
+              (mostly allergens) or 'none' (no allergens at all)
+        rng: Random generator
+        terms: Vocabulary terms allergens are drawn from
+
+    Returns:
+        Label text
+    """
+    if kind == 'short':
+        items = [_item(rng, terms, 0.3) for _ in range(rng.randint(3, 8))]
+        return 'Ingredients: ' + ', '.join(items) + '.'
+    if kind == 'long':
+        paragraphs = []
+        for _ in range(rng.randint(3, 6)):
+            items = [_item(rng, terms, 0.15) for _ in range(rng.randint(20, 40))]
+            paragraphs.append('Ingredients: ' + ', '.join(items) + '.')
+        return '\n\n'.join(paragraphs)
+    if kind == 'dense':
+        items = [_item(rng, terms, 0.8) for _ in range(20)]
+        return 'Contains: ' + ', '.join(items) + '.'
+    if kind == 'none':
+        items = [_item(rng, [], 0.0) for _ in range(rng.randint(10, 20))]
+        return 'Ingredients: ' + ', '.join(items) + '.'
+    raise ValueError(f"Unknown label kind '{kind}': expected one of {list(LABEL_KINDS)}.")
+
+
+def make_labels(kind: str, count: int, seed: int, terms: List[str]) -> List[str]:
+    """
+    Make `count` labels of one kind.
+
+    Args:
+        kind: Label kind (see make_label)
+        count: Number of labels
+        seed: Random seed
+        terms: Vocabulary terms allergens are drawn from
+
+    Returns:
+        List of label texts
+    """
+    rng = random.Random(f'{seed}:{kind}')
+    return [make_label(kind, rng, terms) for _ in range(count)]
+
+
+def add_ocr_noise(labels: List[str], seed: int, rate: float = 0.05) -> List[str]:
+    """
+    Corrupt labels the way OCR does: substituted, dropped and doubled letters.
+
+    Args:
+        labels: Clean label texts
+        seed: Random seed
+        rate: Probability that any one letter is corrupted
+
+    Returns:
+        Noisy copies of the labels
+    """
+    rng = random.Random(f'{seed}:ocr')
+    noisy = []
+    for label in labels:
+        chars = []
+        for char in label:
+            if char.isalpha() and rng.random() < rate:
+                edit = rng.randint(0, 2)
+                if edit == 0:
+                    chars.append(rng.choice('abcdefghijklmnopqrstuvwxyz'))
+                elif edit == 2:
+                    chars.append(char + char)
+                continue
+            chars.append(char)
+        noisy.append(''.join(chars))
+    return noisy
@@ -12,11 +12,19 @@ setup(
         "pyyaml>=5.4.0",
     ],
     extras_require={
+        "profiles": [
+            "numpy>=1.17",
+        ],
         "dev": [
             "pytest>=6.2.0",
             "pytest-cov>=2.12.0",
         ],
     },
+    entry_points={
+        "console_scripts": [
+            "food-inspector=food_inspector.cli:main",
+        ],
+    },
     package_data={
         "": ["data/*.yaml"],
     },
@@ -1,10 +1,41 @@
 """
 Food Inspector Package
 Provides ingredient analysis with synonym matching and cross-reactivity detection.
-"""
 
-from .matcher import IngredientMatcher
-from .cross_reactivity import CrossReactivityChecker
+Public classes are imported lazily on first attribute access (PEP 562), so
+``import food_inspector`` does not pull in PyYAML or the matching machinery
+until they are actually used.
+"""
 
 __version__ = "0.1.0"
-__all__ = ["IngredientMatcher", "CrossReactivityChecker"]
+__all__ = ["IngredientMatcher", "CrossReactivityChecker", "Analyzer"]
+
+# Maps each lazily exported name to the submodule defining it
+_LAZY_ATTRIBUTES = {
+    "IngredientMatcher": "matcher",
+    "CrossReactivityChecker": "cross_reactivity",
+    "Analyzer": "analysis",
+}
+
+# Same meaning as typing.TYPE_CHECKING without importing typing at runtime
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .matcher import IngredientMatcher
+    from .cross_reactivity import CrossReactivityChecker
+    from .analysis import Analyzer
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from importlib import import_module
+
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # Later lookups bypass __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
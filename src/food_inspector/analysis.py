@@ -0,0 +1,190 @@
+"""
+Combined Allergen Analysis
+Scans a label once and resolves direct and cross-reactive hits in one call.
+"""
+
+from array import array
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from .cross_reactivity import CrossReactivityChecker, CrossReactivityRule
+from .matcher import IngredientMatcher
+from .results import ScanMatches
+
+
+class AnalysisResult:
+    """
+    Direct and cross-reactive hits for one text.
+
+    Direct matches keep the compact span table of scan_compact(); cross-reactive
+    hits are the rules leading from a detected category to an allergen that
+    was not itself detected.
+    """
+
+    __slots__ = ('matches', 'direct', 'cross_reactive')
+
+    def __init__(self, matches: ScanMatches, direct: Tuple[str, ...],
+                 cross_reactive: Tuple[CrossReactivityRule, ...]):
+        """
+        Args:
+            matches: Span table of the direct matches
+            direct: Detected categories, in category id order
+            cross_reactive: Rules from detected categories to undetected
+                            allergens, grouped by source in category id order
+        """
+        self.matches = matches
+        self.direct = direct
+        self.cross_reactive = cross_reactive
+
+    def __bool__(self) -> bool:
+        return bool(self.direct or self.cross_reactive)
+
+    def __repr__(self):
+        return (f"AnalysisResult(direct={self.direct!r}, "
+                f"cross_reactive={self.cross_reactive_targets()!r})")
+
+    def cross_reactive_targets(self) -> Tuple[str, ...]:
+        """
+        Get the distinct cross-reactive allergens, in first-seen order.
+
+        Returns:
+            Tuple of allergen names
+        """
+        return tuple(dict.fromkeys(rule.target for rule in self.cross_reactive))
+
+    def to_dict(self) -> Dict[str, Dict]:
+        """
+        Convert to plain dictionaries.
+
+        Returns:
+            Dictionary with 'direct' in the scan_text() shape and
+            'cross_reactive' mapping each target to its (source, confidence) pairs
+        """
+        cross_reactive: Dict[str, List[Tuple[str, str]]] = {}
+        for rule in self.cross_reactive:
+            cross_reactive.setdefault(rule.target, []).append((rule.source, rule.confidence))
+        return {'direct': self.matches.to_dict(), 'cross_reactive': cross_reactive}
+
+
+class Analyzer:
+    """
+    Runs a matcher and a cross-reactivity checker as one pipeline.
+
+    The cross-reactivity rules of every matcher category are looked up once
+    per confidence level and stored in a table indexed by category id, so an
+    analysis costs one scan plus a table lookup per detected category. The
+    table is rebuilt when either side is reloaded.
+    """
+
+    def __init__(self, matcher: Optional[IngredientMatcher] = None,
+                 checker: Optional[CrossReactivityChecker] = None):
+        """
+        Initialize the analyzer.
+
+        Args:
+            matcher: Matcher to scan with (default: IngredientMatcher())
+            checker: Checker supplying the rules (default: CrossReactivityChecker())
+        """
+        self.matcher = matcher if matcher is not None else IngredientMatcher()
+        self.checker = checker if checker is not None else CrossReactivityChecker()
+        # (category names, rule index, {level: rules by category id})
+        self._table: Optional[Tuple[Tuple[str, ...], object,
+                                    Dict[int, Tuple[Tuple[CrossReactivityRule, ...], ...]]]] = None
+
+    def _reaction_table(self, categories: Tuple[str, ...]) -> Dict[int, Tuple[Tuple[CrossReactivityRule, ...], ...]]:
+        """Rules per confidence level and category id for the given category names."""
+        rule_index = self.checker._index
+        table = self._table
+        if table is not None and table[0] is categories and table[1] is rule_index:
+            return table[2]
+
+        reactions_at = rule_index.reactions_at
+        reactions = {
+            level: tuple(tuple(reactions_at.get((category, level), ())) for category in categories)
+            for level in CrossReactivityChecker.CONFIDENCE_LEVELS.values()
+        }
+        # One assignment, so concurrent analyses see either table whole
+        self._table = (categories, rule_index, reactions)
+        return reactions
+
+    @staticmethod
+    def _confidence_level(min_confidence: str) -> int:
+        """The numeric level of a confidence name, validated."""
+        level = CrossReactivityChecker.CONFIDENCE_LEVELS.get(min_confidence)
+        if level is None:
+            raise ValueError(
+                f"Unknown confidence level {min_confidence!r}. "
+                f"Use one of: {', '.join(CrossReactivityChecker.CONFIDENCE_LEVELS)}"
+            )
+        return level
+
+    def _cross_reactive(self, categories: Tuple[str, ...], detected_ids: List[int], level: int,
+                        allowed: Optional[FrozenSet[str]] = None) -> Tuple[CrossReactivityRule, ...]:
+        """Rules from the detected category ids to allergens that were not detected themselves."""
+        detected = {categories[i] for i in detected_ids}
+        rules_by_category = self._reaction_table(categories)[level]
+        return tuple(
+            rule
+            for category_id in detected_ids
+            for rule in rules_by_category[category_id]
+            if rule.target not in detected and (allowed is None or rule.target in allowed)
+        )
+
+    def cross_reactions(self, detected: Iterable[str],
+                        min_confidence: str = 'low') -> Tuple[CrossReactivityRule, ...]:
+        """
+        Resolve the cross-reactive hits of categories found by another scan.
+
+        For callers that already have scan results, e.g. from scan_text() or
+        scan_stream(), and only need the cross-reactive half of analyze().
+
+        Args:
+            detected: Detected categories, e.g. the keys of a scan_text() result
+            min_confidence: Minimum confidence of reported cross-reactions
+                            ('low', 'medium', 'high')
+
+        Returns:
+            Rules from detected categories to undetected allergens, grouped by
+            source in category id order, as in AnalysisResult.cross_reactive
+        """
+        level = self._confidence_level(min_confidence)
+        categories = self.matcher._index.category_names
+        detected = frozenset(detected)
+        detected_ids = [i for i, category in enumerate(categories) if category in detected]
+        return self._cross_reactive(categories, detected_ids, level)
+
+    def analyze(self, text: str, profile: Optional[Iterable[str]] = None,
+                min_confidence: str = 'low') -> AnalysisResult:
+        """
+        Scan text once and resolve its direct and cross-reactive hits.
+
+        Args:
+            text: The text to scan (e.g., full ingredient list)
+            profile: Allergens to report (categories or rule targets); None
+                     reports everything
+            min_confidence: Minimum confidence of reported cross-reactions
+                            ('low', 'medium', 'high')
+
+        Returns:
+            AnalysisResult with the direct matches and cross-reactive rules
+        """
+        level = self._confidence_level(min_confidence)
+        allowed: Optional[FrozenSet[str]] = frozenset(profile) if profile is not None else None
+
+        matches = self.matcher.scan_compact(text)
+        categories = matches.category_names
+        spans = matches.spans
+        stride = ScanMatches.STRIDE
+        detected_ids = sorted(set(spans[0::stride]))
+
+        if allowed is not None:
+            keep = {i for i in detected_ids if categories[i] in allowed}
+            if len(keep) < len(detected_ids):
+                filtered = array('i')
+                for base in range(0, len(spans), stride):
+                    if spans[base] in keep:
+                        filtered.extend(spans[base:base + stride])
+                matches = ScanMatches(matches.text, categories, matches.synonym_names, filtered)
+
+        cross_reactive = self._cross_reactive(categories, detected_ids, level, allowed)
+        direct = tuple(categories[i] for i in detected_ids if allowed is None or categories[i] in allowed)
+        return AnalysisResult(matches, direct, cross_reactive)
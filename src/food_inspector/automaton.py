@@ -0,0 +1,141 @@
+"""
+Aho-Corasick Automaton for Single-Pass Multi-Term Matching
+"""
+
+from collections import deque
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+
+def _is_word_char(char: str) -> bool:
+    """Return True if char counts as a word character for regex ``\\b``."""
+    return char.isalnum() or char == '_'
+
+
+def lower_preserving_offsets(text: str) -> str:
+    """
+    Lowercase text without changing its length.
+
+    ``str.lower`` expands 'İ' to 'i' plus a combining dot, which would shift
+    every offset after it. Such characters are mapped to the first character
+    of their lowercase form instead, which is also what regex IGNORECASE
+    compares them as. Terms must be folded with this same function so that
+    they line up with folded text.
+
+    Args:
+        text: The text to lowercase
+
+    Returns:
+        Lowercased text with the same length as the input
+    """
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return ''.join(c.lower()[0] for c in text)
+
+
+class AhoCorasickAutomaton:
+    """
+    Finds every occurrence of a set of terms in one linear pass over the text.
+
+    Terms are matched literally against the text passed to ``iter_matches``;
+    callers are responsible for case folding both sides the same way. Each
+    reported occurrence satisfies the same word-boundary rule as regex ``\\b``
+    on both ends.
+    """
+
+    def __init__(self, terms: Sequence[str]):
+        """
+        Build the automaton.
+
+        Args:
+            terms: Terms to match. A term's index in this sequence is the id
+                   reported by ``iter_matches``. Empty terms are ignored.
+        """
+        self.terms: Tuple[str, ...] = tuple(terms)
+        self.max_term_length = max((len(t) for t in self.terms), default=0)
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[int, ...]] = [()]
+
+        self._build()
+
+    def _build(self):
+        """Build the trie, failure links and merged outputs."""
+        goto = self._goto
+        outputs: List[List[int]] = [[]]
+
+        for term_id, term in enumerate(self.terms):
+            if not term:
+                continue
+            state = 0
+            for char in term:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto.append({})
+                    outputs.append([])
+                    goto[state][char] = next_state
+                state = next_state
+            outputs[state].append(term_id)
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(char, 0)
+                # Inherit matches that end at the fallback state (suffix terms)
+                outputs[next_state].extend(outputs[fail[next_state]])
+
+        self._fail = fail
+        self._output = [tuple(o) for o in outputs]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """
+        Yield every word-bounded occurrence of every term in text.
+
+        Args:
+            text: The (already case-folded) text to search
+
+        Yields:
+            Tuples (term_id, start_pos, end_pos), ordered by end position
+        """
+        terms = self.terms
+        text_length = len(text)
+
+        for end, hits in self._walk(text):
+            after_is_word = end < text_length and _is_word_char(text[end])
+            for term_id in hits:
+                term = terms[term_id]
+                start = end - len(term)
+                # Emulate \b on both ends: word-ness must flip across the edge
+                before_is_word = start > 0 and _is_word_char(text[start - 1])
+                if before_is_word == _is_word_char(term[0]):
+                    continue
+                if after_is_word == _is_word_char(term[-1]):
+                    continue
+                yield term_id, start, end
+
+    def _walk(self, text: str) -> Iterator[Tuple[int, Sequence[int]]]:
+        """Yield (end position, term ids) wherever a term ends, before boundary checks."""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+
+        for index, char in enumerate(text):
+            next_state = goto[state].get(char)
+            while next_state is None and state:
+                state = fail[state]
+                next_state = goto[state].get(char)
+            state = next_state or 0
+
+            hits = output[state]
+            if hits:
+                yield index + 1, hits
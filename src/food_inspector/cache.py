@@ -0,0 +1,157 @@
+"""
+Bounded LRU Cache for Scan Results
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
+
+ScanResult = Dict[str, Dict[str, List[Tuple[str, int, int]]]]
+
+# Rough per-object overheads (CPython, 64-bit) used to estimate entry sizes
+_ENTRY_OVERHEAD = 240
+_SYNONYM_OVERHEAD = 160
+_MATCH_OVERHEAD = 120
+
+
+def text_digest(text: str) -> bytes:
+    """
+    Hash a text for use in a cache key.
+
+    The exact text is hashed: results hold positions and the matched text, so
+    two inputs may only share an entry if they are identical.
+
+    Args:
+        text: The scanned text
+
+    Returns:
+        16-byte BLAKE2b digest
+    """
+    return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+
+def estimate_result_size(result: ScanResult) -> int:
+    """Approximate the memory held by a cached scan result, in bytes."""
+    size = _ENTRY_OVERHEAD
+    for synonyms in result.values():
+        for synonym, matches in synonyms.items():
+            size += _SYNONYM_OVERHEAD + len(synonym)
+            for matched_text, _, _ in matches:
+                size += _MATCH_OVERHEAD + len(matched_text)
+    return size
+
+
+def copy_result(result: ScanResult) -> ScanResult:
+    """Copy the mutable containers of a scan result (match tuples are shared)."""
+    return {
+        category: {synonym: list(matches) for synonym, matches in synonyms.items()}
+        for category, synonyms in result.items()
+    }
+
+
+class ScanCache:
+    """
+    LRU cache of scan results bounded by entry count and approximate size.
+
+    Keys combine the matcher's vocabulary fingerprint with a digest of the
+    text, so one cache can be shared by several matchers, and entries from a
+    previous vocabulary simply stop being hit after a reload and age out.
+    """
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached results
+            max_bytes: Maximum approximate memory held by cached results
+        """
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be at least 1, got {max_entries}.")
+        if max_bytes < 1:
+            raise ValueError(f"max_bytes must be at least 1, got {max_bytes}.")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[Hashable, Tuple[ScanResult, int]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[ScanResult]:
+        """
+        Look up a result and mark it as recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            A copy of the cached result, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy_result(entry[0])
+
+    def put(self, key: Hashable, result: ScanResult):
+        """
+        Store a result, evicting least recently used entries to stay in bounds.
+
+        Results larger than max_bytes on their own are not cached.
+
+        Args:
+            key: Cache key
+            result: Scan result; a copy is stored
+        """
+        size = estimate_result_size(result)
+        if size > self.max_bytes:
+            return
+        stored = copy_result(result)
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (stored, size)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get cache statistics for sizing.
+
+        Returns:
+            Dictionary with entries, approx_bytes, hits, misses, evictions and
+            hit_rate (0.0 when nothing has been looked up yet)
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'approx_bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
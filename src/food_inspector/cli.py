@@ -0,0 +1,196 @@
+"""
+Command-Line Interface
+
+    food-inspector scan [INPUT ...] [--jobs N] [--warnings] ...
+
+Scans labels from stdin, files or globs and writes one NDJSON result per
+label to stdout, with a throughput summary on stderr.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from .matcher import ENGINES, IngredientMatcher
+from .streaming import RECORD_FORMATS, _record_text, iter_records
+
+# Input name that stands for standard input
+STDIN = '-'
+
+
+def _expand_inputs(patterns: Sequence[str]) -> List[str]:
+    """Expand globs (for shells that did not) and check that plain paths exist."""
+    if not patterns:
+        return [STDIN]
+
+    inputs = []
+    for pattern in patterns:
+        if pattern == STDIN:
+            inputs.append(pattern)
+        elif glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+            if not matches:
+                raise FileNotFoundError(f"No files match '{pattern}'.")
+            inputs.extend(matches)
+        elif os.path.exists(pattern):
+            inputs.append(pattern)
+        else:
+            raise FileNotFoundError(f"Input file not found: {pattern}")
+    return inputs
+
+
+def _iter_labels(inputs: Sequence[str], format: Optional[str], field: Optional[str],
+                 id_field: Optional[str]) -> Iterator[Dict[str, Any]]:
+    """Yield one dictionary per label: where it came from and its text."""
+    for name in inputs:
+        source = sys.stdin if name == STDIN else name
+        fmt = format or ('text' if name == STDIN else None)
+        for number, record in enumerate(iter_records(source, fmt), start=1):
+            label = {'source': name, 'record': number}
+            if id_field is not None and isinstance(record, dict):
+                label['id'] = record.get(id_field)
+            # Plain-text lines are the label whatever --field says
+            label['text'] = _record_text(record, None if isinstance(record, str) else field)
+            yield label
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='food-inspector',
+        description='Scan food labels for allergens and cross-reactivity risks'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    scan = subparsers.add_parser(
+        'scan',
+        help='Scan labels and write one NDJSON result per label',
+        description='Scan labels from stdin, files or globs and write one NDJSON result per label.'
+    )
+    scan.add_argument(
+        'inputs', nargs='*', metavar='INPUT',
+        help="Files or glob patterns to scan; '-' or no inputs reads stdin"
+    )
+    scan.add_argument(
+        '--format', choices=RECORD_FORMATS,
+        help="Input format: one label per line, JSONL or CSV (default: from the "
+             "file extension; 'text' for stdin)"
+    )
+    scan.add_argument('--field', help='Record field holding the label text (JSONL/CSV)')
+    scan.add_argument('--id-field', help='Record field to copy into each result as "id" (JSONL/CSV)')
+    scan.add_argument(
+        '--jobs', '-j', type=int, default=1,
+        help='Worker processes to scan with (default: 1)'
+    )
+    scan.add_argument(
+        '--batch-size', type=int, default=1024,
+        help='Labels read ahead and scanned together (default: 1024)'
+    )
+    scan.add_argument('--synonyms', help='Synonyms YAML file (default: bundled data)')
+    scan.add_argument(
+        '--engine', choices=ENGINES, default='automaton',
+        help='Matching engine (default: automaton)'
+    )
+    scan.add_argument(
+        '--normalize', action='store_true',
+        help='Normalize labels (casefold, NFKC, whitespace) before matching'
+    )
+    scan.add_argument(
+        '--warnings', action='store_true',
+        help='Add cross-reactivity warnings for the detected categories'
+    )
+    scan.add_argument('--rules', help='Cross-reactivity rules YAML file (default: bundled data)')
+    scan.add_argument(
+        '--min-confidence', choices=('low', 'medium', 'high'), default='low',
+        help='Minimum confidence of reported warnings (default: low)'
+    )
+    scan.add_argument(
+        '--quiet', '-q', action='store_true',
+        help='Do not print the throughput summary to stderr'
+    )
+    return parser
+
+
+def _scan(args: argparse.Namespace) -> int:
+    """Run the scan command."""
+    if args.jobs < 1:
+        raise ValueError(f"--jobs must be at least 1, got {args.jobs}.")
+
+    inputs = _expand_inputs(args.inputs)
+    matcher = IngredientMatcher(args.synonyms, engine=args.engine, normalize=args.normalize)
+    analyzer = None
+    if args.warnings:
+        from .analysis import Analyzer
+        from .cross_reactivity import CrossReactivityChecker
+
+        analyzer = Analyzer(matcher, CrossReactivityChecker(args.rules))
+
+    labels = _iter_labels(inputs, args.format, args.field, args.id_field)
+    results = matcher.scan_stream(labels, field='text', batch_size=args.batch_size, workers=args.jobs)
+
+    count = matched = characters = 0
+    started = time.perf_counter()
+    write = sys.stdout.write
+    for label, result in results:
+        text = label.pop('text')
+        count += 1
+        characters += len(text)
+        if result:
+            matched += 1
+
+        label['categories'] = list(result)
+        label['matches'] = result
+        if analyzer is not None:
+            label['warnings'] = [
+                {'source': rule.source, 'target': rule.target,
+                 'confidence': rule.confidence, 'notes': rule.notes}
+                for rule in analyzer.cross_reactions(result, args.min_confidence)
+            ]
+        write(json.dumps(label, ensure_ascii=False))
+        write('\n')
+    sys.stdout.flush()
+    elapsed = time.perf_counter() - started
+
+    if not args.quiet:
+        rate = count / elapsed if elapsed > 0 else 0.0
+        megabytes = characters / 1e6
+        print(
+            f"Scanned {count} labels ({megabytes:.2f} M chars) from {len(inputs)} input(s) "
+            f"in {elapsed:.2f}s: {rate:,.0f} labels/s, "
+            f"{megabytes / elapsed if elapsed > 0 else 0.0:.2f} M chars/s; "
+            f"{matched} with matches (jobs={args.jobs})",
+            file=sys.stderr
+        )
+    return 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Entry point of the food-inspector console script.
+
+    Args:
+        argv: Command-line arguments (default: sys.argv[1:])
+
+    Returns:
+        Exit status
+    """
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+
+    try:
+        return _scan(args)
+    except BrokenPipeError:
+        # The reader went away (e.g. piped into head); stop quietly
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+    except (FileNotFoundError, ValueError) as e:
+        print(f"food-inspector: error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
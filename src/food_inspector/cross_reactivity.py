@@ -3,13 +3,19 @@ Cross-Reactivity Checker
 Provides structured cross-reactivity rules for allergens.
 """
 
-import yaml
 import os
-from typing import Dict, List, Optional
+import threading
+import time
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
 from dataclasses import dataclass
+from itertools import chain
 
+from .loading import safe_load_yaml
+from .snapshot import load_snapshot, save_snapshot, snapshot_path, source_digest
+from .stats import StatsSink
 
-@dataclass
+
+@dataclass(frozen=True)
 class CrossReactivityRule:
     """Represents a cross-reactivity rule between allergens."""
     source: str
@@ -21,6 +27,34 @@ class CrossReactivityRule:
         return f"{self.source} → {self.target} (confidence: {self.confidence})"
 
 
+class _RuleIndex:
+    """
+    One version of the rules and every index built from it.
+    
+    Queries read the checker's current index once, so reload() can swap in a
+    new version with a single assignment while other threads are querying.
+    """
+    
+    __slots__ = ('rules', 'rules_by_source', 'rules_by_target', 'reactions_at', 'sources_at', 'rule_by_pair',
+                 'rules_by_confidence', 'allergen_ids', 'allergen_names', 'closure')
+    
+    def __init__(self):
+        self.rules: List[CrossReactivityRule] = []
+        self.rules_by_source: Dict[str, List[CrossReactivityRule]] = {}
+        self.rules_by_target: Dict[str, List[CrossReactivityRule]] = {}
+        # Query indexes built by _build_rule_indexes(); buckets are tuples so
+        # callers cannot change them through a query result
+        self.reactions_at: Dict[Tuple[str, int], Tuple[CrossReactivityRule, ...]] = {}
+        self.sources_at: Dict[Tuple[str, int], Tuple[CrossReactivityRule, ...]] = {}
+        self.rule_by_pair: Dict[Tuple[str, str], CrossReactivityRule] = {}
+        self.rules_by_confidence: Dict[str, Tuple[CrossReactivityRule, ...]] = {}
+        # Integer ids for every allergen named in a rule, and for each
+        # confidence level the bitset of ids reachable from each allergen id
+        self.allergen_ids: Dict[str, int] = {}
+        self.allergen_names: List[str] = []
+        self.closure: Dict[int, List[int]] = {}
+
+
 class CrossReactivityChecker:
     """
     Manages cross-reactivity rules between allergens.
@@ -31,16 +65,31 @@ class CrossReactivityChecker:
     # Confidence levels mapping for filtering
     CONFIDENCE_LEVELS = {'low': 1, 'medium': 2, 'high': 3}
     
-    def __init__(self, rules_file: Optional[str] = None):
+    # Built index attributes saved in and restored from snapshots
+    _SNAPSHOT_STATE = _RuleIndex.__slots__
+    
+    def __init__(self, rules_file: Optional[str] = None, snapshot_dir: Optional[str] = None,
+                 closure_depth: Optional[int] = None, stats: Optional[StatsSink] = None):
         """
         Initialize the cross-reactivity checker.
         
         Args:
             rules_file: Path to YAML file with cross-reactivity rules
+            snapshot_dir: Optional directory for binary snapshots of the loaded
+                          rules and indexes, keyed by the rules file's content
+                          hash and rebuilt automatically when the file changes
+            closure_depth: If set, precompute everything reachable from each
+                           allergen through chains of up to this many rules
+                           (see get_reachable)
+            stats: Optional sink (e.g. StatsCollector) for index build times and
+                   query counters. Without one, no instrumentation code runs.
         """
-        self.rules: List[CrossReactivityRule] = []
-        self.rules_by_source: Dict[str, List[CrossReactivityRule]] = {}
-        self.rules_by_target: Dict[str, List[CrossReactivityRule]] = {}
+        if closure_depth is not None and closure_depth < 1:
+            raise ValueError(f"closure_depth must be at least 1, got {closure_depth}.")
+        
+        self.closure_depth = closure_depth
+        self.stats = stats
+        self._index = _RuleIndex()
         
         # Load rules from file
         if rules_file is None:
@@ -48,13 +97,177 @@ class CrossReactivityChecker:
             data_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'data')
             rules_file = os.path.join(data_dir, 'cross_reactivity.yaml')
         
-        self._load_rules(rules_file)
+        self.rules_file = rules_file
+        self._snapshot_dir = snapshot_dir
+        self._reload_lock = threading.Lock()
+        self._source_signature = self._stat_source()
+        
+        snapshot_file = self._snapshot_file()
+        if snapshot_file is not None:
+            index = self._build_stage('snapshot_restore', self._restore_snapshot, snapshot_file)
+            if index is not None:
+                self._index = index
+                return
+        
+        self._index = self._build_index(self._build_stage('load', self._load_rules, rules_file))
+        if snapshot_file is not None:
+            self._save_snapshot(snapshot_file, self._index)
+    
+    @property
+    def rules(self) -> List[CrossReactivityRule]:
+        """All rules, in rule-file order."""
+        return self._index.rules
+    
+    @property
+    def rules_by_source(self) -> Dict[str, List[CrossReactivityRule]]:
+        """Rules grouped by source allergen."""
+        return self._index.rules_by_source
+    
+    @property
+    def rules_by_target(self) -> Dict[str, List[CrossReactivityRule]]:
+        """Rules grouped by target allergen."""
+        return self._index.rules_by_target
+    
+    def __getstate__(self):
+        # Stats sinks are process-local; copies start without one
+        state = self.__dict__.copy()
+        state['stats'] = None
+        del state['_reload_lock']
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reload_lock = threading.Lock()
+    
+    def _build_stage(self, stage: str, build, *args):
+        """Run one index build step, timing it if a stats sink is attached."""
+        if self.stats is None:
+            return build(*args)
+        started = time.perf_counter()
+        result = build(*args)
+        self.stats.observe('checker_index_build_seconds', time.perf_counter() - started, stage=stage)
+        return result
+    
+    def _build_index(self, rules: List[CrossReactivityRule],
+                     previous: Optional[_RuleIndex] = None) -> _RuleIndex:
+        """
+        Build every index for one version of the rules.
+        
+        Args:
+            rules: Validated rules, in rule-file order
+            previous: Index of the version being replaced; query buckets of
+                      sources and targets whose rules did not change are reused
+            
+        Returns:
+            The new index
+        """
+        index = _RuleIndex()
+        index.rules = rules
+        for rule in rules:
+            index.rules_by_source.setdefault(rule.source, []).append(rule)
+            index.rules_by_target.setdefault(rule.target, []).append(rule)
+        
+        self._build_stage('indexes', self._build_rule_indexes, index, previous)
+        if self.closure_depth is not None:
+            self._build_stage('closure', self._build_closure, index)
+        return index
     
-    def _load_rules(self, rules_file: str):
-        """Load cross-reactivity rules from YAML file."""
+    def _snapshot_file(self) -> Optional[str]:
+        """Snapshot path for the rules file's current content, if snapshots are enabled."""
+        if self._snapshot_dir is None:
+            return None
+        digest = source_digest(self.rules_file)
+        if digest is None:
+            return None
+        return snapshot_path(self._snapshot_dir, 'rules', digest, self.closure_depth)
+    
+    def _save_snapshot(self, snapshot_file: str, index: _RuleIndex):
+        """Write an index to a snapshot."""
+        save_snapshot(snapshot_file, {name: getattr(index, name) for name in self._SNAPSHOT_STATE})
+    
+    def _restore_snapshot(self, snapshot_file: str) -> Optional[_RuleIndex]:
+        """
+        Restore the rules and indexes from a snapshot.
+        
+        Returns:
+            The restored index, or None if there is no usable snapshot
+        """
+        state = load_snapshot(snapshot_file)
+        if state is None or set(state) != set(self._SNAPSHOT_STATE):
+            return None
+        
+        index = _RuleIndex()
+        for name, value in state.items():
+            setattr(index, name, value)
+        return index
+    
+    def _stat_source(self) -> Optional[Tuple[int, int]]:
+        """Modification time and size of the rules file, or None if it is missing."""
+        try:
+            stat = os.stat(self.rules_file)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def reload(self, force: bool = False) -> Tuple[str, ...]:
+        """
+        Pick up changes to the rules file.
+        
+        The file is only read when its modification time or size changed (or
+        force is set). If any rule changed, new indexes are built, reusing the
+        query buckets of every source and target whose rules are unchanged,
+        and swapped in with a single assignment; queries already running on
+        other threads finish on the version they started with.
+        
+        Args:
+            force: Re-read the file even if its modification time and size
+                   are unchanged
+            
+        Returns:
+            Source allergens whose rules were added, removed or changed
+            (empty if the rules are unchanged)
+        """
+        with self._reload_lock:
+            signature = self._stat_source()
+            if not force and signature is not None and signature == self._source_signature:
+                return ()
+            
+            rules = self._build_stage('load', self._load_rules, self.rules_file)
+            self._source_signature = signature
+            
+            previous = self._index
+            if rules == previous.rules:
+                return ()
+            
+            index = self._build_index(rules, previous)
+            changed = tuple(
+                source for source in dict.fromkeys(chain(previous.rules_by_source, index.rules_by_source))
+                if previous.rules_by_source.get(source) != index.rules_by_source.get(source)
+            )
+            snapshot_file = self._snapshot_file()
+            if snapshot_file is not None:
+                self._save_snapshot(snapshot_file, index)
+            
+            self._index = index
+            return changed
+    
+    def _record_query(self, method: str, hit: bool):
+        """Count one indexed query and whether the index had an entry for it."""
+        self.stats.count('checker_queries', method=method)
+        self.stats.count('checker_index_hits' if hit else 'checker_index_misses', method=method)
+    
+    def _load_rules(self, rules_file: str) -> List[CrossReactivityRule]:
+        """
+        Load and validate cross-reactivity rules from YAML file.
+        
+        Returns:
+            Rules in file order
+        """
+        import yaml
+        
         try:
             with open(rules_file, 'r') as f:
-                data = yaml.safe_load(f)
+                data = safe_load_yaml(f)
         except FileNotFoundError:
             raise FileNotFoundError(
                 f"Cross-reactivity rules file not found: '{rules_file}'. "
@@ -77,6 +290,7 @@ class CrossReactivityChecker:
             )
         
         rules_data = data.get('cross_reactivity_rules', [])
+        rules = []
         
         if not isinstance(rules_data, list):
             raise ValueError(
@@ -109,26 +323,170 @@ class CrossReactivityChecker:
                     f"Expected one of {sorted(self.CONFIDENCE_LEVELS.keys())}."
                 )
             
-            rule = CrossReactivityRule(
+            rules.append(CrossReactivityRule(
                 source=rule_dict['source'],
                 target=rule_dict['target'],
                 confidence=confidence,
                 notes=rule_dict.get('notes', '')
+            ))
+        
+        return rules
+    
+    def _build_rule_indexes(self, index: _RuleIndex, previous: Optional[_RuleIndex] = None):
+        """
+        Precompute the answer to every filtered query.
+        
+        For each source (and target) and each minimum confidence level, the
+        matching rules are stored in rule-file order, so queries are a single
+        dictionary lookup that returns a prebuilt tuple.
+        """
+        levels = self.CONFIDENCE_LEVELS
+        
+        def bucket(rules_by_key, previous_rules_by_key, previous_buckets):
+            buckets = {}
+            for key, rules in rules_by_key.items():
+                if previous_rules_by_key.get(key) == rules:
+                    # Unchanged since the previous version: keep its buckets
+                    for level in levels.values():
+                        buckets[(key, level)] = previous_buckets[(key, level)]
+                    continue
+                for level in levels.values():
+                    buckets[(key, level)] = tuple(r for r in rules if levels[r.confidence] >= level)
+            return buckets
+        
+        if previous is None:
+            previous = _RuleIndex()
+        index.reactions_at = bucket(index.rules_by_source, previous.rules_by_source, previous.reactions_at)
+        index.sources_at = bucket(index.rules_by_target, previous.rules_by_target, previous.sources_at)
+        
+        index.rule_by_pair = {}
+        rules_by_confidence: Dict[str, List[CrossReactivityRule]] = {confidence: [] for confidence in levels}
+        for rule in index.rules:
+            # The first rule for a pair wins, as in a linear search
+            index.rule_by_pair.setdefault((rule.source, rule.target), rule)
+            rules_by_confidence[rule.confidence].append(rule)
+        index.rules_by_confidence = {confidence: tuple(rules) for confidence, rules in rules_by_confidence.items()}
+    
+    def _build_closure(self, index: _RuleIndex):
+        """
+        Precompute transitive reachability for every allergen and confidence level.
+        
+        A chain is only as strong as its weakest rule, so a target is reachable
+        at confidence >= level exactly when a chain of rules that are each at
+        least that confident leads to it. Each level therefore gets its own
+        adjacency bitsets, expanded breadth-first up to closure_depth rules.
+        """
+        ids: Dict[str, int] = {}
+        for rule in index.rules:
+            for allergen in (rule.source, rule.target):
+                if allergen not in ids:
+                    ids[allergen] = len(ids)
+        
+        closure: Dict[int, List[int]] = {}
+        for level in self.CONFIDENCE_LEVELS.values():
+            adjacency = [0] * len(ids)
+            for rule in index.rules:
+                if self.CONFIDENCE_LEVELS[rule.confidence] >= level:
+                    adjacency[ids[rule.source]] |= 1 << ids[rule.target]
+            
+            reachable_by_id = []
+            for allergen_id in range(len(ids)):
+                reachable = frontier = adjacency[allergen_id]
+                for _ in range(self.closure_depth - 1):
+                    if not frontier:
+                        break
+                    expanded = 0
+                    while frontier:
+                        low_bit = frontier & -frontier
+                        expanded |= adjacency[low_bit.bit_length() - 1]
+                        frontier ^= low_bit
+                    frontier = expanded & ~reachable
+                    reachable |= frontier
+                # An allergen reachable from itself through a cycle is not news
+                reachable_by_id.append(reachable & ~(1 << allergen_id))
+            closure[level] = reachable_by_id
+        
+        index.allergen_ids = ids
+        index.allergen_names = list(ids)
+        index.closure = closure
+    
+    def reachable_mask(self, allergens: Iterable[str], min_confidence: Optional[str] = None) -> int:
+        """
+        Get the bitset of allergen ids reachable from any of the given allergens.
+        
+        Requires the checker to be built with closure_depth. Bit i stands for
+        the allergen with id i (see get_reachable for names).
+        
+        Args:
+            allergens: Source allergens
+            min_confidence: Minimum combined (weakest-link) confidence of a chain
+            
+        Returns:
+            Integer bitset of reachable allergen ids
+        """
+        return self._reachable_mask(self._index, allergens, min_confidence)
+    
+    def _reachable_mask(self, index: _RuleIndex, allergens: Iterable[str],
+                        min_confidence: Optional[str]) -> int:
+        """reachable_mask() against one version of the indexes."""
+        if self.closure_depth is None:
+            raise RuntimeError(
+                "Transitive lookups need a closure: construct the checker with closure_depth."
             )
-            self.rules.append(rule)
+        
+        reachable_by_id = index.closure[self.CONFIDENCE_LEVELS.get(min_confidence, 1)]
+        ids = index.allergen_ids
+        mask = 0
+        for allergen in allergens:
+            allergen_id = ids.get(allergen)
+            if allergen_id is not None:
+                mask |= reachable_by_id[allergen_id]
+        return mask
+    
+    def get_reachable(self, allergens: Iterable[str], min_confidence: Optional[str] = None) -> FrozenSet[str]:
+        """
+        Get every allergen reachable from the given allergens through rule chains.
+        
+        Chains are at most closure_depth rules long, and a chain's confidence is
+        that of its weakest rule.
+        
+        Args:
+            allergens: Source allergens
+            min_confidence: Minimum combined confidence level ('low', 'medium', 'high')
             
-            # Index by source
-            if rule.source not in self.rules_by_source:
-                self.rules_by_source[rule.source] = []
-            self.rules_by_source[rule.source].append(rule)
+        Returns:
+            Names of reachable allergens
+        """
+        index = self._index
+        mask = self._reachable_mask(index, allergens, min_confidence)
+        names = index.allergen_names
+        reachable = []
+        while mask:
+            low_bit = mask & -mask
+            reachable.append(names[low_bit.bit_length() - 1])
+            mask ^= low_bit
+        return frozenset(reachable)
+    
+    def get_transitive_reactions(self, allergen: str) -> Dict[str, str]:
+        """
+        Get the strongest chain confidence to each allergen reachable from one allergen.
+        
+        Args:
+            allergen: The source allergen
             
-            # Index by target
-            if rule.target not in self.rules_by_target:
-                self.rules_by_target[rule.target] = []
-            self.rules_by_target[rule.target].append(rule)
+        Returns:
+            Dictionary mapping reachable allergens to the best weakest-link
+            confidence of any chain leading to them
+        """
+        reactions: Dict[str, str] = {}
+        # Visit levels strongest first so each target keeps its best confidence
+        for confidence, _ in sorted(self.CONFIDENCE_LEVELS.items(), key=lambda item: -item[1]):
+            for target in self.get_reachable([allergen], confidence):
+                reactions.setdefault(target, confidence)
+        return reactions
     
     def get_potential_reactions(self, allergen: str, 
-                               min_confidence: Optional[str] = None) -> List[CrossReactivityRule]:
+                               min_confidence: Optional[str] = None) -> Tuple[CrossReactivityRule, ...]:
         """
         Get potential cross-reactive allergens for a given source allergen.
         
@@ -137,18 +495,16 @@ class CrossReactivityChecker:
             min_confidence: Optional minimum confidence level ('low', 'medium', 'high')
             
         Returns:
-            List of cross-reactivity rules for this allergen
+            Tuple of cross-reactivity rules for this allergen, shared between calls
         """
-        rules = self.rules_by_source.get(allergen, [])
-        
-        if min_confidence:
-            min_level = self.CONFIDENCE_LEVELS.get(min_confidence, 1)
-            rules = [r for r in rules if self.CONFIDENCE_LEVELS.get(r.confidence, 1) >= min_level]
-        
-        return rules
+        level = self.CONFIDENCE_LEVELS.get(min_confidence, 1) if min_confidence else 1
+        rules = self._index.reactions_at.get((allergen, level))
+        if self.stats is not None:
+            self._record_query('get_potential_reactions', rules is not None)
+        return () if rules is None else rules
     
     def get_sources_for_target(self, target_allergen: str,
-                               min_confidence: Optional[str] = None) -> List[CrossReactivityRule]:
+                               min_confidence: Optional[str] = None) -> Tuple[CrossReactivityRule, ...]:
         """
         Get allergens that may cross-react to a target allergen.
         
@@ -157,15 +513,13 @@ class CrossReactivityChecker:
             min_confidence: Optional minimum confidence level ('low', 'medium', 'high')
             
         Returns:
-            List of cross-reactivity rules targeting this allergen
+            Tuple of cross-reactivity rules targeting this allergen, shared between calls
         """
-        rules = self.rules_by_target.get(target_allergen, [])
-        
-        if min_confidence:
-            min_level = self.CONFIDENCE_LEVELS.get(min_confidence, 1)
-            rules = [r for r in rules if self.CONFIDENCE_LEVELS.get(r.confidence, 1) >= min_level]
-        
-        return rules
+        level = self.CONFIDENCE_LEVELS.get(min_confidence, 1) if min_confidence else 1
+        rules = self._index.sources_at.get((target_allergen, level))
+        if self.stats is not None:
+            self._record_query('get_sources_for_target', rules is not None)
+        return () if rules is None else rules
     
     def check_cross_reactivity(self, source: str, target: str) -> Optional[CrossReactivityRule]:
         """
@@ -178,11 +532,10 @@ class CrossReactivityChecker:
         Returns:
             CrossReactivityRule if found, None otherwise
         """
-        rules = self.rules_by_source.get(source, [])
-        for rule in rules:
-            if rule.target == target:
-                return rule
-        return None
+        rule = self._index.rule_by_pair.get((source, target))
+        if self.stats is not None:
+            self._record_query('check_cross_reactivity', rule is not None)
+        return rule
     
     def get_all_rules(self) -> List[CrossReactivityRule]:
         """
@@ -193,7 +546,7 @@ class CrossReactivityChecker:
         """
         return self.rules
     
-    def get_rules_by_confidence(self, confidence: str) -> List[CrossReactivityRule]:
+    def get_rules_by_confidence(self, confidence: str) -> Tuple[CrossReactivityRule, ...]:
         """
         Get all rules with a specific confidence level.
         
@@ -201,9 +554,23 @@ class CrossReactivityChecker:
             confidence: Confidence level ('low', 'medium', 'high')
             
         Returns:
-            List of rules matching the confidence level
+            Tuple of rules matching the confidence level, shared between calls
+        """
+        rules = self._index.rules_by_confidence.get(confidence)
+        if self.stats is not None:
+            self._record_query('get_rules_by_confidence', rules is not None)
+        return () if rules is None else rules
+    
+    def freeze(self) -> 'FrozenChecker':
         """
-        return [r for r in self.rules if r.confidence == confidence]
+        Get an immutable copy of the current rules for sharing between threads.
+        
+        Returns:
+            FrozenChecker answering queries exactly like this checker
+        """
+        from .frozen import FrozenChecker
+        
+        return FrozenChecker(self)
     
     def format_warnings(self, allergen: str, min_confidence: str = 'low') -> List[str]:
         """
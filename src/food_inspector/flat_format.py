@@ -0,0 +1,212 @@
+"""
+Flat Table Buffers
+Encoding and zero-copy reading of the memory-mappable formats: the reference
+data bundle (written by tools/data-generator, read by reference_data.py) and
+the shared matcher index (shared.py).
+
+A buffer starts with a header holding a magic string, a format version and
+the (offset, count) of each section. Integers are little-endian u32s, every
+section starts on a 4-byte boundary, and strings are stored once in a UTF-8
+string table (sections 'string_offsets' and 'string_data') and referred to
+by id.
+
+This module uses only the standard library and imports nothing else from the
+package, so the data generator can use it without the package's
+dependencies.
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+class StringTable:
+    """Assigns each distinct string one id."""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+
+    def __call__(self, value: str) -> int:
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = self.ids[value] = len(self.ids)
+        return string_id
+
+    def encode(self) -> Tuple[List[int], bytes]:
+        """The 'string_offsets' table (one entry per string, plus the end) and 'string_data' bytes."""
+        offsets = [0]
+        data = bytearray()
+        for value in self.ids:
+            data += value.encode('utf-8')
+            offsets.append(len(data))
+        return offsets, bytes(data)
+
+
+def pack_u32(values: Iterable[int]) -> bytes:
+    """Pack unsigned 32-bit integers, little-endian."""
+    values = list(values)
+    return struct.pack(f'<{len(values)}I', *values)
+
+
+class FlatLayout:
+    """
+    One flat buffer format: its magic, version and sections.
+
+    Attributes:
+        header: Struct of the header: magic, format version, a reserved u16,
+                then (offset, count) per section
+    """
+
+    def __init__(self, magic: bytes, version: int, sections: Sequence[str], kind: str,
+                 strides: Optional[Dict[str, int]] = None):
+        """
+        Describe a format.
+
+        Args:
+            magic: Four bytes identifying the format
+            version: Format version; readers reject any other
+            sections: Section names, in header order
+            kind: Name of the format used in error messages
+            strides: Ints per record of the fixed-width tables (default 1)
+        """
+        self.magic = magic
+        self.version = version
+        self.sections = tuple(sections)
+        self.kind = kind
+        self.strides = strides or {}
+        self.header = struct.Struct('<4sHH' + 'II' * len(self.sections))
+
+    def pack(self, payloads: Dict[str, Tuple[bytes, int]]) -> bytes:
+        """
+        Lay out the header and sections of one buffer.
+
+        Args:
+            payloads: (bytes, record count) for every section
+
+        Returns:
+            The buffer's bytes
+        """
+        header_size = self.header.size
+        body = bytearray()
+        locations = []
+        for name in self.sections:
+            payload, count = payloads[name]
+            body += b'\0' * (-(header_size + len(body)) % 4)
+            locations += [header_size + len(body), count]
+            body += payload
+        body += b'\0' * (-(header_size + len(body)) % 4)
+        return self.header.pack(self.magic, self.version, 0, *locations) + bytes(body)
+
+
+class FlatBuffer:
+    """
+    Read-only view of a buffer written by FlatLayout.pack().
+
+    Integer tables are memoryviews over the buffer, so opening one costs the
+    same whatever its size and never copies it; strings are decoded only
+    when asked for. On big-endian machines a private, byte-swapped copy of
+    the integers is used instead.
+    """
+
+    def __init__(self, layout: FlatLayout, buffer, name: str = 'Buffer'):
+        """
+        Attach to a buffer.
+
+        Args:
+            layout: The format the buffer is expected to hold
+            buffer: Any object supporting the buffer protocol
+            name: How to refer to the buffer in error messages
+
+        Raises:
+            ValueError: If the buffer does not hold this format and version
+        """
+        self.layout = layout
+        self._mmap = None
+        self._tables: List[memoryview] = []
+        self.view = memoryview(buffer)
+        try:
+            header = layout.header
+            if self.view.nbytes < header.size:
+                raise ValueError(f"{name} is too short to be a {layout.kind}.")
+            magic, format_version, _, *locations = header.unpack_from(self.view, 0)
+            if magic != layout.magic:
+                raise ValueError(f"{name} is not a {layout.kind}.")
+            if format_version != layout.version:
+                raise ValueError(f"Unsupported {layout.kind} format version {format_version} in {name}.")
+            aligned = self.view[:self.view.nbytes & ~3]
+            if sys.byteorder == 'little' and array('I').itemsize == 4:
+                self.words: Sequence[int] = aligned.cast('I')
+                self._tables.append(aligned)
+            else:
+                # The buffer is little-endian: decode a private copy instead
+                self.words = array('I', aligned)
+                aligned.release()
+                if sys.byteorder != 'little':
+                    self.words.byteswap()
+        except Exception:
+            self.close()
+            raise
+
+        self.sections: Dict[str, Tuple[int, int]] = {
+            section: (locations[2 * i], locations[2 * i + 1]) for i, section in enumerate(layout.sections)
+        }
+        self._string_offsets = self.table('string_offsets')
+        self._string_data_offset = self.sections['string_data'][0]
+
+    @classmethod
+    def open(cls, layout: FlatLayout, path: str) -> 'FlatBuffer':
+        """
+        Map a file read-only and attach to it; close() unmaps it.
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ValueError: If the file does not hold this format and version
+        """
+        with open(path, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            flat = cls(layout, mapping, path)
+        except Exception:
+            mapping.close()
+            raise
+        flat._mmap = mapping
+        return flat
+
+    def table(self, name: str, stride: Optional[int] = None) -> Sequence[int]:
+        """The ints of one section, without copying."""
+        offset, count = self.sections[name]
+        stride = stride or self.layout.strides.get(name, 1)
+        table = self.words[offset // 4:offset // 4 + count * stride]
+        if isinstance(table, memoryview):
+            self._tables.append(table)
+        return table
+
+    def section_bytes(self, name: str, size: int) -> bytes:
+        """The first size bytes of one section, copied."""
+        offset = self.sections[name][0]
+        return bytes(self.view[offset:offset + size])
+
+    def string(self, string_id: int) -> str:
+        """Decode one string from the string table."""
+        return self.string_bytes(string_id).decode('utf-8')
+
+    def string_bytes(self, string_id: int) -> bytes:
+        """The UTF-8 bytes of one string, e.g. to compare in sorted order."""
+        base = self._string_data_offset
+        offsets = self._string_offsets
+        return bytes(self.view[base + offsets[string_id]:base + offsets[string_id + 1]])
+
+    def close(self):
+        """Release every view of the buffer (and unmap a file); lookups fail afterwards."""
+        words = self.__dict__.pop('words', None)
+        for table in self._tables + [words]:
+            if isinstance(table, memoryview):
+                table.release()
+        self._tables = []
+        view = self.__dict__.pop('view', None)
+        if view is not None:
+            view.release()
+        if self._mmap is not None:
+            self._mmap.close()
@@ -0,0 +1,297 @@
+"""
+Frozen Matcher and Checker
+Immutable copies of a matcher's vocabulary and a checker's rules that any
+number of threads can query at once.
+"""
+
+import os
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+from .automaton import AhoCorasickAutomaton
+from .cross_reactivity import CrossReactivityChecker, _RuleIndex
+from .matcher import (IngredientMatcher, _MatcherIndex, _SubIndex, _SubIndexCache, _build_word_boundary_pattern,
+                      _scan_automaton)
+from .normalize import normalize_term
+
+
+class _FrozenDict(dict):
+    """A dict that refuses changes once built; lookups run at plain dict speed."""
+
+    __slots__ = ()
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError(f"{type(self).__name__} is immutable")
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+
+# Sub-index for queries naming no known category
+_NO_TERMS = _SubIndex(None, (), _FrozenDict(), ())
+
+
+class _Frozen:
+    """Mixin rejecting attribute assignment after construction."""
+
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"{type(self).__name__} is immutable; cannot set {name!r}")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"{type(self).__name__} is immutable; cannot delete {name!r}")
+
+    def _init_state(self, **attributes):
+        """Set the attributes once, bypassing __setattr__."""
+        self.__dict__.update(attributes)
+
+    def __getstate__(self):
+        return self.__dict__.copy()
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+
+class FrozenMatcher(_Frozen, IngredientMatcher):
+    """
+    Immutable IngredientMatcher for scanning from many threads at once.
+
+    Built from a snapshot of another matcher's current vocabulary: synonym
+    lists become tuples, lookup tables become read-only dicts, and every
+    vocabulary pattern is compiled up front. Scans only read this state and
+    allocate their own results, so no locks are needed, including on
+    free-threaded Python builds.
+
+    Unlike IngredientMatcher, a frozen matcher:
+
+    - always scans with the automaton (results are identical to the regex engine)
+    - has no stats sink or result cache, whose updates would be shared writes
+    - does not memoize patterns for terms outside the vocabulary; each
+      find_ingredient() call for such a term compiles it again
+    - answers scan_categories(), contains_any() and first_match() with one
+      automaton over the whole vocabulary, skipping other categories' hits,
+      instead of caching an automaton per category set
+    - cannot reload or fuzzy match; freeze a reloaded matcher instead
+    """
+
+    def __init__(self, matcher: IngredientMatcher):
+        """
+        Freeze a matcher's current vocabulary.
+
+        Args:
+            matcher: The matcher to copy; it is left unchanged and later
+                     reloads of it do not affect the frozen copy
+        """
+        source = matcher._index
+        self._init_state(
+            exceptions=_FrozenDict((term, tuple(compounds)) for term, compounds in matcher.exceptions.items()),
+            allowed_phrases=_FrozenDict((term, tuple(phrases)) for term, phrases in matcher.allowed_phrases.items()),
+            engine='automaton',
+            normalize=matcher.normalize,
+            fuzzy_max_distance=0,
+            fuzzy_min_length=matcher.fuzzy_min_length,
+            fuzzy_chars_per_edit=matcher.fuzzy_chars_per_edit,
+            stats=None,
+            cache=None,
+            _compounds=_FrozenDict(matcher._compounds),
+            _phrases=_FrozenDict(matcher._phrases),
+            synonyms_file=matcher.synonyms_file,
+            _snapshot_dir=None,
+        )
+
+        index = _MatcherIndex()
+        index.synonyms = _FrozenDict(
+            (category, tuple(synonyms)) for category, synonyms in source.synonyms.items()
+        )
+        index.reverse_map = _FrozenDict(source.reverse_map)
+        index.vocabulary_digest = source.vocabulary_digest
+        index.fingerprint = source.fingerprint
+        patterns = dict(source.patterns)
+        for synonyms in source.synonyms.values():
+            for synonym in synonyms:
+                if synonym not in patterns:
+                    patterns[synonym] = self._build_pattern(synonym)
+        index.patterns = _FrozenDict(patterns)
+        index.terms = tuple(source.terms)
+        index.term_owners = tuple(source.term_owners)
+        index.term_overrides = _FrozenDict(source.term_overrides)
+        index.owner_keys = tuple(source.owner_keys)
+        index.owner_category_ids = tuple(source.owner_category_ids)
+        index.category_names = source.category_names
+        index.owner_synonyms = source.owner_synonyms
+        # The automaton is never written after it is built, so it can be shared
+        index.automaton = source.automaton
+        if index.automaton is None:
+            index.automaton = AhoCorasickAutomaton(index.terms)
+        # No per-category-set cache: queries restrict one whole-vocabulary
+        # sub-index instead, and the cache below stays empty
+        self._init_state(
+            _index=index,
+            _sub_indexes=_SubIndexCache(0),
+            _vocabulary_sub_index=self._build_sub_index(index, frozenset(index.category_names)),
+        )
+
+    def freeze(self) -> 'FrozenMatcher':
+        """A frozen matcher is its own frozen copy."""
+        return self
+
+    def reload(self, force: bool = False) -> Tuple[str, ...]:
+        """Frozen matchers never change; always raises RuntimeError."""
+        raise RuntimeError(
+            "A FrozenMatcher cannot reload: reload the source matcher and freeze it again."
+        )
+
+    def _pattern_for(self, index: _MatcherIndex, ingredient: str) -> re.Pattern:
+        """The pattern for a term, compiled per call unless it is in the vocabulary."""
+        pattern = index.patterns.get(ingredient)
+        if pattern is not None:
+            return pattern
+        key = self._term_key(ingredient)
+        if ingredient.lower() in index.reverse_map or key in self._compounds or key in self._phrases:
+            return self._build_pattern(ingredient)
+        if self.normalize:
+            return _build_word_boundary_pattern(normalize_term(ingredient), 0)
+        return _build_word_boundary_pattern(ingredient)
+
+    def _sub_index(self, index: _MatcherIndex,
+                   categories: Iterable[str]) -> Tuple[_SubIndex, Optional[FrozenSet[int]]]:
+        """The whole-vocabulary sub-index, restricted to the categories' ids."""
+        categories = frozenset(categories)
+        category_ids = frozenset(category_id for category_id, category in enumerate(index.category_names)
+                                 if category in categories)
+        if not category_ids:
+            return _NO_TERMS, None
+        return self._vocabulary_sub_index, category_ids
+
+    def get_all_synonyms(self, category: str) -> Tuple[str, ...]:
+        """
+        Get all synonyms for an allergen category.
+
+        Args:
+            category: The allergen category
+
+        Returns:
+            Tuple of all synonyms for that category
+        """
+        return self._index.synonyms.get(category, ())
+
+    def _scan_chunk(self, texts: List[str]) -> List[Dict[str, Dict[str, List[Tuple[str, int, int]]]]]:
+        """Scan a chunk of texts in one thread-pool task."""
+        index = self._index
+        return [_scan_automaton(index, text, self.normalize) for text in texts]
+
+    def scan_many_threaded(self, texts: Iterable[str], workers: Optional[int] = None,
+                           chunksize: int = 64) -> Iterator[Dict[str, Dict[str, List[Tuple[str, int, int]]]]]:
+        """
+        Scan many texts on a thread pool that shares this matcher.
+
+        Unlike scan_many(), nothing is copied to worker processes. On
+        free-threaded Python the threads scan in parallel; with the GIL they
+        take turns, so scan_many() remains the faster choice there for large
+        batches.
+
+        Texts are consumed lazily, at most a few chunks per worker ahead of
+        the consumer, and results are yielded in input order.
+
+        Args:
+            texts: The texts to scan
+            workers: Number of threads (default: CPU count)
+            chunksize: Number of texts scanned per thread-pool task
+
+        Yields:
+            One scan_text() result per input text
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if chunksize < 1:
+            raise ValueError(f"chunksize must be at least 1, got {chunksize}.")
+
+        texts = iter(texts)
+        if workers <= 1:
+            for chunk in iter(lambda: list(islice(texts, chunksize)), []):
+                yield from self._scan_chunk(chunk)
+            return
+
+        with ThreadPoolExecutor(workers, thread_name_prefix='food-inspector-scan') as pool:
+            pending = deque()
+            try:
+                for chunk in iter(lambda: list(islice(texts, chunksize)), []):
+                    pending.append(pool.submit(self._scan_chunk, chunk))
+                    if len(pending) >= 2 * workers:
+                        yield from pending.popleft().result()
+                while pending:
+                    yield from pending.popleft().result()
+            finally:
+                # The consumer stopped early: drop chunks not started yet
+                for future in pending:
+                    future.cancel()
+
+
+def _freeze_buckets(buckets: Dict, frozen: Dict[int, tuple]) -> _FrozenDict:
+    """Copy a mapping of rule lists as tuples, keeping lists shared between keys shared."""
+    copied = {}
+    for key, rules in buckets.items():
+        rules_tuple = frozen.get(id(rules))
+        if rules_tuple is None:
+            rules_tuple = frozen[id(rules)] = tuple(rules)
+        copied[key] = rules_tuple
+    return _FrozenDict(copied)
+
+
+class FrozenChecker(_Frozen, CrossReactivityChecker):
+    """
+    Immutable CrossReactivityChecker for querying from many threads at once.
+
+    Built from a snapshot of another checker's current rules and indexes, with
+    every rule list copied to a tuple and every lookup table to a read-only
+    dict. Rules themselves are frozen dataclasses.
+
+    A frozen checker has no stats sink and cannot reload.
+    """
+
+    def __init__(self, checker: CrossReactivityChecker):
+        """
+        Freeze a checker's current rules.
+
+        Args:
+            checker: The checker to copy; it is left unchanged and later
+                     reloads of it do not affect the frozen copy
+        """
+        source = checker._index
+        frozen: Dict[int, tuple] = {}
+        index = _RuleIndex()
+        index.rules = tuple(source.rules)
+        index.rules_by_source = _freeze_buckets(source.rules_by_source, frozen)
+        index.rules_by_target = _freeze_buckets(source.rules_by_target, frozen)
+        index.reactions_at = _freeze_buckets(source.reactions_at, frozen)
+        index.sources_at = _freeze_buckets(source.sources_at, frozen)
+        index.rule_by_pair = _FrozenDict(source.rule_by_pair)
+        index.rules_by_confidence = _freeze_buckets(source.rules_by_confidence, frozen)
+        index.allergen_ids = _FrozenDict(source.allergen_ids)
+        index.allergen_names = tuple(source.allergen_names)
+        index.closure = _FrozenDict((level, tuple(masks)) for level, masks in source.closure.items())
+
+        self._init_state(
+            closure_depth=checker.closure_depth,
+            stats=None,
+            rules_file=checker.rules_file,
+            _snapshot_dir=None,
+            _index=index,
+        )
+
+    def freeze(self) -> 'FrozenChecker':
+        """A frozen checker is its own frozen copy."""
+        return self
+
+    def reload(self, force: bool = False) -> Tuple[str, ...]:
+        """Frozen checkers never change; always raises RuntimeError."""
+        raise RuntimeError(
+            "A FrozenChecker cannot reload: reload the source checker and freeze it again."
+        )
@@ -0,0 +1,263 @@
+"""
+Edit-Distance Index for OCR-Tolerant Matching
+"""
+
+import re
+from typing import Dict, Iterator, List, Sequence, Set, Tuple
+
+_WORD = re.compile(r'\w+')
+
+# Bound on remembered lookups before the memo is dropped and restarted
+_MEMO_LIMIT = 65536
+
+# Glyphs OCR commonly reads as one another, the only edits short terms allow
+_OCR_CONFUSIONS = frozenset(
+    pair for a, b in (('b', 'h'), ('l', 'i'), ('l', '1'), ('i', '1'), ('o', '0'),
+                      ('e', 'c'), ('u', 'v'), ('s', '5'), ('g', '9'), ('z', '2'))
+    for pair in ((a, b), (b, a))
+)
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance between two strings, with a cutoff.
+
+    Counts insertions, deletions, substitutions and transpositions of
+    adjacent characters.
+
+    Args:
+        a: First string
+        b: Second string
+        max_distance: Largest distance of interest
+
+    Returns:
+        The distance, or max_distance + 1 if it is larger than max_distance
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    previous_previous: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_minimum = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous_previous[j - 2] + 1)
+            current[j] = value
+            if value < row_minimum:
+                row_minimum = value
+        if row_minimum > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+
+    distance = previous[len(b)]
+    return distance if distance <= max_distance else max_distance + 1
+
+
+def _is_ocr_confusion(word: str, term: str) -> bool:
+    """
+    Check whether word is term with exactly one glyph OCR commonly misreads.
+
+    Args:
+        word: The string read from the text
+        term: The term it may stand for
+
+    Returns:
+        True if the strings differ in one position, by a pair in _OCR_CONFUSIONS
+    """
+    if len(word) != len(term):
+        return False
+    differences = [(a, b) for a, b in zip(word, term) if a != b]
+    return len(differences) == 1 and differences[0] in _OCR_CONFUSIONS
+
+
+def _deletions(word: str, max_distance: int) -> Set[str]:
+    """Every string obtained by deleting up to max_distance characters from word."""
+    results = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier if len(w) > 1 for i in range(len(w))}
+        results |= frontier
+    return results
+
+
+class FuzzyIndex:
+    """
+    Symmetric-deletion (SymSpell-style) index of terms for approximate lookups.
+
+    Every term is stored under each string obtained by deleting up to its
+    allowed distance of characters from its prefix. A query generates the same
+    deletions of its own prefix; any shared entry names a candidate, which is
+    then verified with a real edit distance. Lookups therefore cost a few
+    dictionary probes per query instead of a distance computation against
+    every term. Limiting deletions to a prefix keeps both the index and the
+    per-query work small for long multi-word terms.
+
+    A term's allowed distance grows with its length, one edit per
+    chars_per_edit characters up to max_distance. Terms shorter than
+    chars_per_edit (but at least min_length) allow one edit only if it is a
+    substitution OCR commonly makes, such as "wbey" for "whey": common
+    four-letter label words are a single arbitrary edit away from
+    four-letter allergens ("salt" and "malt", "soda" and "soya").
+
+    Results of recent lookups are remembered, since ingredient lists repeat
+    the same words over and over.
+    """
+
+    def __init__(self, terms: Sequence[str], max_distance: int = 1, min_length: int = 4,
+                 prefix_length: int = 7, chars_per_edit: int = 5):
+        """
+        Build the index.
+
+        Args:
+            terms: Terms to index (already case-folded). A term's position is
+                   the id reported for it. Empty terms, terms shorter than
+                   min_length and terms that do not start and end with a word
+                   character are skipped.
+            max_distance: Largest edit distance reported, for any term
+            min_length: Shortest term (and text window) that is fuzzy matched;
+                        short words are too easily one edit away from another
+            prefix_length: Number of leading characters deletions are
+                           generated from (must exceed max_distance)
+            chars_per_edit: Term characters needed per allowed edit; shorter
+                            terms only allow one OCR confusion
+        """
+        if max_distance < 1:
+            raise ValueError(f"max_distance must be at least 1, got {max_distance}.")
+        if prefix_length <= max_distance:
+            raise ValueError(
+                f"prefix_length must be greater than max_distance, got {prefix_length}."
+            )
+        if chars_per_edit < 1:
+            raise ValueError(f"chars_per_edit must be at least 1, got {chars_per_edit}.")
+
+        self.max_distance = max_distance
+        self.min_length = min_length
+        self.prefix_length = prefix_length
+        self.chars_per_edit = chars_per_edit
+        self._memo: Dict[str, List[Tuple[int, int]]] = {}
+        self._candidate_memo: Dict[str, Tuple[int, ...]] = {}
+        self._terms: Tuple[str, ...] = tuple(terms)
+        self._exact: Set[str] = set(self._terms)
+        # Largest distance reported per term; 0 for terms that are not indexed
+        self._distances: Tuple[int, ...] = tuple(
+            min(max_distance, max(1, len(term) // chars_per_edit))
+            if len(term) >= min_length and _WORD.match(term[0]) and _WORD.match(term[-1]) else 0
+            for term in self._terms
+        )
+        # Terms whose one edit must be an OCR confusion
+        self._short = frozenset(
+            term_id for term_id, term in enumerate(self._terms)
+            if self._distances[term_id] and len(term) < chars_per_edit
+        )
+        self._deletes: Dict[str, Tuple[int, ...]] = {}
+        # Window lengths worth looking up, per number of words in a term
+        self._length_ranges: Dict[int, Tuple[int, int]] = {}
+
+        deletes: Dict[str, List[int]] = {}
+        for term_id, (term, distance) in enumerate(zip(self._terms, self._distances)):
+            if not distance:
+                continue
+            for deletion in _deletions(term[:prefix_length], distance):
+                deletes.setdefault(deletion, []).append(term_id)
+            words = len(_WORD.findall(term))
+            low, high = self._length_ranges.get(words, (len(term) - distance, len(term) + distance))
+            self._length_ranges[words] = (min(low, len(term) - distance), max(high, len(term) + distance))
+
+        self._deletes = {deletion: tuple(ids) for deletion, ids in deletes.items()}
+        self._length_ranges = {
+            words: (max(min_length, low), high)
+            for words, (low, high) in sorted(self._length_ranges.items())
+        }
+
+    def lookup(self, word: str) -> List[Tuple[int, int]]:
+        """
+        Find the indexed terms closest to word, excluding an exact match.
+
+        Args:
+            word: The (case-folded) string to look up
+
+        Returns:
+            List of (term_id, distance) for every term at the smallest
+            distance found, which is between 1 and the term's allowed distance
+        """
+        closest = self._memo.get(word)
+        if closest is not None:
+            return closest
+
+        terms = self._terms
+        distances = self._distances
+        short = self._short
+        best = self.max_distance + 1
+        closest = []
+
+        for term_id in self._candidates(word[:self.prefix_length]):
+            limit = min(best, distances[term_id])
+            distance = edit_distance(word, terms[term_id], limit)
+            if distance == 0 or distance > limit:
+                continue
+            if term_id in short and not _is_ocr_confusion(word, terms[term_id]):
+                continue
+            if distance < best:
+                best = distance
+                closest = []
+            closest.append((term_id, distance))
+
+        if len(self._memo) >= _MEMO_LIMIT:
+            self._memo = {}
+        self._memo[word] = closest
+        return closest
+
+    def _candidates(self, prefix: str) -> Tuple[int, ...]:
+        """Ids of terms sharing a deletion with prefix; many windows share a prefix."""
+        candidates = self._candidate_memo.get(prefix)
+        if candidates is not None:
+            return candidates
+
+        deletes = self._deletes
+        found: Dict[int, None] = {}
+        for deletion in _deletions(prefix, self.max_distance):
+            for term_id in deletes.get(deletion, ()):
+                found[term_id] = None
+        candidates = tuple(found)
+
+        if len(self._candidate_memo) >= _MEMO_LIMIT:
+            self._candidate_memo = {}
+        self._candidate_memo[prefix] = candidates
+        return candidates
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int, int]]:
+        """
+        Find approximate occurrences of the indexed terms in text.
+
+        Every run of 1..n consecutive words (n being the most words in any
+        term) whose length is in range is looked up. Windows that are exactly
+        an indexed term are skipped: exact matching already reports them.
+
+        Args:
+            text: The (case-folded) text to search
+
+        Yields:
+            Tuples (term_id, start, end, distance), ordered by start position
+        """
+        exact = self._exact
+        length_ranges = list(self._length_ranges.items())
+        tokens = [(m.start(), m.end()) for m in _WORD.finditer(text)]
+
+        for first, (start, _) in enumerate(tokens):
+            for words, (low, high) in length_ranges:
+                last = first + words - 1
+                if last >= len(tokens):
+                    break
+                end = tokens[last][1]
+                length = end - start
+                if length < low or length > high:
+                    continue
+                window = text[start:end]
+                if window in exact:
+                    continue
+                for term_id, distance in self.lookup(window):
+                    yield term_id, start, end, distance
@@ -0,0 +1,28 @@
+"""
+YAML Loading Helpers
+"""
+
+from typing import IO, Any
+
+
+def safe_load_yaml(stream: IO[str]) -> Any:
+    """
+    Parse YAML with the fastest available safe loader.
+
+    PyYAML is imported on first use so that importing the package stays cheap.
+    The libyaml-backed CSafeLoader is used when PyYAML was built with it, and
+    the pure-Python SafeLoader otherwise; both accept the same documents.
+
+    Args:
+        stream: Open text stream to parse
+
+    Returns:
+        The parsed document
+
+    Raises:
+        yaml.YAMLError: If the document is not valid YAML
+    """
+    import yaml
+
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    return yaml.load(stream, Loader=loader)
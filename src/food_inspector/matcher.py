@@ -3,22 +3,37 @@ Ingredient Matcher with Synonym Dictionary and Word Boundary Matching
 """
 
 import re
-import yaml
 import os
-from typing import Dict, List, Tuple, Optional
+import time
+import hashlib
+import threading
+from array import array
+from collections import OrderedDict
+from itertools import chain, islice
+from typing import Any, Dict, FrozenSet, IO, Iterable, Iterator, List, Tuple, Optional, Union
 from functools import lru_cache
 
+from .automaton import AhoCorasickAutomaton, lower_preserving_offsets
+from .cache import ScanCache, text_digest
+from .fuzzy import FuzzyIndex
+from .loading import safe_load_yaml
+from .normalize import NormalizedText, normalize_term, normalize_text
+from .results import ScanMatches
+from .snapshot import load_snapshot, save_snapshot, snapshot_path, source_digest
+from .stats import StatsSink
 
-@lru_cache(maxsize=256)
-def _compile_word_boundary_pattern(term: str) -> re.Pattern:
+
+# Matching engines accepted by IngredientMatcher
+ENGINES = ('regex', 'automaton')
+
+
+def _build_word_boundary_pattern(term: str, flags: int = re.IGNORECASE) -> re.Pattern:
     """
     Create a regex pattern that matches the term with word boundaries.
     
-    Module-level function with LRU cache to avoid recompiling patterns for repeated terms.
-    Using a module-level function prevents memory leaks from caching instance methods.
-    
     Args:
         term: The ingredient term to match
+        flags: Regex flags; normalized text is matched without IGNORECASE
         
     Returns:
         Compiled regex pattern with word boundaries
@@ -30,7 +45,266 @@ def _compile_word_boundary_pattern(term: str) -> re.Pattern:
     # \b matches word boundaries (transition between \w and \W)
     pattern = r'\b' + escaped_term + r'\b'
     
-    return re.compile(pattern, re.IGNORECASE)
+    return re.compile(pattern, flags)
+
+
+def _build_override_pattern(term: str, compounds: Iterable[Tuple[str, str]],
+                            phrases: Iterable[Tuple[str, str]], flags: int = re.IGNORECASE) -> re.Pattern:
+    """
+    Create one pattern for a term with compound and phrase overrides.
+    
+    The term matches as a whole word, or inside any of the compounds, unless
+    it sits inside one of the phrases. Each compound or phrase is given as the
+    (prefix, suffix) around the term and must itself be word-bounded.
+    
+    Args:
+        term: The ingredient term to match
+        compounds: (prefix, suffix) of compounds the term may match inside
+        phrases: (prefix, suffix) of phrases that suppress the term
+        flags: Regex flags
+        
+    Returns:
+        Compiled regex pattern
+    """
+    escaped_term = re.escape(term)
+    
+    def before(prefix):
+        return r'(?<=\b' + re.escape(prefix) + ')' if prefix else r'\b'
+    
+    def after(suffix):
+        return '(?=' + re.escape(suffix) + r'\b)' if suffix else r'\b'
+    
+    guards = ''.join(
+        '(?!' + before(prefix) + escaped_term + re.escape(suffix) + r'\b)' for prefix, suffix in phrases
+    )
+    alternatives = [r'\b' + escaped_term + r'\b']
+    alternatives.extend(before(prefix) + escaped_term + after(suffix) for prefix, suffix in compounds)
+    
+    return re.compile(guards + '(?:' + '|'.join(alternatives) + ')', flags)
+
+
+@lru_cache(maxsize=256)
+def _compile_word_boundary_pattern(term: str, flags: int = re.IGNORECASE) -> re.Pattern:
+    """
+    Cached word-boundary pattern for ad-hoc terms.
+    
+    Vocabulary terms are compiled once per IngredientMatcher and never go through
+    this cache; it only serves find_ingredient() calls for terms outside the
+    loaded synonyms. Using a module-level function prevents memory leaks from
+    caching instance methods.
+    
+    Args:
+        term: The ingredient term to match
+        flags: Regex flags
+        
+    Returns:
+        Compiled regex pattern with word boundaries
+    """
+    return _build_word_boundary_pattern(term, flags)
+
+
+# Matcher installed in each scan_many() worker process by _init_scan_worker
+_worker_matcher: Optional['IngredientMatcher'] = None
+
+
+def _init_scan_worker(matcher: 'IngredientMatcher'):
+    """Process pool initializer: keep one matcher per worker for all its tasks."""
+    global _worker_matcher
+    _worker_matcher = matcher
+
+
+def _scan_in_worker(text: str) -> Dict[str, Dict[str, List[Tuple[str, int, int]]]]:
+    """Scan one text with the worker's matcher."""
+    return _worker_matcher.scan_text(text)
+
+
+class _MatcherIndex:
+    """
+    Everything built from one version of the synonyms file.
+    
+    Scans read the matcher's current index once and use only that object, so
+    reload() can swap in a new version with a single assignment while other
+    threads are in the middle of a scan.
+    """
+    
+    __slots__ = ('synonyms', 'reverse_map', 'vocabulary_digest', 'fingerprint', 'patterns', 'automaton',
+                 'terms', 'term_owners', 'term_overrides', 'owner_keys', 'owner_category_ids',
+                 'category_names', 'owner_synonyms', 'fuzzy')
+    
+    def __init__(self, synonyms: Optional[Dict[str, List[str]]] = None):
+        self.synonyms: Dict[str, List[str]] = synonyms or {}
+        self.reverse_map: Dict[str, str] = {}  # Maps synonym to allergen category
+        # Identifies the vocabulary and matching options in result cache keys
+        self.vocabulary_digest = ''
+        self.fingerprint = ''
+        # Word-boundary patterns for every synonym
+        self.patterns: Dict[str, re.Pattern] = {}
+        self.automaton: Optional[AhoCorasickAutomaton] = None
+        # Id tables built by _build_owner_index()
+        self.terms: List[str] = []
+        self.term_owners: List[Tuple[int, ...]] = []
+        # Automaton term id of a compound or phrase -> ((term id, offset, allow), ...)
+        self.term_overrides: Dict[int, Tuple[Tuple[int, int, bool], ...]] = {}
+        self.owner_keys: List[Tuple[str, str]] = []
+        self.owner_category_ids: List[int] = []
+        self.category_names: Tuple[str, ...] = ()
+        self.owner_synonyms: Tuple[str, ...] = ()
+        self.fuzzy: Optional[FuzzyIndex] = None
+
+
+class _SubIndex:
+    """
+    Automaton over the terms of some categories, for category-restricted scans.
+    
+    Term ids are local to the sub-index; owners keep the full index's owner
+    ids so results can be reported with its owner_keys.
+    """
+    
+    __slots__ = ('automaton', 'term_owners', 'term_overrides', 'phrase_reach')
+    
+    def __init__(self, automaton: Optional[AhoCorasickAutomaton], term_owners: Tuple[Tuple[int, ...], ...],
+                 term_overrides: Dict[int, Tuple[Tuple[int, int, bool], ...]], phrase_reach: Tuple[int, ...]):
+        # None when none of the categories is in the vocabulary
+        self.automaton = automaton
+        self.term_owners = term_owners
+        self.term_overrides = term_overrides
+        # Per term: how far past a hit's start a phrase suppressing it can
+        # end, or 0 if no phrase contains the term
+        self.phrase_reach = phrase_reach
+
+
+class _SubIndexCache:
+    """
+    LRU cache of sub-indexes keyed by category set.
+    
+    Each entry remembers the index it was built from, so after a reload it
+    misses and is rebuilt against the new vocabulary.
+    """
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[FrozenSet[str], Tuple[_MatcherIndex, _SubIndex]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.builds = 0
+        self.evictions = 0
+    
+    def __getstate__(self):
+        # Copies of the matcher, e.g. in scan_many() workers, start empty
+        return {'max_entries': self.max_entries}
+    
+    def __setstate__(self, state):
+        self.__init__(state['max_entries'])
+    
+    def get(self, key: FrozenSet[str], index: _MatcherIndex) -> Optional[_SubIndex]:
+        """The cached sub-index for a category set and index version, marked recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] is not index:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def put(self, key: FrozenSet[str], index: _MatcherIndex, sub_index: _SubIndex):
+        """Record a build and store it, evicting the least recently used entries."""
+        with self._lock:
+            self.builds += 1
+            if not self.max_entries:
+                return
+            self._entries[key] = (index, sub_index)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def discard_stale(self, index: _MatcherIndex):
+        """Drop entries built from any index other than the given one."""
+        with self._lock:
+            for key in [key for key, (built_from, _) in self._entries.items() if built_from is not index]:
+                del self._entries[key]
+    
+    def stats(self) -> Dict[str, float]:
+        """Entry count, bound, hits, builds, evictions and hit rate."""
+        with self._lock:
+            lookups = self.hits + self.builds
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'builds': self.builds,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+def _automaton_matches(index, haystack: str) -> Iterable[Tuple[int, int, int]]:
+    """
+    Run the automaton of an index, applying compound and phrase overrides.
+
+    Works on anything shaped like a _MatcherIndex or _SubIndex: an
+    ``automaton`` with ``iter_matches()`` and ``terms``, and ``term_overrides``
+    mapping a term id to its (target, offset, allow) overrides.
+
+    Returns:
+        Tuples (term_id, start, end) of vocabulary terms, ordered by end
+    """
+    matches = index.automaton.iter_matches(haystack)
+    if not index.term_overrides:
+        return matches
+
+    term_overrides = index.term_overrides
+    terms = index.automaton.terms
+    hits = set()
+    suppressed = set()
+    for term_id, start, end in matches:
+        hits.add((term_id, start, end))
+        for target, offset, allow in term_overrides.get(term_id, ()):
+            target_start = start + offset
+            if allow:
+                hits.add((target, target_start, target_start + len(terms[target])))
+            else:
+                suppressed.add((target, target_start))
+
+    return sorted(
+        (hit for hit in hits if (hit[0], hit[1]) not in suppressed),
+        key=lambda hit: (hit[2], hit[1]),
+    )
+
+
+def _scan_automaton(index, text: str, normalize: bool,
+                    sub_index: Optional['_SubIndex'] = None) -> Dict[str, Dict[str, List[Tuple[str, int, int]]]]:
+    """
+    Scan text with an index's automaton (or a sub-index's), returning the scan_text result shape.
+
+    Besides what _automaton_matches() reads, the index needs ``term_owners``
+    (owner ids per term id) and ``owner_keys`` ((category, synonym) per owner).
+    """
+    searched = index if sub_index is None else sub_index
+    found: Dict[int, List[Tuple[str, int, int]]] = {}
+    last_end: Dict[int, int] = {}
+    term_owners = searched.term_owners
+    normalized = normalize_text(text) if normalize else None
+    haystack = normalized.text if normalized is not None else lower_preserving_offsets(text)
+
+    for term_id, start, end in _automaton_matches(searched, haystack):
+        span = None
+        for owner in term_owners[term_id]:
+            # finditer never reports overlapping matches of the same term
+            if start < last_end.get(owner, 0):
+                continue
+            last_end[owner] = end
+            if span is None:
+                span = normalized.original_span(start, end) if normalized is not None else (start, end)
+            found.setdefault(owner, []).append((text[span[0]:span[1]], span[0], span[1]))
+
+    results: Dict[str, Dict[str, List[Tuple[str, int, int]]]] = {}
+    owner_keys = index.owner_keys
+    for owner in sorted(found):
+        category, synonym = owner_keys[owner]
+        results.setdefault(category, {})[synonym] = found[owner]
+
+    return results
 
 
 class IngredientMatcher:
@@ -40,21 +314,83 @@ class IngredientMatcher:
     Prevents false matches like "malt" matching "maltodextrin" unless explicitly allowed.
     """
     
-    def __init__(self, synonyms_file: Optional[str] = None, exceptions: Optional[Dict[str, List[str]]] = None):
+    def __init__(self, synonyms_file: Optional[str] = None, exceptions: Optional[Dict[str, List[str]]] = None,
+                 engine: str = 'regex', snapshot_dir: Optional[str] = None,
+                 stats: Optional[StatsSink] = None, cache: Optional[ScanCache] = None,
+                 normalize: bool = False, allowed_phrases: Optional[Dict[str, List[str]]] = None,
+                 fuzzy_max_distance: int = 0, fuzzy_min_length: int = 4,
+                 fuzzy_chars_per_edit: int = 5, sub_index_cache_size: int = 128):
         """
         Initialize the ingredient matcher.
         
         Args:
             synonyms_file: Path to YAML file with ingredient synonyms
-            exceptions: Optional dictionary reserved for future use to configure
-                        term-specific exceptions. Currently this parameter does not
-                        override word-boundary matching or enable partial-word
-                        matches (for example, {"malt": ["maltodextrin"]} will NOT
-                        cause "maltodextrin" to match "malt").
+            exceptions: Optional dictionary of compounds a term may match
+                        inside, overriding word boundaries. For example,
+                        {"malt": ["maltodextrin"]} reports "malt" at the start
+                        of "maltodextrin". Each compound must contain the term.
+            engine: 'regex' runs one word-boundary regex per synonym; 'automaton'
+                    finds every synonym in a single Aho-Corasick pass. Both return
+                    identical results.
+            snapshot_dir: Optional directory for binary snapshots of the built
+                          index. A snapshot matching the synonyms file's content
+                          hash is loaded instead of re-parsing the YAML; a new
+                          one is written whenever the file changes.
+            stats: Optional sink (e.g. StatsCollector) for index build times and
+                   per-scan timings and counters. Without one, no
+                   instrumentation code runs.
+            cache: Optional ScanCache of scan_text() results, keyed by the
+                   text and this matcher's vocabulary fingerprint. May be
+                   shared between matchers.
+            normalize: Normalize each text once (casefold, NFKC, whitespace
+                       collapse, hyphen and apostrophe unification) and match
+                       normalized synonyms case-sensitively against it. Spans
+                       and matched text still refer to the original text.
+            allowed_phrases: Optional dictionary of longer phrases a term is
+                             NOT reported inside. For example,
+                             {"milk": ["coconut milk"]} stops "coconut milk"
+                             from counting as dairy. Each phrase must contain
+                             the term.
+            fuzzy_max_distance: If above 0, build an edit-distance index of
+                                the vocabulary for scan_fuzzy(), which finds
+                                misspellings (e.g. OCR's "caseln") up to this
+                                many edits away
+            fuzzy_min_length: Shortest synonym or word that is fuzzy matched
+            fuzzy_chars_per_edit: Synonym characters needed per allowed edit;
+                                  shorter synonyms allow only one OCR
+                                  confusion ("wbey" for "whey", but not
+                                  "salt" for "malt")
+            sub_index_cache_size: Number of category-restricted automata
+                                  (one per distinct category set passed to
+                                  scan_categories(), contains_any() and
+                                  similar queries) kept in an LRU cache; 0
+                                  builds one for every query
         """
-        self.synonyms: Dict[str, List[str]] = {}
-        self.reverse_map: Dict[str, str] = {}  # Maps synonym to allergen category
+        if engine not in ENGINES:
+            raise ValueError(
+                f"Invalid engine '{engine}': expected one of {list(ENGINES)}."
+            )
+        if fuzzy_max_distance < 0:
+            raise ValueError(f"fuzzy_max_distance must not be negative, got {fuzzy_max_distance}.")
+        if fuzzy_chars_per_edit < 1:
+            raise ValueError(f"fuzzy_chars_per_edit must be at least 1, got {fuzzy_chars_per_edit}.")
+        if sub_index_cache_size < 0:
+            raise ValueError(f"sub_index_cache_size must not be negative, got {sub_index_cache_size}.")
+        
         self.exceptions: Dict[str, List[str]] = exceptions or {}
+        self.allowed_phrases: Dict[str, List[str]] = allowed_phrases or {}
+        self.engine = engine
+        self.normalize = normalize
+        self.fuzzy_max_distance = fuzzy_max_distance
+        self.fuzzy_min_length = fuzzy_min_length
+        self.fuzzy_chars_per_edit = fuzzy_chars_per_edit
+        self.stats = stats
+        self.cache = cache
+        # Compound/phrase overrides: searched term -> ((prefix, suffix), ...)
+        self._compounds = self._split_overrides(self.exceptions, 'exceptions')
+        self._phrases = self._split_overrides(self.allowed_phrases, 'allowed_phrases')
+        self._index = _MatcherIndex()
+        self._sub_indexes = _SubIndexCache(sub_index_cache_size)
         
         # Load synonyms from file
         if synonyms_file is None:
@@ -62,13 +398,226 @@ class IngredientMatcher:
             data_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'data')
             synonyms_file = os.path.join(data_dir, 'ingredient_synonyms.yaml')
         
-        self._load_synonyms(synonyms_file)
+        self.synonyms_file = synonyms_file
+        self._snapshot_dir = snapshot_dir
+        self._reload_lock = threading.Lock()
+        self._source_signature = self._stat_source()
+        
+        snapshot_file = self._snapshot_file()
+        if snapshot_file is not None:
+            index = self._build_stage('snapshot_restore', self._restore_snapshot, snapshot_file)
+            if index is not None:
+                self._index = index
+                return
+        
+        self._index = self._build_index(self._build_stage('load', self._load_synonyms, synonyms_file))
+        if snapshot_file is not None:
+            self._save_snapshot(snapshot_file, self._index)
+    
+    # Built index attributes saved in and restored from snapshots
+    _SNAPSHOT_STATE = ('synonyms', 'reverse_map', 'vocabulary_digest', 'automaton', 'terms', 'term_owners',
+                       'term_overrides', 'owner_keys', 'owner_category_ids', 'category_names', 'owner_synonyms',
+                       'fuzzy')
+    
+    @property
+    def synonyms(self) -> Dict[str, List[str]]:
+        """Mapping of allergen category to its synonyms, as loaded."""
+        return self._index.synonyms
+    
+    @property
+    def reverse_map(self) -> Dict[str, str]:
+        """Mapping of lowercased synonym to allergen category."""
+        return self._index.reverse_map
+    
+    @property
+    def fingerprint(self) -> str:
+        """Identifies the vocabulary and matching options in result cache keys."""
+        return self._index.fingerprint
+    
+    def __getstate__(self):
+        # Stats sinks and result caches are process-local (and hold locks);
+        # copies of the matcher, e.g. in scan_many() workers, start without them.
+        state = self.__dict__.copy()
+        state['stats'] = None
+        state['cache'] = None
+        del state['_reload_lock']
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reload_lock = threading.Lock()
+    
+    def _digest_vocabulary(self, index: _MatcherIndex):
+        """Hash the loaded vocabulary, including category and synonym order."""
+        digest = hashlib.sha256()
+        for category, synonyms in index.synonyms.items():
+            digest.update(repr((category, synonyms)).encode('utf-8'))
+        index.vocabulary_digest = digest.hexdigest()
+    
+    def _compute_fingerprint(self, index: _MatcherIndex) -> str:
+        """Combine the vocabulary digest with the options that affect results."""
+        options = repr((index.vocabulary_digest, self.normalize,
+                        sorted(self._compounds.items()), sorted(self._phrases.items())))
+        return hashlib.sha256(options.encode('utf-8')).hexdigest()
+    
+    def _build_stage(self, stage: str, build, *args):
+        """Run one index build step, timing it if a stats sink is attached."""
+        if self.stats is None:
+            return build(*args)
+        started = time.perf_counter()
+        result = build(*args)
+        self.stats.observe('matcher_index_build_seconds', time.perf_counter() - started, stage=stage)
+        return result
+    
+    def _build_index(self, synonyms: Dict[str, List[str]],
+                     previous: Optional[_MatcherIndex] = None) -> _MatcherIndex:
+        """
+        Build every index for one version of the synonyms.
+        
+        Args:
+            synonyms: Validated mapping of category to synonyms
+            previous: Index of the version being replaced; its compiled
+                      patterns are reused for synonyms that are still present
+        
+        Returns:
+            The new index
+        """
+        index = _MatcherIndex(synonyms)
+        for category, category_synonyms in synonyms.items():
+            for synonym in category_synonyms:
+                index.reverse_map[synonym.lower()] = category
+        
+        if previous is not None:
+            reused = previous.patterns
+            index.patterns = {
+                synonym: reused[synonym]
+                for category_synonyms in synonyms.values()
+                for synonym in category_synonyms
+                if synonym in reused
+            }
+        if self.engine == 'regex' or previous is None:
+            self._build_stage('patterns', self._compile_patterns, index)
+        
+        self._build_stage('owner_index', self._build_owner_index, index)
+        self._digest_vocabulary(index)
+        index.fingerprint = self._compute_fingerprint(index)
+        if self.engine == 'automaton':
+            self._build_stage('automaton', self._build_automaton, index)
+        if self.fuzzy_max_distance:
+            self._build_stage('fuzzy', self._build_fuzzy_index, index)
+        return index
+    
+    def _snapshot_file(self) -> Optional[str]:
+        """Snapshot path for the synonyms file's current content, if snapshots are enabled."""
+        if self._snapshot_dir is None:
+            return None
+        digest = source_digest(self.synonyms_file)
+        if digest is None:
+            return None
+        options = (self.engine, 'normalize') if self.normalize else (self.engine,)
+        if self._compounds or self._phrases:
+            options += (sorted(self._compounds.items()), sorted(self._phrases.items()))
+        if self.fuzzy_max_distance:
+            options += ('fuzzy', self.fuzzy_max_distance, self.fuzzy_min_length, self.fuzzy_chars_per_edit)
+        return snapshot_path(self._snapshot_dir, 'matcher', digest, *options)
+    
+    def _save_snapshot(self, snapshot_file: str, index: _MatcherIndex):
+        """Write an index's serializable state to a snapshot."""
+        save_snapshot(snapshot_file, {name: getattr(index, name) for name in self._SNAPSHOT_STATE})
+    
+    def _restore_snapshot(self, snapshot_file: str) -> Optional[_MatcherIndex]:
+        """
+        Restore the built index from a snapshot.
+        
+        Compiled regex patterns cannot be serialized, so they are not part of
+        the snapshot. The regex engine recompiles them immediately; with the
+        automaton engine they are only needed by find_ingredient() and are
+        compiled on first use (or by warmup()).
+        
+        Returns:
+            The restored index, or None if there is no usable snapshot
+        """
+        state = load_snapshot(snapshot_file)
+        if state is None or set(state) != set(self._SNAPSHOT_STATE):
+            return None
+        
+        index = _MatcherIndex()
+        for name, value in state.items():
+            setattr(index, name, value)
+        index.fingerprint = self._compute_fingerprint(index)
+        
+        if self.engine == 'regex':
+            self._compile_patterns(index)
+        return index
     
-    def _load_synonyms(self, synonyms_file: str):
-        """Load synonyms from YAML file."""
+    def _stat_source(self) -> Optional[Tuple[int, int]]:
+        """Modification time and size of the synonyms file, or None if it is missing."""
+        try:
+            stat = os.stat(self.synonyms_file)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def reload(self, force: bool = False) -> Tuple[str, ...]:
+        """
+        Pick up changes to the synonyms file.
+        
+        Cheap enough to call before every batch: the file is only read when
+        its modification time or size changed (or force is set). Categories
+        are then diffed against the loaded version; if any changed, a new
+        index is built, reusing the compiled patterns of every synonym that is
+        still present, and swapped in with a single assignment. Scans already
+        running on other threads finish on the version they started with.
+        
+        Result cache entries of the old version stop being hit, because the
+        fingerprint changes.
+        
+        Args:
+            force: Re-read the file even if its modification time and size
+                   are unchanged
+        
+        Returns:
+            Names of the added, removed or changed categories (empty if the
+            vocabulary is unchanged)
+        """
+        with self._reload_lock:
+            signature = self._stat_source()
+            if not force and signature is not None and signature == self._source_signature:
+                return ()
+            
+            synonyms = self._build_stage('load', self._load_synonyms, self.synonyms_file)
+            self._source_signature = signature
+            
+            previous = self._index
+            changed = tuple(
+                category for category in dict.fromkeys(chain(previous.synonyms, synonyms))
+                if previous.synonyms.get(category) != synonyms.get(category)
+            )
+            # Reordered categories change result order, so they are rebuilt too
+            if not changed and list(previous.synonyms) == list(synonyms):
+                return ()
+            
+            index = self._build_index(synonyms, previous)
+            snapshot_file = self._snapshot_file()
+            if snapshot_file is not None:
+                self._save_snapshot(snapshot_file, index)
+            
+            self._index = index
+            self._sub_indexes.discard_stale(index)
+            return changed
+    
+    def _load_synonyms(self, synonyms_file: str) -> Dict[str, List[str]]:
+        """
+        Load and validate synonyms from YAML file.
+        
+        Returns:
+            Mapping of allergen category to its synonyms
+        """
+        import yaml
+        
         try:
             with open(synonyms_file, 'r') as f:
-                data = yaml.safe_load(f)
+                data = safe_load_yaml(f)
         except FileNotFoundError:
             raise FileNotFoundError(
                 f"Ingredient synonyms file not found: '{synonyms_file}'. "
@@ -108,12 +657,465 @@ class IngredientMatcher:
                     f"all synonyms must be strings."
                 )
         
-        self.synonyms = data
+        return data
+    
+    def _compile_patterns(self, index: _MatcherIndex):
+        """Compile a word-boundary pattern for every synonym in the vocabulary."""
+        patterns = index.patterns
+        for synonyms in index.synonyms.values():
+            for synonym in synonyms:
+                if synonym not in patterns:
+                    patterns[synonym] = self._build_pattern(synonym)
+    
+    def _build_pattern(self, term: str) -> re.Pattern:
+        """Compile the pattern for a term, in normalized form if enabled."""
+        key = self._term_key(term)
+        flags = 0 if self.normalize else re.IGNORECASE
+        if self.normalize:
+            term = key
+        if key in self._compounds or key in self._phrases:
+            return _build_override_pattern(term, self._compounds.get(key, ()), self._phrases.get(key, ()), flags)
+        return _build_word_boundary_pattern(term, flags)
+    
+    def _split_overrides(self, overrides: Dict[str, List[str]],
+                         option: str) -> Dict[str, Tuple[Tuple[str, str], ...]]:
+        """
+        Validate compound or phrase overrides and split each around its term.
+        
+        Args:
+            overrides: Mapping of term to the longer strings containing it
+            option: Constructor argument name, for error messages
+        
+        Returns:
+            Mapping of searched term to (prefix, suffix) pairs
+        """
+        split: Dict[str, Tuple[Tuple[str, str], ...]] = {}
+        for term, containing in overrides.items():
+            key = self._term_key(term)
+            pairs = []
+            for text in containing:
+                text_key = self._term_key(text)
+                offset = text_key.find(key)
+                if not key or offset < 0 or text_key == key:
+                    raise ValueError(
+                        f"Invalid {option} entry '{text}' for '{term}': "
+                        f"it must be longer than the term and contain it."
+                    )
+                pairs.append((text_key[:offset], text_key[offset + len(key):]))
+            if pairs:
+                split[key] = split.get(key, ()) + tuple(pairs)
+        return split
+    
+    def _term_key(self, synonym: str) -> str:
+        """The form of a synonym that is searched for in the scanned text."""
+        return normalize_term(synonym) if self.normalize else lower_preserving_offsets(synonym)
+    
+    def _prepare_text(self, text: str) -> Tuple[str, Optional[NormalizedText]]:
+        """
+        Get the text patterns and the automaton run on.
+        
+        Returns:
+            Tuple (haystack, normalized); normalized is None unless the matcher
+            normalizes, in which case it maps haystack spans back to text
+        """
+        if self.normalize:
+            normalized = normalize_text(text)
+            return normalized.text, normalized
+        return text, None
+    
+    def warmup(self) -> 'IngredientMatcher':
+        """
+        Make sure every index is built and exercise the scan path once.
+        
+        Patterns and the automaton are already built at construction; this
+        fills in anything missing and runs a throwaway scan so the first real
+        scan does not pay any one-time costs. The throwaway scan is neither
+        cached nor reported to the stats sink.
+        
+        Returns:
+            The matcher itself, for chaining
+        """
+        index = self._index
+        self._compile_patterns(index)
+        if self.engine == 'automaton' and index.automaton is None:
+            self._build_automaton(index)
+        text = ' '.join(index.reverse_map)
+        if index.automaton is not None:
+            _scan_automaton(index, text, self.normalize)
+        else:
+            # Run the compiled patterns directly: _pattern_for() counts its lookups
+            haystack = self._prepare_text(text)[0]
+            for pattern in index.patterns.values():
+                for _ in pattern.finditer(haystack):
+                    pass
+        return self
+    
+    def _build_owner_index(self, index: _MatcherIndex):
+        """
+        Number every distinct (category, synonym) pair, in scan_text order.
+        
+        These "owner" ids double as synonym ids in compact results, and tie each
+        searched term (folded like the scanned text, see _term_key) back to
+        every pair it is reported under.
+        """
+        term_key = self._term_key
+        terms = list(dict.fromkeys(
+            term_key(synonym) for synonyms in index.synonyms.values() for synonym in synonyms
+        ))
+        term_ids = {term: term_id for term_id, term in enumerate(terms)}
+        owners: List[List[int]] = [[] for _ in terms]
+        owner_keys: List[Tuple[str, str]] = []
+        owner_category_ids: List[int] = []
+        seen = set()
         
-        # Build reverse mapping
-        for category, synonyms in self.synonyms.items():
+        # A lowercased term can belong to several categories or spellings;
+        # report it under each, exactly as the per-synonym regex pass would.
+        for category_id, (category, synonyms) in enumerate(index.synonyms.items()):
             for synonym in synonyms:
-                self.reverse_map[synonym.lower()] = category
+                if (category, synonym) in seen:
+                    continue
+                seen.add((category, synonym))
+                owners[term_ids[term_key(synonym)]].append(len(owner_keys))
+                owner_keys.append((category, synonym))
+                owner_category_ids.append(category_id)
+        
+        # Compounds and phrases are searched for in the same pass as the terms
+        term_overrides: Dict[int, List[Tuple[int, int, bool]]] = {}
+        for overrides, allow in ((self._compounds, True), (self._phrases, False)):
+            for key, pairs in overrides.items():
+                target = term_ids.get(key)
+                if target is None:
+                    continue  # Not a vocabulary term; only find_ingredient() uses it
+                for prefix, suffix in pairs:
+                    text = prefix + key + suffix
+                    if text not in term_ids:
+                        term_ids[text] = len(terms)
+                        terms.append(text)
+                        owners.append([])
+                    term_overrides.setdefault(term_ids[text], []).append((target, len(prefix), allow))
+        
+        index.terms = terms
+        index.term_owners = [tuple(o) for o in owners]
+        index.term_overrides = {term_id: tuple(o) for term_id, o in term_overrides.items()}
+        index.owner_keys = owner_keys
+        index.owner_category_ids = owner_category_ids
+        index.category_names = tuple(index.synonyms)
+        index.owner_synonyms = tuple(synonym for _, synonym in owner_keys)
+    
+    def _build_automaton(self, index: _MatcherIndex):
+        """Build the single-pass automaton over every searched term."""
+        index.automaton = AhoCorasickAutomaton(index.terms)
+    
+    def _build_fuzzy_index(self, index: _MatcherIndex):
+        """Build the edit-distance index over the vocabulary's searched terms."""
+        # Compound and phrase terms have no owners and are left out
+        terms = [term if owners else '' for term, owners in zip(index.terms, index.term_owners)]
+        index.fuzzy = FuzzyIndex(terms, self.fuzzy_max_distance, self.fuzzy_min_length,
+                                 chars_per_edit=self.fuzzy_chars_per_edit)
+    
+    def _build_sub_index(self, index: _MatcherIndex, categories: FrozenSet[str]) -> _SubIndex:
+        """
+        Build the automaton over just the terms of some categories.
+        
+        Keeps every term with an owner in the categories, and every compound
+        or phrase overriding such a term.
+        """
+        category_ids = {category_id for category_id, category in enumerate(index.category_names)
+                        if category in categories}
+        owner_category_ids = index.owner_category_ids
+        term_owners = [
+            tuple(owner for owner in owners if owner_category_ids[owner] in category_ids)
+            for owners in index.term_owners
+        ]
+        kept = [
+            term_id for term_id, owners in enumerate(term_owners)
+            if owners or any(term_owners[target] for target, _, _ in index.term_overrides.get(term_id, ()))
+        ]
+        if not kept:
+            return _SubIndex(None, (), {}, ())
+        
+        sub_ids = {term_id: sub_id for sub_id, term_id in enumerate(kept)}
+        terms = index.terms
+        term_overrides: Dict[int, Tuple[Tuple[int, int, bool], ...]] = {}
+        phrase_reach = [0] * len(kept)
+        for term_id, overrides in index.term_overrides.items():
+            overrides = tuple((sub_ids[target], offset, allow) for target, offset, allow in overrides
+                              if target in sub_ids and term_owners[target])
+            if not overrides:
+                continue
+            term_overrides[sub_ids[term_id]] = overrides
+            for target, offset, allow in overrides:
+                if not allow:
+                    phrase_reach[target] = max(phrase_reach[target], len(terms[term_id]) - offset)
+        
+        return _SubIndex(
+            AhoCorasickAutomaton([terms[term_id] for term_id in kept]),
+            tuple(term_owners[term_id] for term_id in kept),
+            term_overrides,
+            tuple(phrase_reach),
+        )
+    
+    def _sub_index(self, index: _MatcherIndex,
+                   categories: Iterable[str]) -> Tuple[_SubIndex, Optional[FrozenSet[int]]]:
+        """
+        Get the sub-index for a set of categories from the LRU cache, building it on a miss.
+        
+        Returns:
+            Tuple (sub-index, category ids); the category ids restrict a
+            sub-index that covers more categories than asked for, and are
+            None here because each category set gets its own sub-index
+        """
+        key = frozenset(categories)
+        sub_index = self._sub_indexes.get(key, index)
+        if self.stats is not None:
+            self.stats.count('matcher_sub_index_hits' if sub_index is not None else 'matcher_sub_index_builds')
+        if sub_index is None:
+            sub_index = self._build_stage('sub_index', self._build_sub_index, index, key)
+            self._sub_indexes.put(key, index, sub_index)
+        return sub_index, None
+    
+    def sub_index_stats(self) -> Dict[str, float]:
+        """
+        Get statistics of the category-restricted automaton cache.
+        
+        Returns:
+            Dictionary with entries (cache size), max_entries, hits, builds,
+            evictions and hit_rate (0.0 before the first lookup)
+        """
+        return self._sub_indexes.stats()
+    
+    def scan_categories(self, text: str,
+                        categories: Iterable[str]) -> Dict[str, Dict[str, List[Tuple[str, int, int]]]]:
+        """
+        Scan text for some allergen categories only, e.g. those a user avoids.
+        
+        Runs one pass of an automaton over just those categories' terms. The
+        automaton is built the first time a category set is seen and kept in
+        an LRU cache (see sub_index_stats()), so repeat scans for the same
+        profile pay only for the pass.
+        
+        Args:
+            text: The text to scan
+            categories: Allergen categories to look for; unknown categories
+                        are ignored. Pass a frozenset to avoid a copy
+        
+        Returns:
+            The scan_text() result restricted to the given categories
+        """
+        index = self._index
+        sub_index, category_ids = self._sub_index(index, categories)
+        if sub_index.automaton is None:
+            return {}
+        results = _scan_automaton(index, text, self.normalize, sub_index)
+        if category_ids is not None:
+            names = index.category_names
+            wanted = {names[category_id] for category_id in category_ids}
+            results = {category: found for category, found in results.items() if category in wanted}
+        return results
+    
+    def _first_hit(self, index: _MatcherIndex, sub_index: _SubIndex, haystack: str,
+                   category_ids: Optional[FrozenSet[int]] = None) -> Optional[Tuple[int, int, int]]:
+        """
+        Find the earliest-ending match in a sub-index, stopping as soon as it is certain.
+        
+        A hit is certain once no phrase override can still suppress it: at
+        once for terms no phrase contains, otherwise once the automaton has
+        passed the end of every phrase that could cover it.
+        
+        Returns:
+            Tuple (owner, start, end) with haystack offsets, or None
+        """
+        term_owners = sub_index.term_owners
+        term_overrides = sub_index.term_overrides
+        phrase_reach = sub_index.phrase_reach
+        terms = sub_index.automaton.terms
+        owner_category_ids = index.owner_category_ids
+        # Hits waiting on phrases, in the order found: (owner, start, end,
+        # deadline); both containers are only created once there is a hit
+        pending: Optional[List[Tuple[int, int, int, int]]] = None
+        suppressed = None
+        
+        for term_id, start, end in sub_index.automaton.iter_matches(haystack):
+            while pending and pending[0][3] < end:
+                owner, hit_start, hit_end, _ = pending.pop(0)
+                if suppressed is None or (owner, hit_start) not in suppressed:
+                    return owner, hit_start, hit_end
+            
+            hits = [(term_id, start, end)]
+            for target, offset, allow in term_overrides.get(term_id, ()):
+                target_start = start + offset
+                if allow:
+                    hits.append((target, target_start, target_start + len(terms[target])))
+                else:
+                    if suppressed is None:
+                        suppressed = set()
+                    suppressed.update((owner, target_start) for owner in term_owners[target])
+            
+            for hit_id, hit_start, hit_end in hits:
+                for owner in term_owners[hit_id]:
+                    if category_ids is not None and owner_category_ids[owner] not in category_ids:
+                        continue
+                    reach = phrase_reach[hit_id]
+                    if not reach and not pending:
+                        return owner, hit_start, hit_end
+                    if pending is None:
+                        pending = []
+                    pending.append((owner, hit_start, hit_end, hit_start + reach))
+                    break
+        
+        for owner, hit_start, hit_end, _ in pending or ():
+            if suppressed is None or (owner, hit_start) not in suppressed:
+                return owner, hit_start, hit_end
+        return None
+    
+    def contains_any(self, text: str, categories: Iterable[str]) -> bool:
+        """
+        Check whether text contains a synonym of any of the given categories.
+        
+        Answers the same question as scanning and testing the result, but
+        runs one pass over only those categories' terms and stops at the
+        first confirmed hit. A text with no hit costs one linear pass and
+        allocates no result.
+        
+        Args:
+            text: The text to check
+            categories: Allergen categories to look for; unknown categories
+                        are ignored. Pass a frozenset to avoid a copy
+        
+        Returns:
+            True if scan_text() would report any of the categories
+        """
+        return self.first_match(text, categories) is not None
+    
+    def first_match(self, text: str, categories: Iterable[str]) -> Optional[Tuple[str, str, str, int, int]]:
+        """
+        Find the first match of any of the given categories' synonyms.
+        
+        Like contains_any(), runs over only those categories' terms and stops
+        as soon as the match that ends first is confirmed.
+        
+        Args:
+            text: The text to search
+            categories: Allergen categories to look for; unknown categories
+                        are ignored. Pass a frozenset to avoid a copy
+        
+        Returns:
+            Tuple (category, synonym, matched_text, start_pos, end_pos) of
+            the earliest-ending match, or None if there is none
+        """
+        index = self._index
+        sub_index, category_ids = self._sub_index(index, categories)
+        if sub_index.automaton is None:
+            return None
+        
+        normalized = normalize_text(text) if self.normalize else None
+        haystack = normalized.text if normalized is not None else lower_preserving_offsets(text)
+        hit = self._first_hit(index, sub_index, haystack, category_ids)
+        if hit is None:
+            return None
+        
+        owner, start, end = hit
+        if normalized is not None:
+            start, end = normalized.original_span(start, end)
+        category, synonym = index.owner_keys[owner]
+        return category, synonym, text[start:end], start, end
+    
+    def scan_compact(self, text: str) -> ScanMatches:
+        """
+        Scan text for all known allergen categories, returning a compact result.
+        
+        Finds the same matches as scan_text(), but stores them as one flat
+        integer span table instead of nested dicts, lists and tuples. Use
+        ScanMatches.to_dict() to get the scan_text() shape.
+        
+        Args:
+            text: The text to scan (e.g., full ingredient list)
+        
+        Returns:
+            ScanMatches holding (category id, synonym id, start, end) per match
+        """
+        index = self._index
+        spans = array('i')
+        append = spans.append
+        owner_category_ids = index.owner_category_ids
+        
+        normalized = normalize_text(text) if self.normalize else None
+        original_span = normalized.original_span if normalized is not None else None
+        
+        if index.automaton is not None:
+            last_end: Dict[int, int] = {}
+            term_owners = index.term_owners
+            haystack = normalized.text if normalized is not None else lower_preserving_offsets(text)
+            for term_id, start, end in _automaton_matches(index, haystack):
+                for owner in term_owners[term_id]:
+                    if start < last_end.get(owner, 0):
+                        continue
+                    last_end[owner] = end
+                    append(owner_category_ids[owner])
+                    append(owner)
+                    if original_span is None:
+                        append(start)
+                        append(end)
+                    else:
+                        spans.extend(original_span(start, end))
+        else:
+            patterns = index.patterns
+            haystack = normalized.text if normalized is not None else text
+            for owner, (_, synonym) in enumerate(index.owner_keys):
+                for match in patterns[synonym].finditer(haystack):
+                    append(owner_category_ids[owner])
+                    append(owner)
+                    if original_span is None:
+                        append(match.start())
+                        append(match.end())
+                    else:
+                        spans.extend(original_span(match.start(), match.end()))
+        
+        return ScanMatches(text, index.category_names, index.owner_synonyms, spans)
+    
+    def scan_fuzzy(self, text: str) -> Dict[str, Dict[str, List[Tuple[str, int, int, int]]]]:
+        """
+        Find near-misses of known synonyms, such as OCR errors.
+        
+        Reports only approximate hits, within fuzzy_max_distance edits; exact
+        occurrences are left to scan_text(). Each run of words in the text is
+        looked up in an edit-distance index built once from the vocabulary,
+        so the cost does not grow with the number of synonyms.
+        
+        Args:
+            text: The text to scan
+            
+        Returns:
+            Dictionary mapping categories to synonyms and their fuzzy matches,
+            as tuples (matched_text, start_pos, end_pos, distance)
+        """
+        index = self._index
+        if index.fuzzy is None:
+            raise RuntimeError(
+                "Fuzzy matching is disabled: construct the matcher with fuzzy_max_distance."
+            )
+        
+        scan_started = time.perf_counter() if self.stats is not None else 0.0
+        normalized = normalize_text(text) if self.normalize else None
+        haystack = normalized.text if normalized is not None else lower_preserving_offsets(text)
+        term_owners = index.term_owners
+        found: Dict[int, List[Tuple[str, int, int, int]]] = {}
+        
+        for term_id, start, end, distance in index.fuzzy.iter_matches(haystack):
+            if normalized is not None:
+                start, end = normalized.original_span(start, end)
+            for owner in term_owners[term_id]:
+                found.setdefault(owner, []).append((text[start:end], start, end, distance))
+        
+        results: Dict[str, Dict[str, List[Tuple[str, int, int, int]]]] = {}
+        owner_keys = index.owner_keys
+        for owner in sorted(found):
+            category, synonym = owner_keys[owner]
+            results.setdefault(category, {})[synonym] = found[owner]
+        
+        if self.stats is not None:
+            self.stats.observe('matcher_scan_seconds', time.perf_counter() - scan_started, engine='fuzzy')
+        return results
     
     def find_ingredient(self, text: str, ingredient: str) -> List[Tuple[str, int, int]]:
         """
@@ -122,19 +1124,45 @@ class IngredientMatcher:
         Args:
             text: The text to search (e.g., ingredient list)
             ingredient: The ingredient term to find
-            
+        
         Returns:
             List of tuples (matched_text, start_pos, end_pos)
         """
-        pattern = _compile_word_boundary_pattern(ingredient)
+        return self._find_prepared(self._index, text, self._prepare_text(text), ingredient)
+    
+    def _find_prepared(self, index: _MatcherIndex, text: str, prepared: Tuple[str, Optional[NormalizedText]],
+                       ingredient: str) -> List[Tuple[str, int, int]]:
+        """find_ingredient() on a text already passed through _prepare_text()."""
+        pattern = self._pattern_for(index, ingredient)
+        haystack, normalized = prepared
         matches = []
         
-        for match in pattern.finditer(text):
-            matched_text = match.group(0)
-            matches.append((matched_text, match.start(), match.end()))
+        if normalized is None:
+            for match in pattern.finditer(haystack):
+                matched_text = match.group(0)
+                matches.append((matched_text, match.start(), match.end()))
+        else:
+            for match in pattern.finditer(haystack):
+                start, end = normalized.original_span(match.start(), match.end())
+                matches.append((text[start:end], start, end))
         
         return matches
     
+    def _pattern_for(self, index: _MatcherIndex, ingredient: str) -> re.Pattern:
+        """The pattern find_ingredient() uses for a term, compiling it on first use."""
+        pattern = index.patterns.get(ingredient)
+        if self.stats is not None:
+            self.stats.count('matcher_pattern_cache_hits' if pattern is not None else 'matcher_pattern_cache_misses')
+        if pattern is None:
+            key = self._term_key(ingredient)
+            if ingredient.lower() in index.reverse_map or key in self._compounds or key in self._phrases:
+                pattern = index.patterns[ingredient] = self._build_pattern(ingredient)
+            elif self.normalize:
+                pattern = _compile_word_boundary_pattern(normalize_term(ingredient), 0)
+            else:
+                pattern = _compile_word_boundary_pattern(ingredient)
+        return pattern
+    
     def find_allergen_category(self, text: str, category: str) -> Dict[str, List[Tuple[str, int, int]]]:
         """
         Find all ingredients from a specific allergen category in the text.
@@ -142,17 +1170,26 @@ class IngredientMatcher:
         Args:
             text: The text to search
             category: The allergen category (e.g., 'dairy', 'gluten', 'soy')
-            
+        
         Returns:
             Dictionary mapping found synonyms to their match positions
         """
-        if category not in self.synonyms:
+        index = self._index
+        if category not in index.synonyms:
             return {}
-        
+        if self.engine == 'regex':
+            # Same per-synonym patterns as scan_text() on this engine
+            return self._find_category_prepared(index, text, self._prepare_text(text), category)
+        return self.scan_categories(text, (category,)).get(category, {})
+    
+    def _find_category_prepared(self, index: _MatcherIndex, text: str,
+                                prepared: Tuple[str, Optional[NormalizedText]],
+                                category: str) -> Dict[str, List[Tuple[str, int, int]]]:
+        """find_allergen_category() on a text already passed through _prepare_text()."""
         results = {}
         
-        for synonym in self.synonyms[category]:
-            matches = self.find_ingredient(text, synonym)
+        for synonym in index.synonyms[category]:
+            matches = self._find_prepared(index, text, prepared, synonym)
             if matches:
                 results[synonym] = matches
         
@@ -164,26 +1201,81 @@ class IngredientMatcher:
         
         Args:
             text: The text to scan (e.g., full ingredient list)
-            
+        
         Returns:
             Dictionary mapping categories to found ingredients and their positions
         """
+        index = self._index
+        if self.cache is not None:
+            return self._scan_text_cached(index, text)
+        return self._scan(index, text)
+    
+    def _scan_text_cached(self, index: _MatcherIndex, text: str) -> Dict[str, Dict[str, List[Tuple[str, int, int]]]]:
+        """scan_text() through the result cache."""
+        key = (index.fingerprint, text_digest(text))
+        results = self.cache.get(key)
+        if self.stats is not None:
+            self.stats.count('matcher_result_cache_hits' if results is not None else 'matcher_result_cache_misses')
+        if results is None:
+            results = self._scan(index, text)
+            self.cache.put(key, results)
+        return results
+    
+    def _scan(self, index: _MatcherIndex, text: str) -> Dict[str, Dict[str, List[Tuple[str, int, int]]]]:
+        """Scan text for every category, bypassing the result cache."""
+        if self.stats is not None:
+            return self._scan_text_instrumented(index, text)
+        
+        if index.automaton is not None:
+            return _scan_automaton(index, text, self.normalize)
+        
         results = {}
+        prepared = self._prepare_text(text)
         
-        for category in self.synonyms.keys():
-            category_matches = self.find_allergen_category(text, category)
+        for category in index.synonyms.keys():
+            category_matches = self._find_category_prepared(index, text, prepared, category)
             if category_matches:
                 results[category] = category_matches
         
         return results
     
+    def _scan_text_instrumented(self, index: _MatcherIndex,
+                                text: str) -> Dict[str, Dict[str, List[Tuple[str, int, int]]]]:
+        """
+        scan_text() with timings and counters sent to the stats sink.
+        
+        The regex engine is timed per category. The automaton engine finds all
+        categories in one pass, so only the whole pass is timed.
+        """
+        stats = self.stats
+        scan_started = time.perf_counter()
+        
+        if index.automaton is not None:
+            results = _scan_automaton(index, text, self.normalize)
+            stats.count('matcher_automaton_passes')
+        else:
+            results = {}
+            prepared = self._prepare_text(text)
+            for category, synonyms in index.synonyms.items():
+                started = time.perf_counter()
+                category_matches = self._find_category_prepared(index, text, prepared, category)
+                stats.observe('matcher_category_scan_seconds', time.perf_counter() - started, category=category)
+                stats.count('matcher_patterns_evaluated', len(synonyms), category=category)
+                if category_matches:
+                    results[category] = category_matches
+        
+        stats.observe('matcher_scan_seconds', time.perf_counter() - scan_started, engine=self.engine)
+        for category, category_matches in results.items():
+            stats.count('matcher_matches', sum(len(m) for m in category_matches.values()), category=category)
+        return results
+    
     def get_allergen_for_ingredient(self, ingredient: str) -> Optional[str]:
         """
         Get the allergen category for a specific ingredient.
         
         Args:
             ingredient: The ingredient name
-            
+        
         Returns:
             The allergen category or None if not found
         """
@@ -195,8 +1287,103 @@ class IngredientMatcher:
         
         Args:
             category: The allergen category
-            
+        
         Returns:
             List of all synonyms for that category
         """
         return self.synonyms.get(category, [])
+    
+    def freeze(self) -> 'FrozenMatcher':
+        """
+        Get an immutable copy of the current vocabulary for sharing between threads.
+        
+        Returns:
+            FrozenMatcher with the same options and results as this matcher
+        """
+        from .frozen import FrozenMatcher
+        
+        return FrozenMatcher(self)
+    
+    def scan_many(self, texts: Iterable[str], workers: Optional[int] = None,
+                  chunksize: int = 64,
+                  serial_threshold: int = 256) -> Iterator[Dict[str, Dict[str, List[Tuple[str, int, int]]]]]:
+        """
+        Scan many texts, spreading the work across a process pool.
+        
+        The matcher is sent to each worker once, when the worker starts, rather
+        than with every task. Texts are consumed lazily and results are yielded
+        in input order as soon as they are ready.
+        
+        Args:
+            texts: The texts to scan
+            workers: Number of worker processes (default: CPU count)
+            chunksize: Number of texts sent to a worker per task
+            serial_threshold: Batches smaller than this are scanned in this
+                              process, where pool start-up would cost more
+                              than it saves
+            
+        Yields:
+            One scan_text() result per input text
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if chunksize < 1:
+            raise ValueError(f"chunksize must be at least 1, got {chunksize}.")
+        
+        texts = iter(texts)
+        head = list(islice(texts, serial_threshold))
+        
+        if workers <= 1 or len(head) < serial_threshold:
+            for text in chain(head, texts):
+                yield self.scan_text(text)
+            return
+        
+        with self._worker_pool(workers) as pool:
+            yield from pool.imap(_scan_in_worker, chain(head, texts), chunksize)
+    
+    def _worker_pool(self, workers: int) -> 'multiprocessing.pool.Pool':
+        """Create a process pool whose workers each hold a copy of this matcher."""
+        import multiprocessing
+        
+        return multiprocessing.Pool(workers, initializer=_init_scan_worker, initargs=(self,))
+    
+    def scan_stream(self, source: Union[str, os.PathLike, IO[str], Iterable[Any]],
+                    field: Optional[str] = None, format: Optional[str] = None,
+                    batch_size: int = 1024,
+                    workers: int = 1) -> Iterator[Tuple[Any, Dict[str, Dict[str, List[Tuple[str, int, int]]]]]]:
+        """
+        Lazily scan the records of a (possibly multi-GB) dump.
+        
+        Args:
+            source: Path to a text/JSONL/CSV dump, an open file, or an iterable
+                    of strings or dictionaries
+            field: Record field holding the ingredient text (JSONL/CSV/dicts)
+            format: 'text', 'jsonl' or 'csv'; detected from the extension by default
+            batch_size: Records read ahead at a time; bounds memory use
+            workers: Worker processes to scan each batch with
+            
+        Yields:
+            Tuples (record, scan_result) in input order
+        """
+        from .streaming import scan_records
+        return scan_records(self, source, field=field, format=format,
+                            batch_size=batch_size, workers=workers)
+    
+    def scan_text_stream(self, source: Union[IO[str], Iterable[str]],
+                         chunk_size: int = 1 << 16) -> Iterator[Tuple[str, str, Tuple[str, int, int]]]:
+        """
+        Scan one large raw text read in chunks.
+        
+        Synonyms split across chunk boundaries (e.g. "milk" / " solids") are
+        still found exactly once.
+        
+        Args:
+            source: An open text file or an iterable of string chunks
+            chunk_size: Read size used for file objects
+            
+        Yields:
+            Tuples (category, synonym, (matched_text, start, end)) with offsets
+            relative to the whole stream
+        """
+        from .streaming import scan_text_chunks
+        return scan_text_chunks(self, source, chunk_size=chunk_size)
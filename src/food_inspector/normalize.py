@@ -0,0 +1,123 @@
+"""
+Text Normalization with Offsets Back to the Original Text
+"""
+
+import re
+import unicodedata
+from array import array
+from typing import Dict, Optional, Tuple
+
+# Applied after NFKC, which leaves these distinct
+_PUNCTUATION_MAP: Dict[str, str] = {
+    # Apostrophes and primes
+    '‘': "'", '’': "'", '‛': "'", 'ʼ': "'", '′': "'",
+    '＇': "'", '`': "'",
+    # Hyphens, dashes and minus signs
+    '‐': '-', '‑': '-', '‒': '-', '–': '-', '—': '-',
+    '―': '-', '−': '-', '﹘': '-', '﹣': '-', '－': '-',
+    # Invisible characters OCR leaves inside words
+    '­': '', '​': '', '‌': '', '‍': '', '⁠': '', '﻿': '',
+}
+
+# ASCII text without these is normalized by lowercasing alone
+_ASCII_NEEDS_WORK = re.compile(r'[^\S ]|  |`')
+
+
+class NormalizedText:
+    """
+    A normalized text plus the map from its positions back to the original.
+
+    ``starts[i]`` and ``ends[i]`` are the original span that produced
+    normalized character i. When normalization only lowercased ASCII text, the
+    map is the identity and is not stored.
+    """
+
+    __slots__ = ('original', 'text', 'starts', 'ends')
+
+    def __init__(self, original: str, text: str,
+                 starts: Optional[array] = None, ends: Optional[array] = None):
+        self.original = original
+        self.text = text
+        self.starts = starts
+        self.ends = ends
+
+    def original_span(self, start: int, end: int) -> Tuple[int, int]:
+        """
+        Map a span of the normalized text back to the original text.
+
+        Args:
+            start: Start position in the normalized text
+            end: End position in the normalized text (exclusive, > start)
+
+        Returns:
+            Tuple (start, end) in the original text
+        """
+        if self.starts is None:
+            return start, end
+        return self.starts[start], self.ends[end - 1]
+
+
+def _normalize_cluster(cluster: str) -> str:
+    """NFKC, casefold and punctuation-unify one base character with its marks."""
+    normalized = unicodedata.normalize('NFKC', cluster).casefold()
+    if normalized.isascii() and normalized != '`':
+        return normalized
+    return ''.join(_PUNCTUATION_MAP.get(c, c) for c in normalized)
+
+
+def normalize_text(text: str) -> NormalizedText:
+    """
+    Normalize text once so it can be matched case-sensitively.
+
+    The pipeline casefolds, applies NFKC (so e.g. non-breaking spaces and
+    full-width letters become plain ones), unifies apostrophes and hyphens,
+    drops soft hyphens and zero-width characters, and collapses every run of
+    whitespace into a single space.
+
+    Args:
+        text: The original text
+
+    Returns:
+        NormalizedText with offsets back into text
+    """
+    if text.isascii() and not _ASCII_NEEDS_WORK.search(text):
+        return NormalizedText(text, text.lower())
+
+    out = []
+    starts = array('i')
+    ends = array('i')
+    length = len(text)
+    index = 0
+
+    while index < length:
+        # A base character and any combining marks that follow it
+        cluster_end = index + 1
+        while cluster_end < length and unicodedata.combining(text[cluster_end]):
+            cluster_end += 1
+
+        for char in _normalize_cluster(text[index:cluster_end]):
+            if char.isspace():
+                if out and out[-1] == ' ':
+                    ends[-1] = cluster_end  # Fold into the previous space
+                    continue
+                char = ' '
+            out.append(char)
+            starts.append(index)
+            ends.append(cluster_end)
+
+        index = cluster_end
+
+    return NormalizedText(text, ''.join(out), starts, ends)
+
+
+def normalize_term(term: str) -> str:
+    """
+    Normalize a dictionary term with the same pipeline as normalize_text.
+
+    Args:
+        term: Synonym or ingredient name
+
+    Returns:
+        The normalized term
+    """
+    return normalize_text(term).text
@@ -0,0 +1,217 @@
+"""
+Vectorized User Profile Matching
+Evaluates one product against many users' allergen profiles at once.
+"""
+
+from typing import TYPE_CHECKING, Dict, Iterable, Sequence, Tuple, Union
+
+from .analysis import AnalysisResult, Analyzer
+from .cross_reactivity import CrossReactivityChecker
+
+if TYPE_CHECKING:
+    import numpy
+
+# Bits per mask word
+_WORD_BITS = 64
+_WORD_MASK = (1 << _WORD_BITS) - 1
+
+
+def _require_numpy():
+    """Import NumPy, explaining how to get it if it is missing."""
+    try:
+        import numpy
+    except ImportError as exc:
+        raise ImportError(
+            "ProfileMatrix requires NumPy. Install it with: pip install food-inspector[profiles]"
+        ) from exc
+    return numpy
+
+
+class ProfileMatrix:
+    """
+    Users' avoided allergens as bitmasks in a NumPy array.
+
+    Every matcher category and every allergen named by a cross-reactivity
+    rule gets a bit; matcher categories keep their category ids as bit
+    positions. Each user is one row of ``masks`` (as many uint64 words as the
+    allergens need) plus a minimum cross-reactivity confidence level in
+    ``levels``. A product is reduced to one mask per confidence level, so
+    finding the affected users is a single AND over the whole array.
+
+    The allergen bits are fixed when the matrix is built; allergens added to
+    the data files by a later reload cannot appear in any profile and are
+    ignored.
+    """
+
+    def __init__(self, analyzer: Analyzer, masks: 'numpy.ndarray', levels: 'numpy.ndarray'):
+        """
+        Wrap already encoded profiles.
+
+        Args:
+            analyzer: Analyzer used to scan products
+            masks: uint64 array of shape (users, words) from encode()
+            levels: uint8 array of shape (users,) holding each user's minimum
+                    confidence level (CrossReactivityChecker.CONFIDENCE_LEVELS)
+
+        Raises:
+            ImportError: If NumPy is not installed
+            ValueError: If the arrays do not fit the analyzer's allergens
+        """
+        np = _require_numpy()
+        self.analyzer = analyzer
+        self.names: Tuple[str, ...] = self._allergen_names(analyzer)
+        self.ids: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self.words = max(1, -(-len(self.names) // _WORD_BITS))
+
+        masks = np.asarray(masks, dtype=np.uint64)
+        levels = np.asarray(levels, dtype=np.uint8)
+        if masks.ndim != 2 or masks.shape[1] != self.words:
+            raise ValueError(f"masks must have shape (users, {self.words}), got {masks.shape}.")
+        if levels.shape != (masks.shape[0],):
+            raise ValueError(f"levels must have shape ({masks.shape[0]},), got {levels.shape}.")
+        self.masks = masks
+        self.levels = levels
+
+    @staticmethod
+    def _allergen_names(analyzer: Analyzer) -> Tuple[str, ...]:
+        """Matcher categories in category id order, then the remaining rule allergens."""
+        names = dict.fromkeys(analyzer.matcher._index.category_names)
+        for rule in analyzer.checker.rules:
+            names.setdefault(rule.source)
+            names.setdefault(rule.target)
+        return tuple(names)
+
+    @classmethod
+    def from_profiles(cls, analyzer: Analyzer,
+                      profiles: Iterable[Tuple[Iterable[str], str]]) -> 'ProfileMatrix':
+        """
+        Encode profiles given as (avoided allergens, minimum confidence) pairs.
+
+        Args:
+            analyzer: Analyzer used to scan products
+            profiles: One (avoided allergens, min_confidence) pair per user;
+                      the user's index is its position
+
+        Returns:
+            ProfileMatrix holding the encoded profiles
+        """
+        np = _require_numpy()
+        names = cls._allergen_names(analyzer)
+        ids = {name: i for i, name in enumerate(names)}
+        words = max(1, -(-len(names) // _WORD_BITS))
+
+        rows = []
+        levels = []
+        for avoided, min_confidence in profiles:
+            rows.append(cls._encode(ids, words, avoided))
+            levels.append(cls._level(min_confidence))
+        masks = np.array(rows, dtype=np.uint64).reshape(len(rows), words)
+        return cls(analyzer, masks, np.array(levels, dtype=np.uint8))
+
+    @staticmethod
+    def _encode(ids: Dict[str, int], words: int, allergens: Iterable[str]) -> Tuple[int, ...]:
+        """Mask words with the bits of the given allergens set."""
+        row = [0] * words
+        for allergen in allergens:
+            bit = ids.get(allergen)
+            if bit is None:
+                raise ValueError(f"Unknown allergen {allergen!r}.")
+            row[bit // _WORD_BITS] |= 1 << (bit % _WORD_BITS)
+        return tuple(row)
+
+    @staticmethod
+    def _level(min_confidence: str) -> int:
+        """Numeric level of a confidence name."""
+        level = CrossReactivityChecker.CONFIDENCE_LEVELS.get(min_confidence)
+        if level is None:
+            raise ValueError(
+                f"Unknown confidence level {min_confidence!r}. "
+                f"Use one of: {', '.join(CrossReactivityChecker.CONFIDENCE_LEVELS)}"
+            )
+        return level
+
+    def __len__(self) -> int:
+        return self.masks.shape[0]
+
+    def encode(self, allergens: Iterable[str]) -> Tuple[int, ...]:
+        """
+        Encode a set of allergens as mask words.
+
+        Args:
+            allergens: Allergen names (matcher categories or rule allergens)
+
+        Returns:
+            Tuple of `words` integers, lowest bits first
+
+        Raises:
+            ValueError: If an allergen is unknown
+        """
+        return self._encode(self.ids, self.words, allergens)
+
+    def decode(self, row: Sequence[int]) -> Tuple[str, ...]:
+        """
+        Get the allergen names whose bits are set in mask words.
+
+        Args:
+            row: Mask words, e.g. a row of ``masks``
+
+        Returns:
+            Tuple of allergen names in bit order
+        """
+        return tuple(name for bit, name in enumerate(self.names)
+                     if int(row[bit // _WORD_BITS]) >> (bit % _WORD_BITS) & 1)
+
+    def product_masks(self, result: AnalysisResult) -> 'numpy.ndarray':
+        """
+        Reduce an analysis to one allergen mask per minimum confidence level.
+
+        Row ``level`` holds the directly detected allergens plus those reached
+        by cross-reactivity rules at least that confident. Row 0 is unused.
+
+        Args:
+            result: Analysis of the product, made with min_confidence='low'
+
+        Returns:
+            uint64 array of shape (levels + 1, words)
+        """
+        np = _require_numpy()
+        levels = CrossReactivityChecker.CONFIDENCE_LEVELS
+        ids = self.ids
+
+        direct = 0
+        for allergen in result.direct:
+            bit = ids.get(allergen)
+            if bit is not None:
+                direct |= 1 << bit
+        by_level = [direct] * (max(levels.values()) + 1)
+        for rule in result.cross_reactive:
+            bit = ids.get(rule.target)
+            if bit is None:
+                continue
+            for level in range(1, levels[rule.confidence] + 1):
+                by_level[level] |= 1 << bit
+
+        table = [[(mask >> (word * _WORD_BITS)) & _WORD_MASK for word in range(self.words)]
+                 for mask in by_level]
+        return np.array(table, dtype=np.uint64)
+
+    def affected(self, product: Union[str, AnalysisResult]) -> 'numpy.ndarray':
+        """
+        Find the users a product concerns.
+
+        A user is affected when the product directly contains an allergen they
+        avoid, or may cross-react with one through a rule at least as
+        confident as the user's minimum.
+
+        Args:
+            product: Label text, or an analysis made with min_confidence='low'
+
+        Returns:
+            Sorted int64 array of affected user indices
+        """
+        np = _require_numpy()
+        if isinstance(product, str):
+            product = self.analyzer.analyze(product)
+        by_level = self.product_masks(product)
+        hits = self.masks & by_level[self.levels]
+        return np.flatnonzero(hits.any(axis=1))
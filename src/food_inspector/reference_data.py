@@ -0,0 +1,250 @@
+"""
+Memory-Mapped Reference Data
+Zero-copy reader for the binary bundle written by tools/data-generator.
+"""
+
+import struct
+from typing import Dict, List, Sequence, Tuple
+
+from .flat_format import FlatBuffer, FlatLayout
+
+# Bundle layout, also used by tools/data-generator/binary_format.py to write it
+MAGIC = b'FIRD'
+FORMAT_VERSION = 1
+SECTIONS = (
+    'string_offsets', 'string_data', 'datasets', 'triggers', 'synonyms',
+    'synonym_index', 'edges', 'adjacency', 'adjacency_edges', 'policy',
+)
+
+# Ints per record of the fixed-width tables
+_STRIDES = {'datasets': 3, 'triggers': 4, 'synonym_index': 2, 'edges': 3}
+
+LAYOUT = FlatLayout(MAGIC, FORMAT_VERSION, SECTIONS, 'reference data bundle', _STRIDES)
+
+# Thresholds (critical, high, medium, low), flare mode (default, min, max
+# threshold, escalation multiplier, description string id) and the number
+# of severity levels
+POLICY = struct.Struct('<IIIIIIIdII')
+
+
+class ReferenceData:
+    """
+    Read-only view of a binary reference data bundle.
+
+    The file is memory-mapped and its tables are used in place: integer
+    tables are memoryviews over the mapping, and strings are decoded only
+    when a lookup returns them. Opening a bundle therefore costs the same
+    whatever its size, and pages are only read when they are touched.
+
+    Synonym lookups binary-search the sorted synonym index; triggers are
+    stored in id order, so trigger ids are binary-searched too.
+    """
+
+    def __init__(self, path: str):
+        """
+        Map a bundle.
+
+        Args:
+            path: Path to a reference-data.v*.bin file
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ValueError: If the file is not a supported bundle
+        """
+        self.path = path
+        self._flat = FlatBuffer.open(LAYOUT, path)
+        self._sections = self._flat.sections
+        self._words = self._flat.words
+        self._triggers = self._flat.table('triggers')
+        self._synonyms = self._flat.table('synonyms')
+        self._synonym_index = self._flat.table('synonym_index')
+        self._edges = self._flat.table('edges')
+        self._adjacency = self._flat.table('adjacency')
+        self._adjacency_edges = self._flat.table('adjacency_edges')
+
+    def close(self):
+        """Release the mapping; lookups fail afterwards."""
+        self._flat.close()
+
+    def __enter__(self) -> 'ReferenceData':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def string(self, string_id: int) -> str:
+        """
+        Decode one string from the string table.
+
+        Args:
+            string_id: Id of the string
+
+        Returns:
+            The string
+        """
+        return self._flat.string(string_id)
+
+    def __len__(self) -> int:
+        return self._sections['triggers'][1]
+
+    @property
+    def trigger_ids(self) -> Sequence[int]:
+        """Trigger ids in ascending order (a view over the mapped table)."""
+        return self._triggers[0::4]
+
+    def _trigger_index(self, trigger_id: int) -> int:
+        """Position of a trigger id in the trigger table."""
+        triggers = self._triggers
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if triggers[middle * 4] < trigger_id:
+                low = middle + 1
+            else:
+                high = middle
+        if low == len(self) or triggers[low * 4] != trigger_id:
+            raise KeyError(trigger_id)
+        return low
+
+    def trigger_name(self, trigger_id: int) -> str:
+        """
+        Get a trigger's canonical name.
+
+        Args:
+            trigger_id: The trigger id
+
+        Returns:
+            Canonical name
+
+        Raises:
+            KeyError: If the trigger id is unknown
+        """
+        return self.string(self._triggers[self._trigger_index(trigger_id) * 4 + 1])
+
+    def synonyms_for(self, trigger_id: int) -> List[str]:
+        """
+        Get a trigger's synonyms, in generated order.
+
+        Args:
+            trigger_id: The trigger id
+
+        Returns:
+            List of synonyms
+
+        Raises:
+            KeyError: If the trigger id is unknown
+        """
+        base = self._trigger_index(trigger_id) * 4
+        start, end = self._triggers[base + 2], self._triggers[base + 3]
+        return [self.string(string_id) for string_id in self._synonyms[start:end]]
+
+    def triggers_for(self, synonym: str) -> Tuple[int, ...]:
+        """
+        Find the triggers a synonym belongs to (case-insensitive).
+
+        Args:
+            synonym: The synonym to look up
+
+        Returns:
+            Trigger ids listing the synonym, usually zero or one
+        """
+        key = synonym.lower().encode('utf-8')
+        index = self._synonym_index
+        count = len(index) // 2
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            if self._flat.string_bytes(index[middle * 2]) < key:
+                low = middle + 1
+            else:
+                high = middle
+        found = []
+        while low < count and self._flat.string_bytes(index[low * 2]) == key:
+            found.append(self._triggers[index[low * 2 + 1] * 4])
+            low += 1
+        return tuple(found)
+
+    def related(self, trigger_id: int) -> List[Tuple[int, str]]:
+        """
+        Get the triggers a trigger may cross-react with.
+
+        Args:
+            trigger_id: The primary trigger id
+
+        Returns:
+            List of (related trigger id, description) in rule order
+
+        Raises:
+            KeyError: If the trigger id is unknown
+        """
+        i = self._trigger_index(trigger_id)
+        edges = self._edges
+        related = []
+        for edge_id in self._adjacency_edges[self._adjacency[i]:self._adjacency[i + 1]]:
+            base = edge_id * 3
+            related.append((self._triggers[edges[base + 1] * 4], self.string(edges[base + 2])))
+        return related
+
+    def scoring_policy(self) -> Dict:
+        """
+        Decode the scoring policy block.
+
+        Returns:
+            Dictionary with 'scoring_thresholds', 'flare_mode' and
+            'severity_levels', as in scoring-policy.v*.json
+        """
+        offset = self._sections['policy'][0]
+        (critical, high, medium, low, default_threshold, min_threshold, max_threshold,
+         escalation_multiplier, description, level_count) = POLICY.unpack_from(self._flat.view, offset)
+        base = (offset + POLICY.size) // 4
+        levels = self._words[base:base + level_count * 2]
+        return {
+            'scoring_thresholds': {'critical': critical, 'high': high, 'medium': medium, 'low': low},
+            'flare_mode': {
+                'default_threshold': default_threshold,
+                'escalation_multiplier': escalation_multiplier,
+                'min_threshold': min_threshold,
+                'max_threshold': max_threshold,
+                'description': self.string(description),
+            },
+            'severity_levels': {
+                self.string(levels[i]): self.string(levels[i + 1]) for i in range(0, len(levels), 2)
+            },
+        }
+
+    def to_json_dicts(self) -> Dict[str, Dict]:
+        """
+        Rebuild the JSON documents the bundle was encoded from.
+
+        Returns:
+            Dictionary mapping 'synonyms', 'cross-reactivity' and
+            'scoring-policy' to their JSON documents
+        """
+        meta = self._flat.table('datasets')
+        documents = {}
+        for i in range(len(meta) // 3):
+            documents[self.string(meta[i * 3])] = {
+                'version': self.string(meta[i * 3 + 1]),
+                'generated_at': self.string(meta[i * 3 + 2]),
+            }
+
+        documents['synonyms']['data'] = [
+            {
+                'trigger_id': trigger_id,
+                'canonical_name': self.trigger_name(trigger_id),
+                'synonyms': self.synonyms_for(trigger_id),
+            }
+            for trigger_id in self.trigger_ids
+        ]
+        edges = self._edges
+        triggers = self._triggers
+        documents['cross-reactivity']['data'] = [
+            {
+                'primary_trigger_id': triggers[edges[base] * 4],
+                'related_trigger_id': triggers[edges[base + 1] * 4],
+                'description': self.string(edges[base + 2]),
+            }
+            for base in range(0, len(edges), 3)
+        ]
+        documents['scoring-policy'].update(self.scoring_policy())
+        return documents
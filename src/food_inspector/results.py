@@ -0,0 +1,133 @@
+"""
+Compact Scan Results
+"""
+
+from array import array
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+
+class SpanMatch:
+    """A single match, viewed from a ScanMatches table."""
+
+    __slots__ = ('_source', 'category', 'synonym', 'start', 'end')
+
+    def __init__(self, source: str, category: str, synonym: str, start: int, end: int):
+        self._source = source
+        self.category = category
+        self.synonym = synonym
+        self.start = start
+        self.end = end
+
+    @property
+    def matched_text(self) -> str:
+        """The matched text, sliced from the scanned text on access."""
+        return self._source[self.start:self.end]
+
+    def __repr__(self):
+        return (f"SpanMatch(category={self.category!r}, synonym={self.synonym!r}, "
+                f"start={self.start}, end={self.end})")
+
+
+class ScanMatches:
+    """
+    All matches from one scan, stored as a flat integer span table.
+
+    Each match takes four ints in one ``array('i')``: category id, synonym id,
+    start and end. Category and synonym names live in tables shared with the
+    matcher, and matched text is only sliced from the scanned text when asked
+    for, so a scan allocates one array instead of nested dicts, lists, tuples
+    and a string per hit.
+    """
+
+    __slots__ = ('text', '_categories', '_synonyms', '_spans')
+
+    # Number of ints stored per match
+    STRIDE = 4
+
+    def __init__(self, text: str, categories: Sequence[str], synonyms: Sequence[str],
+                 spans: array):
+        """
+        Args:
+            text: The scanned text
+            categories: Category names indexed by category id
+            synonyms: Synonym names indexed by synonym id
+            spans: Flat ``array('i')`` of (category id, synonym id, start, end),
+                   with each synonym's matches in text order
+        """
+        self.text = text
+        self._categories = categories
+        self._synonyms = synonyms
+        self._spans = spans
+
+    def __len__(self) -> int:
+        return len(self._spans) // self.STRIDE
+
+    def __bool__(self) -> bool:
+        return bool(self._spans)
+
+    def __getitem__(self, index: int) -> SpanMatch:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('match index out of range')
+        base = index * self.STRIDE
+        category_id, synonym_id, start, end = self._spans[base:base + self.STRIDE]
+        return SpanMatch(self.text, self._categories[category_id], self._synonyms[synonym_id], start, end)
+
+    def __iter__(self) -> Iterator[SpanMatch]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __repr__(self):
+        return f"ScanMatches({len(self)} matches in {len(self.categories())} categories)"
+
+    @property
+    def spans(self) -> array:
+        """The raw span table: (category id, synonym id, start, end) per match."""
+        return self._spans
+
+    @property
+    def category_names(self) -> Sequence[str]:
+        """Category names indexed by category id."""
+        return self._categories
+
+    @property
+    def synonym_names(self) -> Sequence[str]:
+        """Synonym names indexed by synonym id."""
+        return self._synonyms
+
+    def categories(self) -> Tuple[str, ...]:
+        """
+        Get the distinct categories found, in category id order.
+
+        Returns:
+            Tuple of category names
+        """
+        ids = set(self._spans[0::self.STRIDE])
+        return tuple(self._categories[i] for i in sorted(ids))
+
+    def to_dict(self) -> Dict[str, Dict[str, List[Tuple[str, int, int]]]]:
+        """
+        Convert to the nested dictionary returned by scan_text().
+
+        Returns:
+            Dictionary mapping categories to found ingredients and their positions
+        """
+        spans = self._spans
+        text = self.text
+        by_synonym: Dict[int, List[Tuple[str, int, int]]] = {}
+        category_of: Dict[int, int] = {}
+
+        for base in range(0, len(spans), self.STRIDE):
+            synonym_id = spans[base + 1]
+            start = spans[base + 2]
+            end = spans[base + 3]
+            category_of[synonym_id] = spans[base]
+            by_synonym.setdefault(synonym_id, []).append((text[start:end], start, end))
+
+        results: Dict[str, Dict[str, List[Tuple[str, int, int]]]] = {}
+        categories = self._categories
+        synonyms = self._synonyms
+        for synonym_id in sorted(by_synonym):
+            results.setdefault(categories[category_of[synonym_id]], {})[synonyms[synonym_id]] = by_synonym[synonym_id]
+        return results
@@ -0,0 +1,461 @@
+"""
+Fork-Friendly Shared Index
+Flat, read-only encoding of a matcher's and checker's indexes that many
+worker processes can map at once.
+
+Python objects do not stay shared after fork(): every access updates a
+reference count, and the garbage collector walks every container, so the
+pages holding a matcher's dicts, tuples and automaton states are gradually
+copied into each worker. A SharedIndex keeps the same data as integer tables
+inside one buffer (an mmap'd file or a multiprocessing.shared_memory block)
+that is only ever read, so it stays shared no matter how many workers use it.
+"""
+
+import gc
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .automaton import AhoCorasickAutomaton
+from .cross_reactivity import CrossReactivityChecker, CrossReactivityRule
+from .flat_format import FlatBuffer, FlatLayout, StringTable, pack_u32
+from .matcher import _scan_automaton
+
+MAGIC = b'FISX'
+FORMAT_VERSION = 2
+
+_SECTIONS = (
+    'string_offsets', 'string_data', 'meta',
+    # Automaton: per-state edge ranges, edge labels (UTF-32-LE) and targets,
+    # failure links and merged outputs
+    'edge_offsets', 'edge_chars', 'edge_targets', 'fail', 'output_offsets', 'outputs',
+    # Terms (string ids); owners and (target, offset, allow) overrides per term
+    'terms', 'owner_offsets', 'term_owners', 'override_offsets', 'overrides',
+    # (category id, synonym) per owner; (name, first, end synonym) per category
+    'owners', 'categories', 'category_synonyms',
+    # (lowercased synonym, category id), sorted by key for binary search
+    'reverse_index',
+    # Allergen names sorted for binary search; (source, target, level,
+    # notes) per rule; rule ids per (allergen, minimum level)
+    'allergens', 'rules', 'reaction_offsets', 'reactions',
+)
+
+# Ints per record of the fixed-width tables
+_STRIDES = {'overrides': 3, 'owners': 2, 'categories': 3, 'reverse_index': 2, 'rules': 4}
+
+_LAYOUT = FlatLayout(MAGIC, FORMAT_VERSION, _SECTIONS, 'shared index', _STRIDES)
+
+# meta fields
+_META = ('normalize', 'states', 'terms', 'owners', 'categories', 'allergens', 'rules')
+
+_LEVELS = CrossReactivityChecker.CONFIDENCE_LEVELS
+_LEVEL_NAMES = {level: name for name, level in _LEVELS.items()}
+
+
+def build_shared_index(matcher, checker: Optional[CrossReactivityChecker] = None) -> bytes:
+    """
+    Encode a matcher's index (and optionally a checker's rules) as one flat buffer.
+
+    Args:
+        matcher: The IngredientMatcher to encode (either engine)
+        checker: Optional CrossReactivityChecker whose rules are included
+
+    Returns:
+        The buffer's bytes, ready to write to a file or shared memory
+    """
+    index = matcher._index
+    strings = StringTable()
+    automaton = index.automaton or AhoCorasickAutomaton(index.terms)
+
+    edge_offsets = [0]
+    edge_chars = []
+    edge_targets = []
+    for transitions in automaton._goto:
+        for char, target in transitions.items():
+            edge_chars.append(char)
+            edge_targets.append(target)
+        edge_offsets.append(len(edge_chars))
+    output_offsets = [0]
+    outputs = []
+    for hits in automaton._output:
+        outputs.extend(hits)
+        output_offsets.append(len(outputs))
+
+    terms = [strings(term) for term in index.terms]
+    owner_offsets = [0]
+    term_owners = []
+    override_offsets = [0]
+    overrides = []
+    for term_id in range(len(index.terms)):
+        term_owners.extend(index.term_owners[term_id])
+        owner_offsets.append(len(term_owners))
+        for target, offset, allow in index.term_overrides.get(term_id, ()):
+            overrides += [target, offset, int(allow)]
+        override_offsets.append(len(overrides) // 3)
+
+    owners = []
+    for category_id, (_, synonym) in zip(index.owner_category_ids, index.owner_keys):
+        owners += [category_id, strings(synonym)]
+    categories = []
+    category_synonyms = []
+    for category, synonyms in index.synonyms.items():
+        start = len(category_synonyms)
+        category_synonyms.extend(strings(synonym) for synonym in synonyms)
+        categories += [strings(category), start, len(category_synonyms)]
+    category_ids = {category: i for i, category in enumerate(index.synonyms)}
+    reverse_index = []
+    for key in sorted(index.reverse_map, key=lambda key: key.encode('utf-8')):
+        reverse_index += [strings(key), category_ids[index.reverse_map[key]]]
+
+    allergen_names: List[str] = []
+    rules = []
+    reaction_offsets = [0]
+    reactions = []
+    if checker is not None:
+        rule_list = checker.rules
+        allergen_names = sorted({name for rule in rule_list for name in (rule.source, rule.target)},
+                                key=lambda name: name.encode('utf-8'))
+        allergen_ids = {name: i for i, name in enumerate(allergen_names)}
+        for rule in rule_list:
+            rules += [allergen_ids[rule.source], allergen_ids[rule.target],
+                      _LEVELS[rule.confidence], strings(rule.notes)]
+        for name in allergen_names:
+            for level in sorted(_LEVELS.values()):
+                reactions.extend(
+                    rule_id for rule_id, rule in enumerate(rule_list)
+                    if rule.source == name and _LEVELS[rule.confidence] >= level
+                )
+                reaction_offsets.append(len(reactions))
+    allergens = [strings(name) for name in allergen_names]
+
+    meta = [int(matcher.normalize), len(automaton._goto), len(index.terms), len(index.owner_keys),
+            len(index.synonyms), len(allergen_names), len(rules) // 4]
+    string_offsets, string_data = strings.encode()
+    sections = {
+        'string_offsets': (pack_u32(string_offsets), len(string_offsets)),
+        'string_data': (string_data, len(string_data)),
+        'meta': (pack_u32(meta), len(meta)),
+        'edge_offsets': (pack_u32(edge_offsets), len(edge_offsets)),
+        'edge_chars': (''.join(edge_chars).encode('utf-32-le'), len(edge_chars)),
+        'edge_targets': (pack_u32(edge_targets), len(edge_targets)),
+        'fail': (pack_u32(automaton._fail), len(automaton._fail)),
+        'output_offsets': (pack_u32(output_offsets), len(output_offsets)),
+        'outputs': (pack_u32(outputs), len(outputs)),
+        'terms': (pack_u32(terms), len(index.terms)),
+        'owner_offsets': (pack_u32(owner_offsets), len(owner_offsets)),
+        'term_owners': (pack_u32(term_owners), len(term_owners)),
+        'override_offsets': (pack_u32(override_offsets), len(override_offsets)),
+        'overrides': (pack_u32(overrides), len(overrides) // 3),
+        'owners': (pack_u32(owners), len(index.owner_keys)),
+        'categories': (pack_u32(categories), len(index.synonyms)),
+        'category_synonyms': (pack_u32(category_synonyms), len(category_synonyms)),
+        'reverse_index': (pack_u32(reverse_index), len(index.reverse_map)),
+        'allergens': (pack_u32(allergens), len(allergens)),
+        'rules': (pack_u32(rules), len(rules) // 4),
+        'reaction_offsets': (pack_u32(reaction_offsets), len(reaction_offsets)),
+        'reactions': (pack_u32(reactions), len(reactions)),
+    }
+
+    return _LAYOUT.pack(sections)
+
+
+def save_shared_index(matcher, path: str, checker: Optional[CrossReactivityChecker] = None) -> str:
+    """
+    Write a shared index file atomically, for workers to map with SharedIndex(path).
+
+    Args:
+        matcher: The IngredientMatcher to encode
+        path: Destination file
+        checker: Optional CrossReactivityChecker whose rules are included
+
+    Returns:
+        The path written
+    """
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, 'wb') as f:
+        f.write(build_shared_index(matcher, checker))
+    os.replace(temporary, path)
+    return path
+
+
+class _Strings:
+    """Sequence of the strings named by a table of string ids, decoded on access."""
+
+    __slots__ = ('_flat', '_ids')
+
+    def __init__(self, flat: FlatBuffer, ids: Sequence[int]):
+        self._flat = flat
+        self._ids = ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, i: int) -> str:
+        return self._flat.string(self._ids[i])
+
+
+class _Ranges:
+    """
+    Per-key groups of a table, delimited by an offsets table.
+
+    Item i is the values between offsets[i] and offsets[i + 1], counted in
+    records of stride ints; records wider than one int are returned as tuples.
+    """
+
+    __slots__ = ('_offsets', '_values', '_stride')
+
+    def __init__(self, offsets: Sequence[int], values: Sequence[int], stride: int = 1):
+        self._offsets = offsets
+        self._values = values
+        self._stride = stride
+
+    def __bool__(self) -> bool:
+        return len(self._values) > 0
+
+    def __getitem__(self, i: int) -> Sequence:
+        stride = self._stride
+        values = self._values[self._offsets[i] * stride:self._offsets[i + 1] * stride]
+        if stride == 1:
+            return values
+        return [tuple(values[j:j + stride]) for j in range(0, len(values), stride)]
+
+    def get(self, i: int, default: Sequence = ()) -> Sequence:
+        """Item i, like dict.get() on a mapping with a key for every id."""
+        return self[i] if 0 <= i < len(self._offsets) - 1 else default
+
+
+class _OwnerKeys:
+    """(category, synonym) per owner id, decoded on access."""
+
+    __slots__ = ('_flat', '_owners', '_categories')
+
+    def __init__(self, flat: FlatBuffer, owners: Sequence[int], categories: Sequence[int]):
+        self._flat = flat
+        self._owners = owners
+        self._categories = categories
+
+    def __getitem__(self, owner: int) -> Tuple[str, str]:
+        category_id, synonym = self._owners[2 * owner], self._owners[2 * owner + 1]
+        return self._flat.string(self._categories[3 * category_id]), self._flat.string(synonym)
+
+
+class _FlatAutomaton(AhoCorasickAutomaton):
+    """
+    An AhoCorasickAutomaton whose states are read in place from a shared index.
+
+    Only the walk over the states differs: each state's edges are a range of
+    one string of edge labels, so a transition is a single str.find() call.
+    Word-boundary checks come from AhoCorasickAutomaton.iter_matches().
+    """
+
+    def __init__(self, flat: FlatBuffer):
+        self.terms = _Strings(flat, flat.table('terms'))
+        # The one per-process copy: edge labels as a str, for str.find()
+        self._edge_chars = flat.section_bytes('edge_chars', 4 * flat.sections['edge_chars'][1]).decode('utf-32-le')
+        self._edge_offsets = flat.table('edge_offsets')
+        self._edge_targets = flat.table('edge_targets')
+        self._fail = flat.table('fail')
+        self._output_offsets = flat.table('output_offsets')
+        self._outputs = flat.table('outputs')
+
+    def _walk(self, text: str):
+        edge_chars = self._edge_chars
+        edge_offsets = self._edge_offsets
+        edge_targets = self._edge_targets
+        fail = self._fail
+        output_offsets = self._output_offsets
+        outputs = self._outputs
+        state = 0
+
+        for index, char in enumerate(text):
+            while True:
+                edge = edge_chars.find(char, edge_offsets[state], edge_offsets[state + 1])
+                if edge >= 0:
+                    state = edge_targets[edge]
+                    break
+                if not state:
+                    break
+                state = fail[state]
+
+            first, last = output_offsets[state], output_offsets[state + 1]
+            if first != last:
+                yield index + 1, outputs[first:last]
+
+
+class SharedIndex:
+    """
+    Read-only matcher and rule lookups served straight from a flat buffer.
+
+    Integer tables are memoryviews over the buffer, so attaching costs the
+    same whatever the vocabulary size and never copies the index. The one
+    per-process object built at attach time is a string holding the
+    automaton's edge labels, which lets each transition be found with a
+    single str.find() call.
+
+    Scans run the matcher's own automaton scan over these tables, so they
+    return the same result as the encoded matcher's scan_text(); they are
+    somewhat slower than the dict-based automaton in exchange for memory
+    shared by every worker.
+    """
+
+    def __init__(self, path: Optional[str] = None, buffer=None):
+        """
+        Attach to a shared index.
+
+        Args:
+            path: File written by save_shared_index(), mapped read-only
+            buffer: Alternatively, any buffer holding build_shared_index()
+                    output, e.g. ``shared_memory.SharedMemory(name).buf``
+
+        Raises:
+            ValueError: If neither or both sources are given, or the data is
+                        not a supported shared index
+        """
+        if (path is None) == (buffer is None):
+            raise ValueError("Pass exactly one of path or buffer.")
+
+        flat = FlatBuffer.open(_LAYOUT, path) if path is not None else FlatBuffer(_LAYOUT, buffer)
+        self._flat = flat
+        self._meta = dict(zip(_META, flat.table('meta')))
+        self.normalize = bool(self._meta['normalize'])
+
+        self._categories = flat.table('categories')
+        self._category_synonyms = flat.table('category_synonyms')
+        self._reverse_index = flat.table('reverse_index')
+        self._allergens = flat.table('allergens')
+        self._rules = flat.table('rules')
+        self._reaction_offsets = flat.table('reaction_offsets')
+        self._reactions = flat.table('reactions')
+
+        # The index shape the matcher's automaton scan reads
+        self.automaton = _FlatAutomaton(flat)
+        self.term_owners = _Ranges(flat.table('owner_offsets'), flat.table('term_owners'))
+        self.term_overrides = _Ranges(flat.table('override_offsets'), flat.table('overrides'), 3)
+        self.owner_keys = _OwnerKeys(flat, flat.table('owners'), self._categories)
+
+    def close(self):
+        """Detach from the buffer; lookups fail afterwards."""
+        self._flat.close()
+
+    def __enter__(self) -> 'SharedIndex':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def categories(self) -> Tuple[str, ...]:
+        """Category names in category id order."""
+        categories = self._categories
+        return tuple(self._flat.string(categories[i]) for i in range(0, len(categories), 3))
+
+    def scan_text(self, text: str) -> Dict[str, Dict[str, List[Tuple[str, int, int]]]]:
+        """
+        Scan text for all known allergen categories.
+
+        Args:
+            text: The text to scan
+
+        Returns:
+            The same dictionary as the encoded matcher's scan_text()
+        """
+        return _scan_automaton(self, text, self.normalize)
+
+    def _search(self, table: Sequence[int], stride: int, key: bytes) -> int:
+        """Index of the record whose first field is the string key, or -1."""
+        low, high = 0, len(table) // stride
+        while low < high:
+            middle = (low + high) // 2
+            if self._flat.string_bytes(table[middle * stride]) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(table) // stride and self._flat.string_bytes(table[low * stride]) == key:
+            return low
+        return -1
+
+    def get_allergen_for_ingredient(self, ingredient: str) -> Optional[str]:
+        """
+        Get the allergen category for a specific ingredient.
+
+        Args:
+            ingredient: The ingredient name
+
+        Returns:
+            The allergen category or None if not found
+        """
+        found = self._search(self._reverse_index, 2, ingredient.lower().encode('utf-8'))
+        if found < 0:
+            return None
+        return self._flat.string(self._categories[3 * self._reverse_index[2 * found + 1]])
+
+    def get_all_synonyms(self, category: str) -> Tuple[str, ...]:
+        """
+        Get all synonyms for an allergen category.
+
+        Args:
+            category: The allergen category
+
+        Returns:
+            Tuple of the category's synonyms (empty if unknown)
+        """
+        categories = self._categories
+        for i in range(0, len(categories), 3):
+            if self._flat.string(categories[i]) == category:
+                return tuple(self._flat.string(string_id)
+                             for string_id in self._category_synonyms[categories[i + 1]:categories[i + 2]])
+        return ()
+
+    def get_potential_reactions(self, allergen: str,
+                                min_confidence: Optional[str] = None) -> Tuple[CrossReactivityRule, ...]:
+        """
+        Get potential cross-reactive allergens for a given source allergen.
+
+        Args:
+            allergen: The source allergen
+            min_confidence: Optional minimum confidence level ('low', 'medium', 'high')
+
+        Returns:
+            Tuple of rules, in rule-file order (empty if the checker was not encoded)
+        """
+        allergen_id = self._search(self._allergens, 1, allergen.encode('utf-8'))
+        if allergen_id < 0:
+            return ()
+        level = _LEVELS.get(min_confidence, 1) if min_confidence else 1
+        slot = allergen_id * len(_LEVELS) + level - 1
+        rules = self._rules
+        allergens = self._allergens
+        reactions = []
+        for rule_id in self._reactions[self._reaction_offsets[slot]:self._reaction_offsets[slot + 1]]:
+            source, target, rule_level, notes = rules[4 * rule_id:4 * rule_id + 4]
+            reactions.append(CrossReactivityRule(
+                source=self._flat.string(allergens[source]),
+                target=self._flat.string(allergens[target]),
+                confidence=_LEVEL_NAMES[rule_level],
+                notes=self._flat.string(notes),
+            ))
+        return tuple(reactions)
+
+
+def prefork(*objects) -> None:
+    """
+    Prepare long-lived objects in a parent process that is about to fork workers.
+
+    Warms up every object that has a warmup() method (building any missing
+    index and paying first-scan costs once, in the parent), collects garbage,
+    then moves every surviving object into the permanent generation with
+    gc.freeze(). Frozen objects are never visited by later collections in
+    the workers, so the collector does not write to, and thereby unshare,
+    the pages holding the parent's indexes.
+
+    Call it last thing before forking, e.g. from a pre-fork server hook.
+
+    Args:
+        objects: Matchers, checkers or anything else to warm up
+    """
+    for obj in objects:
+        warmup = getattr(obj, 'warmup', None)
+        if callable(warmup):
+            warmup()
+    gc.collect()
+    if hasattr(gc, 'freeze'):
+        gc.freeze()
@@ -0,0 +1,109 @@
+"""
+Binary Snapshots of Built Matcher and Rule Indexes
+
+Snapshots are pickles written to a local cache directory and keyed by the
+SHA-256 of the source YAML, so a changed file never loads a stale index.
+Only point snapshot_dir at a directory you trust: loading a snapshot
+unpickles it.
+"""
+
+import hashlib
+import os
+import pickle
+from typing import Any, Dict, Optional
+
+# Bump whenever the layout of a snapshot's state changes
+SNAPSHOT_FORMAT = 4
+
+
+def source_digest(path: str) -> Optional[str]:
+    """
+    Hash the content of a source file.
+
+    Args:
+        path: Path to the source file
+
+    Returns:
+        Hex SHA-256 digest, or None if the file cannot be read (the regular
+        loader then reports the error)
+    """
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 16), b''):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def snapshot_path(snapshot_dir: str, kind: str, digest: str, *options: Any) -> str:
+    """
+    Build the snapshot file path for a source digest and build options.
+
+    Args:
+        snapshot_dir: Directory holding snapshots
+        kind: Kind of index ('matcher' or 'rules')
+        digest: Source file digest from source_digest()
+        options: Construction options that change the built index
+
+    Returns:
+        Path of the snapshot file
+    """
+    key = hashlib.sha256(repr((SNAPSHOT_FORMAT, digest, options)).encode('utf-8')).hexdigest()
+    return os.path.join(snapshot_dir, f'{kind}-{key[:32]}.snapshot')
+
+
+def load_snapshot(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Load a snapshot's state.
+
+    Args:
+        path: Snapshot file path
+
+    Returns:
+        The saved state, or None if the snapshot is missing or unreadable
+    """
+    try:
+        with open(path, 'rb') as f:
+            payload = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+
+    if not isinstance(payload, dict) or payload.get('format') != SNAPSHOT_FORMAT:
+        return None
+    return payload.get('state')
+
+
+def save_snapshot(path: str, state: Dict[str, Any]):
+    """
+    Atomically write a snapshot.
+
+    The snapshot is written to a temporary file and renamed into place, so
+    concurrent readers see either the old snapshot or the complete new one.
+    Failing to write a snapshot is not an error; the index is simply rebuilt
+    next time.
+
+    Args:
+        path: Snapshot file path
+        state: Attributes to save
+    """
+    import tempfile
+
+    directory = os.path.dirname(path) or '.'
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    except OSError:
+        return
+
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump({'format': SNAPSHOT_FORMAT, 'state': state}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
@@ -0,0 +1,149 @@
+"""
+Opt-in Instrumentation for Matcher and Cross-Reactivity Hot Paths
+"""
+
+import json
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+# (metric name, sorted label pairs)
+_SeriesKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class StatsSink(ABC):
+    """
+    Interface for receiving instrumentation events.
+
+    Pass any object with these two methods as ``stats=`` to IngredientMatcher or
+    CrossReactivityChecker to forward events to an existing metrics system.
+    Without a sink, instrumented code paths are skipped entirely.
+
+    Subclasses must implement both methods; one that misses either cannot be
+    instantiated.
+    """
+
+    @abstractmethod
+    def count(self, metric: str, value: int = 1, **labels: str):
+        """Add value to a counter."""
+
+    @abstractmethod
+    def observe(self, metric: str, seconds: float, **labels: str):
+        """Record one duration in seconds."""
+
+
+class StatsCollector(StatsSink):
+    """
+    In-process sink that aggregates counters and timings.
+
+    Timings are kept as count, sum and max per labelled series. Aggregates can
+    be exported as JSON or in the Prometheus text exposition format. Safe to
+    share between threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[_SeriesKey, int] = {}
+        self._timings: Dict[_SeriesKey, List[float]] = {}  # [count, sum, max]
+
+    def count(self, metric: str, value: int = 1, **labels: str):
+        key = (metric, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, metric: str, seconds: float, **labels: str):
+        key = (metric, tuple(sorted(labels.items())))
+        with self._lock:
+            timing = self._timings.get(key)
+            if timing is None:
+                self._timings[key] = [1, seconds, seconds]
+            else:
+                timing[0] += 1
+                timing[1] += seconds
+                if seconds > timing[2]:
+                    timing[2] = seconds
+
+    def reset(self):
+        """Discard everything recorded so far."""
+        with self._lock:
+            self._counters.clear()
+            self._timings.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, List[Dict]]]:
+        """
+        Get a point-in-time copy of all aggregates.
+
+        Returns:
+            Dictionary with 'counters' and 'timings', each mapping a metric name
+            to a list of labelled series
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            timings = {key: list(value) for key, value in self._timings.items()}
+
+        result: Dict[str, Dict[str, List[Dict]]] = {'counters': {}, 'timings': {}}
+        for (metric, labels), value in sorted(counters.items()):
+            result['counters'].setdefault(metric, []).append({'labels': dict(labels), 'value': value})
+        for (metric, labels), (count, total, longest) in sorted(timings.items()):
+            result['timings'].setdefault(metric, []).append({
+                'labels': dict(labels),
+                'count': count,
+                'sum_seconds': total,
+                'max_seconds': longest,
+            })
+        return result
+
+    def to_json(self, indent: Optional[int] = None) -> str:
+        """
+        Export the aggregates as JSON.
+
+        Args:
+            indent: Optional indentation for pretty-printing
+
+        Returns:
+            JSON string of snapshot()
+        """
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self, prefix: str = 'food_inspector') -> str:
+        """
+        Export the aggregates in the Prometheus text exposition format.
+
+        Counters become ``<prefix>_<metric>_total``; timings become summaries
+        with ``_count`` and ``_sum`` series.
+
+        Args:
+            prefix: Prefix for every metric name
+
+        Returns:
+            Exposition text, ending with a newline
+        """
+        snapshot = self.snapshot()
+        lines = []
+
+        for metric, series in snapshot['counters'].items():
+            name = f'{prefix}_{metric}_total'
+            lines.append(f'# TYPE {name} counter')
+            for entry in series:
+                lines.append(f"{name}{_format_labels(entry['labels'])} {entry['value']}")
+
+        for metric, series in snapshot['timings'].items():
+            name = f'{prefix}_{metric}'
+            lines.append(f'# TYPE {name} summary')
+            for entry in series:
+                labels = _format_labels(entry['labels'])
+                lines.append(f"{name}_count{labels} {entry['count']}")
+                lines.append(f"{name}_sum{labels} {entry['sum_seconds']!r}")
+
+        return '\n'.join(lines) + '\n' if lines else ''
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    """Render a Prometheus label set, escaping values."""
+    if not labels:
+        return ''
+    rendered = ','.join(
+        '{}="{}"'.format(key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for key, value in labels.items()
+    )
+    return '{' + rendered + '}'
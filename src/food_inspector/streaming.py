@@ -0,0 +1,215 @@
+"""
+Streaming Scans over Large Ingredient Dumps
+"""
+
+import csv
+import json
+import os
+from itertools import chain, islice
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .matcher import _scan_in_worker
+from .normalize import NormalizedText, normalize_text
+
+# Record formats understood by iter_records
+RECORD_FORMATS = ('text', 'jsonl', 'csv')
+
+_EXTENSION_FORMATS = {
+    '.txt': 'text',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.csv': 'csv',
+}
+
+ScanResult = Dict[str, Dict[str, List[Tuple[str, int, int]]]]
+StreamMatch = Tuple[str, str, Tuple[str, int, int]]
+
+
+def _detect_format(source: Any) -> str:
+    """Guess the record format from a path or file object's name."""
+    name = source if isinstance(source, (str, os.PathLike)) else getattr(source, 'name', '')
+    extension = os.path.splitext(str(name))[1].lower()
+    return _EXTENSION_FORMATS.get(extension, 'text')
+
+
+def _read_records(handle: IO[str], fmt: str) -> Iterator[Any]:
+    """Yield records from an open text file, one at a time."""
+    if fmt == 'csv':
+        yield from csv.DictReader(handle)
+    elif fmt == 'jsonl':
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on line {line_number}: {e}")
+    else:
+        for line in handle:
+            yield line.rstrip('\r\n')
+
+
+def iter_records(source: Union[str, os.PathLike, IO[str], Iterable[Any]],
+                 format: Optional[str] = None) -> Iterator[Any]:
+    """
+    Lazily read records from a path, an open file or an iterable.
+
+    Args:
+        source: Path to a dump, an open text file, or any iterable of records
+        format: 'text' (one label per line), 'jsonl' or 'csv'. Detected from
+                the file extension when omitted; iterables are passed through.
+
+    Yields:
+        Records: strings for 'text', dictionaries for 'jsonl' and 'csv'
+    """
+    if format is not None and format not in RECORD_FORMATS:
+        raise ValueError(
+            f"Invalid record format '{format}': expected one of {list(RECORD_FORMATS)}."
+        )
+
+    if isinstance(source, (str, os.PathLike)):
+        fmt = format or _detect_format(source)
+        with open(source, 'r', newline='' if fmt == 'csv' else None, encoding='utf-8') as handle:
+            yield from _read_records(handle, fmt)
+    elif hasattr(source, 'read'):
+        yield from _read_records(source, format or _detect_format(source))
+    else:
+        yield from source
+
+
+def _record_text(record: Any, field: Optional[str]) -> str:
+    """Extract the text to scan from a record."""
+    if field is None:
+        if not isinstance(record, str):
+            raise ValueError(
+                f"A field name is required to scan records of type {type(record).__name__}."
+            )
+        return record
+
+    value = record.get(field) if isinstance(record, dict) else None
+    return value if isinstance(value, str) else ''
+
+
+def scan_records(matcher, source: Union[str, os.PathLike, IO[str], Iterable[Any]],
+                 field: Optional[str] = None, format: Optional[str] = None,
+                 batch_size: int = 1024, workers: int = 1) -> Iterator[Tuple[Any, ScanResult]]:
+    """
+    Scan every record of a dump, holding at most one batch in memory.
+
+    Args:
+        matcher: The IngredientMatcher to scan with
+        source: Path, open file or iterable of records (see iter_records)
+        field: Record field holding the ingredient text (JSONL/CSV/dicts)
+        format: Record format, detected from the file extension by default
+        batch_size: Number of records read ahead and scanned together
+        workers: Worker processes; one pool is reused for the whole stream
+
+    Yields:
+        Tuples (record, scan_result) in input order
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be at least 1, got {batch_size}.")
+
+    records = iter_records(source, format)
+
+    if workers <= 1:
+        for record in records:
+            yield record, matcher.scan_text(_record_text(record, field))
+        return
+
+    chunksize = max(1, batch_size // (workers * 4))
+    with matcher._worker_pool(workers) as pool:
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                break
+            texts = [_record_text(record, field) for record in batch]
+            yield from zip(batch, pool.map(_scan_in_worker, texts, chunksize))
+
+
+def _iter_chunks(source: Union[IO[str], Iterable[str]], chunk_size: int) -> Iterator[str]:
+    """Yield text chunks from a file object or pass an iterable through."""
+    if hasattr(source, 'read'):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        yield from source
+
+
+def scan_text_chunks(matcher, source: Union[IO[str], Iterable[str]],
+                     chunk_size: int = 1 << 16) -> Iterator[StreamMatch]:
+    """
+    Scan one logical text delivered in chunks, without losing split matches.
+
+    Each scan covers the unconsumed tail of the previous chunk plus the new
+    one. Only matches that start far enough from the end of the buffer to be
+    complete (including the character after them, needed for the word-boundary
+    check) are reported; the rest are found again in the next round. With a
+    normalizing matcher, "far enough" is measured in normalized characters.
+
+    Args:
+        matcher: The IngredientMatcher to scan with
+        source: An open text file (read chunk_size characters at a time) or an
+                iterable of string chunks
+        chunk_size: Read size used for file objects
+
+    Yields:
+        Tuples (category, synonym, (matched_text, start, end)) with offsets
+        relative to the whole stream, in buffer order
+    """
+    # Scan every buffer with one index, and past the result cache: buffers are
+    # transient, so caching them would only push out real entries
+    index = matcher._index
+    # Longest possible match (or compound/phrase override) plus the boundary
+    # character that follows it
+    terms = chain(index.reverse_map, index.terms)
+    keep = max((len(term) for term in terms), default=0) + 1
+    # Context needed before a match: the leading boundary character, plus any
+    # compound or phrase prefix that decides whether the match counts
+    overrides = chain(matcher._compounds.values(), matcher._phrases.values())
+    lookbehind = max((len(prefix) for pairs in overrides for prefix, _ in pairs), default=0) + 1
+    buffer = ''
+    buffer_start = 0    # Stream offset of buffer[0]
+    emitted_until = 0   # Matches starting before this offset were reported
+    last_end: Dict[Tuple[str, str], int] = {}
+
+    def drain(limit: int) -> Iterator[StreamMatch]:
+        found = []
+        for category, synonyms in matcher._scan(index, buffer).items():
+            for synonym, matches in synonyms.items():
+                for matched_text, start, end in matches:
+                    start += buffer_start
+                    if emitted_until <= start < limit:
+                        found.append((start, end + buffer_start, category, synonym, matched_text))
+        found.sort()
+        for start, end, category, synonym, matched_text in found:
+            # Keep finditer's non-overlapping guarantee across buffers
+            if start < last_end.get((category, synonym), 0):
+                continue
+            last_end[(category, synonym)] = end
+            yield category, synonym, (matched_text, start, end)
+
+    for chunk in _iter_chunks(source, chunk_size):
+        buffer += chunk
+        # keep and lookbehind count term characters, so measure the buffer the
+        # way the matcher sees it: normalizing collapses whitespace runs, and
+        # a match can span far more original characters than its term has
+        view = normalize_text(buffer) if matcher.normalize else NormalizedText(buffer, buffer)
+        length = len(view.text)
+        if length <= keep:
+            continue
+
+        limit = buffer_start + view.original_span(length - keep, length - keep + 1)[0]
+        yield from drain(limit)
+        emitted_until = limit
+
+        # Retain the context before the limit that the next round's matches need
+        context = max(0, length - keep - lookbehind)
+        consumed = view.original_span(context, context + 1)[0]
+        buffer = buffer[consumed:]
+        buffer_start += consumed
+
+    yield from drain(buffer_start + len(buffer))
@@ -0,0 +1,29 @@
+"""
+Fixtures shared by several test modules
+"""
+
+import random
+
+import pytest
+from food_inspector.matcher import IngredientMatcher
+
+
+@pytest.fixture(params=["regex", "automaton", "overrides"])
+def matcher(request):
+    """Create matchers with each engine, and one with normalization and overrides."""
+    if request.param == "overrides":
+        return IngredientMatcher(engine="automaton", normalize=True,
+                                 exceptions={"malt": ["maltodextrin"]},
+                                 allowed_phrases={"milk": ["coconut milk"]})
+    return IngredientMatcher(engine=request.param)
+
+
+@pytest.fixture
+def label_texts(matcher):
+    """Generator of random labels for the matcher fixture's vocabulary."""
+    def texts(count=200, seed=5):
+        """Random labels mixing vocabulary terms with separators and near-misses."""
+        rng = random.Random(seed)
+        words = list(matcher.reverse_map) + ["coconut milk", "maltodextrin", "MILK\n solids", "sugar", "-", ""]
+        return [", ".join(rng.choices(words, k=15)) for _ in range(count)]
+    return texts
@@ -0,0 +1,97 @@
+"""
+Tests for the combined analyze() pipeline
+"""
+
+import pytest
+from food_inspector.analysis import Analyzer
+from food_inspector.cross_reactivity import CrossReactivityChecker
+from food_inspector.matcher import IngredientMatcher
+
+LABEL = "Peanut butter, whey, shrimp, sugar"
+
+
+@pytest.fixture(scope="module")
+def analyzer():
+    """Create an Analyzer with the default data files."""
+    return Analyzer()
+
+
+def test_analyze_matches_separate_calls(analyzer):
+    """Test that analyze() agrees with scan_text() plus per-category rule lookups."""
+    result = analyzer.analyze(LABEL, min_confidence="medium")
+    scan = analyzer.matcher.scan_text(LABEL)
+
+    expected = [
+        rule
+        for category in analyzer.matcher.synonyms
+        if category in scan
+        for rule in analyzer.checker.get_potential_reactions(category, "medium")
+        if rule.target not in scan
+    ]
+
+    assert result.matches.to_dict() == scan
+    assert set(result.direct) == set(scan)
+    assert list(result.cross_reactive) == expected
+    assert "goat_milk" in result.cross_reactive_targets()
+
+
+def test_cross_reactions_of_existing_scan(analyzer):
+    """Test that rules resolved from scan_text() categories match analyze()."""
+    scan = analyzer.matcher.scan_text(LABEL)
+
+    for confidence in ("low", "medium", "high"):
+        assert analyzer.cross_reactions(scan, confidence) == \
+            analyzer.analyze(LABEL, min_confidence=confidence).cross_reactive
+    assert analyzer.cross_reactions([]) == ()
+    with pytest.raises(ValueError):
+        analyzer.cross_reactions(scan, "certain")
+
+
+def test_directly_detected_targets_not_cross_reactive(analyzer):
+    """Test that an allergen found directly is not also reported as cross-reactive."""
+    result = analyzer.analyze("peanut, almonds")
+
+    assert set(result.direct) == {"peanuts", "tree_nuts"}
+    assert "tree_nuts" not in result.cross_reactive_targets()
+    assert "peanuts" not in result.cross_reactive_targets()
+
+
+def test_profile_filters_direct_and_cross_reactive(analyzer):
+    """Test that only allergens in the profile are reported."""
+    result = analyzer.analyze(LABEL, profile=["dairy", "goat_milk"])
+
+    assert result.direct == ("dairy",)
+    assert result.cross_reactive_targets() == ("goat_milk",)
+    assert set(result.matches.to_dict()) == {"dairy"}
+    assert result.to_dict()["cross_reactive"] == {"goat_milk": [("dairy", "high")]}
+
+
+def test_empty_result_is_falsy(analyzer):
+    """Test that a label without allergens gives an empty result."""
+    result = analyzer.analyze("sugar, salt, water")
+
+    assert not result
+    assert result.to_dict() == {"direct": {}, "cross_reactive": {}}
+
+
+def test_unknown_confidence_rejected(analyzer):
+    """Test that an unknown min_confidence raises ValueError."""
+    with pytest.raises(ValueError):
+        analyzer.analyze(LABEL, min_confidence="certain")
+
+
+def test_table_follows_reloads(tmp_path):
+    """Test that the per-category rule table is rebuilt after a reload."""
+    synonyms = tmp_path / "synonyms.yaml"
+    rules = tmp_path / "rules.yaml"
+    synonyms.write_text("latex: [latex]\n")
+    rules.write_text("cross_reactivity_rules:\n"
+                     "  - {source: latex, target: banana, confidence: high}\n")
+    analyzer = Analyzer(IngredientMatcher(str(synonyms)), CrossReactivityChecker(str(rules)))
+    assert analyzer.analyze("latex gloves").cross_reactive_targets() == ("banana",)
+
+    rules.write_text("cross_reactivity_rules:\n"
+                     "  - {source: latex, target: kiwi, confidence: high}\n")
+    analyzer.checker.reload(force=True)
+
+    assert analyzer.analyze("latex gloves").cross_reactive_targets() == ("kiwi",)
@@ -0,0 +1,128 @@
+"""
+Tests for the scan result cache
+"""
+
+import os
+import shutil
+
+import pytest
+from food_inspector.cache import ScanCache, estimate_result_size
+from food_inspector.matcher import IngredientMatcher
+from food_inspector.stats import StatsCollector
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+def test_cached_scan_matches_uncached():
+    """Test that cached results are identical to fresh scans."""
+    cache = ScanCache()
+    matcher = IngredientMatcher(cache=cache)
+    text = "Contains: wheat flour, soy lecithin, milk, eggs"
+
+    first = matcher.scan_text(text)
+    second = matcher.scan_text(text)
+
+    assert first == second == IngredientMatcher().scan_text(text)
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hit_rate"] == 0.5
+
+
+def test_cached_results_are_not_shared():
+    """Test that mutating a returned result does not corrupt the cache."""
+    matcher = IngredientMatcher(cache=ScanCache())
+    text = "Contains milk"
+
+    matcher.scan_text(text)["dairy"]["milk"].clear()
+
+    assert matcher.scan_text(text)["dairy"]["milk"] == [("milk", 9, 13)]
+
+
+def test_lru_eviction_by_entries():
+    """Test that the least recently used entry is evicted first."""
+    cache = ScanCache(max_entries=2)
+    matcher = IngredientMatcher(cache=cache)
+
+    matcher.scan_text("milk")
+    matcher.scan_text("whey")
+    matcher.scan_text("milk")   # Refresh "milk"
+    matcher.scan_text("eggs")   # Evicts "whey"
+    matcher.scan_text("milk")
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 2
+
+
+def test_eviction_by_bytes():
+    """Test that the byte bound is respected."""
+    result = {"dairy": {"milk": [("milk", 0, 4)]}}
+    size = estimate_result_size(result)
+    cache = ScanCache(max_bytes=size * 2)
+
+    for i in range(5):
+        cache.put(i, result)
+
+    assert len(cache) == 2
+    assert cache.stats()["approx_bytes"] <= size * 2
+
+
+def test_shared_cache_separates_vocabularies(tmp_path):
+    """Test that matchers with different vocabularies never share entries."""
+    path = tmp_path / "synonyms.yaml"
+    path.write_text("grains:\n  - wheat\n")
+    cache = ScanCache()
+    default = IngredientMatcher(cache=cache)
+    custom = IngredientMatcher(str(path), cache=cache)
+
+    assert default.fingerprint != custom.fingerprint
+    assert set(default.scan_text("wheat")) == {"gluten"}
+    assert set(custom.scan_text("wheat")) == {"grains"}
+
+
+def test_fingerprint_survives_snapshots(tmp_path):
+    """Test that a snapshot-restored matcher has the same fingerprint."""
+    path = tmp_path / "ingredient_synonyms.yaml"
+    shutil.copy(os.path.join(DATA_DIR, "ingredient_synonyms.yaml"), path)
+    snapshot_dir = str(tmp_path / "snapshots")
+
+    built = IngredientMatcher(str(path), snapshot_dir=snapshot_dir)
+    restored = IngredientMatcher(str(path), snapshot_dir=snapshot_dir)
+
+    assert restored.fingerprint == built.fingerprint == IngredientMatcher(str(path)).fingerprint
+
+
+def test_cache_hits_reach_stats_sink():
+    """Test that cache hits and misses are counted by the stats sink."""
+    stats = StatsCollector()
+    matcher = IngredientMatcher(cache=ScanCache(), stats=stats)
+
+    matcher.scan_text("milk")
+    matcher.scan_text("milk")
+    counters = stats.snapshot()["counters"]
+
+    assert counters["matcher_result_cache_hits"][0]["value"] == 1
+    assert counters["matcher_result_cache_misses"][0]["value"] == 1
+
+
+@pytest.mark.parametrize("engine", ["regex", "automaton"])
+def test_warmup_leaves_cache_and_stats_alone(engine):
+    """Test that warmup's throwaway scan is neither cached nor counted."""
+    stats = StatsCollector()
+    cache = ScanCache()
+    matcher = IngredientMatcher(engine=engine, cache=cache, stats=stats)
+    before = stats.snapshot()
+
+    matcher.warmup()
+
+    assert len(cache) == 0
+    assert stats.snapshot() == before
+
+
+def test_invalid_bounds():
+    """Test that non-positive bounds are rejected."""
+    with pytest.raises(ValueError):
+        ScanCache(max_entries=0)
+    with pytest.raises(ValueError):
+        ScanCache(max_bytes=0)
@@ -0,0 +1,93 @@
+"""
+Tests for the food-inspector command-line interface
+"""
+
+import io
+import json
+
+import pytest
+from food_inspector.cli import main
+from food_inspector.matcher import IngredientMatcher
+
+LABELS = ["wheat flour, whey", "sugar, salt", "shrimp, peanut"]
+
+
+def _run(capsys, argv, stdin=None, monkeypatch=None):
+    """Run the CLI and return (exit status, parsed NDJSON lines, stderr)."""
+    if stdin is not None:
+        monkeypatch.setattr("sys.stdin", io.StringIO(stdin))
+    status = main(argv)
+    captured = capsys.readouterr()
+    return status, [json.loads(line) for line in captured.out.splitlines()], captured.err
+
+
+def test_scan_stdin(capsys, monkeypatch):
+    """Test that stdin labels produce one result per line in order, plus a summary."""
+    status, results, err = _run(capsys, ["scan"], "\n".join(LABELS) + "\n", monkeypatch)
+    matcher = IngredientMatcher(engine="automaton")
+
+    assert status == 0
+    assert [r["record"] for r in results] == [1, 2, 3]
+    assert results[0]["categories"] == ["dairy", "gluten"]
+    assert results[1]["matches"] == {}
+    assert results[2]["matches"] == json.loads(json.dumps(matcher.scan_text(LABELS[2])))
+    assert "Scanned 3 labels" in err and "2 with matches" in err
+
+
+def test_scan_files_and_globs_in_parallel(capsys, tmp_path):
+    """Test that globbed files scanned with --jobs match a serial scan."""
+    for i in range(2):
+        (tmp_path / f"labels{i}.txt").write_text("\n".join(LABELS * 50) + "\n")
+
+    _, serial, _ = _run(capsys, ["scan", str(tmp_path / "*.txt"), "-q"])
+    status, parallel, err = _run(capsys, ["scan", str(tmp_path / "*.txt"), "--jobs", "2",
+                                          "--batch-size", "64", "-q"])
+
+    assert status == 0
+    assert err == ""
+    assert len(parallel) == 300
+    assert parallel == serial
+    assert parallel[150]["source"] == str(tmp_path / "labels1.txt")
+
+
+def test_jsonl_fields_and_warnings(capsys, tmp_path):
+    """Test --field/--id-field on JSONL input and cross-reactivity warnings."""
+    path = tmp_path / "products.jsonl"
+    path.write_text('{"sku": "A1", "ingredients": "whey, peanut"}\n')
+
+    _, results, _ = _run(capsys, ["scan", str(path), "--field", "ingredients", "--id-field", "sku",
+                                  "--warnings", "--min-confidence", "medium", "-q"])
+
+    assert results[0]["id"] == "A1"
+    targets = {w["target"] for w in results[0]["warnings"]}
+    assert {"goat_milk", "tree_nuts"} <= targets
+    assert all(w["source"] in ("dairy", "peanuts") for w in results[0]["warnings"])
+
+
+def test_field_ignored_for_text_and_required_for_jsonl(capsys, tmp_path):
+    """Test that text lines are scanned whole even with --field, and JSONL needs it."""
+    text = tmp_path / "labels.txt"
+    text.write_text("whey\n")
+    records = tmp_path / "products.jsonl"
+    records.write_text('{"ingredients": "whey"}\n')
+
+    _, results, _ = _run(capsys, ["scan", str(text), "--field", "ingredients", "-q"])
+    status = main(["scan", str(records), "-q"])
+
+    assert results[0]["categories"] == ["dairy"]
+    assert status == 1
+    assert "field name is required" in capsys.readouterr().err
+
+
+def test_missing_input_reports_error(capsys, tmp_path):
+    """Test that a missing file is reported on stderr with a non-zero status."""
+    status = main(["scan", str(tmp_path / "missing.txt")])
+
+    assert status == 1
+    assert "not found" in capsys.readouterr().err
+
+
+def test_unknown_command_exits(capsys):
+    """Test that argparse rejects an unknown subcommand."""
+    with pytest.raises(SystemExit):
+        main(["inspect"])
@@ -198,8 +198,8 @@ def test_unknown_allergen(checker):
     """Test querying an unknown allergen."""
     reactions = checker.get_potential_reactions("unknown_allergen")
     
-    # Should return empty list
-    assert reactions == []
+    # Should return an empty tuple
+    assert reactions == ()
 
 
 def test_rule_has_notes(checker):
@@ -209,3 +209,129 @@ def test_rule_has_notes(checker):
     if rule:
         assert rule.notes
         assert len(rule.notes) > 0
+
+
+CHAIN_RULES = """
+cross_reactivity_rules:
+  - {source: a, target: b, confidence: high}
+  - {source: b, target: c, confidence: medium}
+  - {source: c, target: d, confidence: high}
+  - {source: a, target: d, confidence: low}
+  - {source: d, target: a, confidence: high}
+"""
+
+
+@pytest.fixture
+def chain_rules_file(tmp_path):
+    """Write a small rules file with multi-step chains and a cycle."""
+    path = tmp_path / "chain_rules.yaml"
+    path.write_text(CHAIN_RULES)
+    return str(path)
+
+
+def test_transitive_closure_depth(chain_rules_file):
+    """Test that closure_depth bounds the length of followed chains."""
+    one = CrossReactivityChecker(chain_rules_file, closure_depth=1)
+    three = CrossReactivityChecker(chain_rules_file, closure_depth=3)
+
+    assert one.get_reachable(["a"]) == {"b", "d"}
+    assert three.get_reachable(["a"]) == {"b", "c", "d"}
+    assert three.get_reachable(["b"]) == {"c", "d", "a"}
+
+
+def test_transitive_closure_weakest_link(chain_rules_file):
+    """Test that a chain's confidence is that of its weakest rule."""
+    checker = CrossReactivityChecker(chain_rules_file, closure_depth=3)
+
+    assert checker.get_reachable(["a"], "high") == {"b"}
+    assert checker.get_reachable(["a"], "medium") == {"b", "c", "d"}
+    assert checker.get_transitive_reactions("a") == {"b": "high", "c": "medium", "d": "medium"}
+
+
+def test_transitive_closure_mask_combines_sources(chain_rules_file):
+    """Test that reachable sets from several allergens are combined."""
+    checker = CrossReactivityChecker(chain_rules_file, closure_depth=1)
+
+    assert checker.get_reachable(["b", "c", "unknown"]) == {"c", "d"}
+    assert checker.reachable_mask([]) == 0
+
+
+def test_transitive_closure_requires_depth(checker):
+    """Test that transitive lookups need closure_depth."""
+    with pytest.raises(RuntimeError):
+        checker.get_reachable(["shellfish"])
+    with pytest.raises(ValueError):
+        CrossReactivityChecker(closure_depth=0)
+
+
+def test_transitive_closure_default_rules():
+    """Test the closure over the bundled rules."""
+    checker = CrossReactivityChecker(closure_depth=3)
+
+    assert checker.get_reachable(["shellfish"]) >= {"dust_mites", "insects"}
+    assert "peanuts" not in checker.get_reachable(["peanuts"])
+
+
+@pytest.mark.parametrize("min_confidence", [None, "low", "medium", "high"])
+def test_indexed_queries_match_linear_filter(checker, min_confidence):
+    """Test that bucketed indexes return what a linear filter would."""
+    level = CrossReactivityChecker.CONFIDENCE_LEVELS.get(min_confidence, 1)
+
+    for allergen in {r.source for r in checker.rules} | {r.target for r in checker.rules}:
+        expected_reactions = [
+            r for r in checker.rules
+            if r.source == allergen and checker.CONFIDENCE_LEVELS[r.confidence] >= level
+        ]
+        expected_sources = [
+            r for r in checker.rules
+            if r.target == allergen and checker.CONFIDENCE_LEVELS[r.confidence] >= level
+        ]
+        assert checker.get_potential_reactions(allergen, min_confidence) == tuple(expected_reactions)
+        assert checker.get_sources_for_target(allergen, min_confidence) == tuple(expected_sources)
+
+
+def test_indexed_queries_do_not_rebuild(checker):
+    """Test that repeated filtered queries return the same prebuilt tuple."""
+    first = checker.get_potential_reactions("latex", "medium")
+    second = checker.get_potential_reactions("latex", "medium")
+
+    assert first is second
+
+
+def test_rules_by_confidence_index(checker):
+    """Test the per-confidence rule index."""
+    for confidence in ("low", "medium", "high"):
+        expected = [r for r in checker.get_all_rules() if r.confidence == confidence]
+        assert checker.get_rules_by_confidence(confidence) == tuple(expected)
+    assert checker.get_rules_by_confidence("unknown") == ()
+
+
+def test_query_results_cannot_change_the_index(checker):
+    """Test that callers cannot alter later results through a returned value."""
+    queries = [
+        lambda: checker.get_potential_reactions("peanuts", "medium"),
+        lambda: checker.get_sources_for_target("tree_nuts"),
+        lambda: checker.get_rules_by_confidence("high"),
+    ]
+
+    for query in queries:
+        result = query()
+        expected = list(result)
+        with pytest.raises(AttributeError):
+            result.append(result[0])
+        result += (result[0],)
+        assert list(query()) == expected
+
+
+def test_check_cross_reactivity_first_rule_wins(tmp_path):
+    """Test that the pair index keeps the first rule for duplicate pairs."""
+    path = tmp_path / "rules.yaml"
+    path.write_text(
+        "cross_reactivity_rules:\n"
+        "  - {source: a, target: b, confidence: low, notes: first}\n"
+        "  - {source: a, target: b, confidence: high, notes: second}\n"
+    )
+    checker = CrossReactivityChecker(str(path))
+
+    assert checker.check_cross_reactivity("a", "b").notes == "first"
+    assert checker.check_cross_reactivity("b", "a") is None
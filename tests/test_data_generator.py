@@ -0,0 +1,101 @@
+"""
+Tests for incremental regeneration in the data generator
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+GENERATOR = Path(__file__).resolve().parent.parent / "tools" / "data-generator" / "generate_data.py"
+OUTPUTS = ["synonyms.v1.json", "cross-reactivity.v1.json", "scoring-policy.v1.json", "reference-data.v1.bin"]
+
+
+def _generate(output, *args, epoch="1700000000"):
+    """Run the generator into output with a fixed SOURCE_DATE_EPOCH (None leaves it unset)."""
+    env = dict(os.environ)
+    env.pop("SOURCE_DATE_EPOCH", None)
+    if epoch is not None:
+        env["SOURCE_DATE_EPOCH"] = epoch
+    result = subprocess.run(
+        [sys.executable, str(GENERATOR), "--format", "both", "--output", str(output), *args],
+        check=True, capture_output=True, text=True, env=env,
+    )
+    return result.stdout
+
+
+@pytest.fixture
+def output(tmp_path):
+    """Generate every artifact once."""
+    _generate(tmp_path)
+    return tmp_path
+
+
+def test_unchanged_inputs_are_skipped(output):
+    """Test that a second run rewrites nothing."""
+    before = {name: (output / name).stat().st_mtime_ns for name in OUTPUTS + ["manifest.json"]}
+
+    stdout = _generate(output)
+
+    assert stdout.count("(unchanged)") == len(OUTPUTS)
+    assert {name: (output / name).stat().st_mtime_ns for name in before} == before
+
+
+def test_output_is_deterministic(output, tmp_path_factory):
+    """Test that generated_at comes from SOURCE_DATE_EPOCH and output is byte-stable."""
+    other = tmp_path_factory.mktemp("again")
+    _generate(other, "--jobs", "1")
+
+    assert json.loads((output / "synonyms.v1.json").read_text())["generated_at"] == "2023-11-14T22:13:20Z"
+    for name in OUTPUTS:
+        assert (output / name).read_bytes() == (other / name).read_bytes()
+
+
+def test_modified_or_missing_outputs_are_rebuilt(output):
+    """Test that artifacts edited or deleted since the last run are regenerated."""
+    expected = (output / "synonyms.v1.json").read_bytes()
+    (output / "synonyms.v1.json").write_text("{}")
+    (output / "reference-data.v1.bin").unlink()
+
+    stdout = _generate(output)
+
+    assert stdout.count("(unchanged)") == len(OUTPUTS) - 2
+    assert (output / "synonyms.v1.json").read_bytes() == expected
+    assert (output / "reference-data.v1.bin").exists()
+
+
+def test_changed_settings_regenerate(output):
+    """Test that a different SOURCE_DATE_EPOCH invalidates every artifact."""
+    stdout = _generate(output, epoch="1800000000")
+
+    assert "(unchanged)" not in stdout
+    assert json.loads((output / "scoring-policy.v1.json").read_text())["generated_at"].startswith("2027-01-15")
+
+
+def test_output_ignores_modification_times(tmp_path):
+    """Test that without SOURCE_DATE_EPOCH, touching a source does not change the output."""
+    source = GENERATOR.parent / "generators" / "synonyms.py"
+    stat = source.stat()
+    _generate(tmp_path / "before", epoch=None)
+    try:
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000_000))
+        stdout = _generate(tmp_path / "after", epoch=None)
+    finally:
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert "Error" not in stdout
+    for name in OUTPUTS:
+        assert (tmp_path / "before" / name).read_bytes() == (tmp_path / "after" / name).read_bytes()
+
+
+def test_generator_script_is_an_input(monkeypatch):
+    """Test that every artifact's input digest covers generate_data.py itself."""
+    monkeypatch.syspath_prepend(str(GENERATOR.parent))
+    import generate_data
+
+    assert "generate_data.py" in generate_data.BINARY_SOURCES
+    for _, sources in generate_data.GENERATORS.values():
+        assert "generate_data.py" in sources
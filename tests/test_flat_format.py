@@ -0,0 +1,54 @@
+"""
+Tests for the flat table buffers shared by the memory-mappable formats
+"""
+
+import pytest
+from food_inspector.flat_format import FlatBuffer, FlatLayout, StringTable, pack_u32
+
+LAYOUT = FlatLayout(b"TEST", 3, ("string_offsets", "string_data", "pairs"), "test buffer", {"pairs": 2})
+
+
+def _build():
+    """A buffer with two strings and two (string, value) pairs."""
+    strings = StringTable()
+    pairs = [strings("ünïcode"), 7, strings("plain"), 9, strings("ünïcode"), 11]
+    offsets, data = strings.encode()
+    return LAYOUT.pack({
+        "string_offsets": (pack_u32(offsets), len(offsets)),
+        "string_data": (data, len(data)),
+        "pairs": (pack_u32(pairs), 3),
+    })
+
+
+def test_round_trip(tmp_path):
+    """Test that tables and strings read back in place, from bytes and from a mapped file."""
+    path = tmp_path / "test.bin"
+    path.write_bytes(_build())
+
+    for flat in (FlatBuffer(LAYOUT, _build()), FlatBuffer.open(LAYOUT, str(path))):
+        pairs = flat.table("pairs")
+        assert list(pairs) == [0, 7, 1, 9, 0, 11]
+        assert [flat.string(pairs[i]) for i in range(0, len(pairs), 2)] == ["ünïcode", "plain", "ünïcode"]
+        assert flat.string_bytes(1) == b"plain"
+        flat.close()
+
+
+def test_sections_are_aligned():
+    """Test that every section starts on a 4-byte boundary."""
+    flat = FlatBuffer(LAYOUT, _build())
+
+    assert all(offset % 4 == 0 for offset, _ in flat.sections.values())
+    assert len(_build()) % 4 == 0
+
+
+def test_rejects_other_buffers():
+    """Test that short buffers, other formats and other versions raise ValueError."""
+    data = _build()
+    other_version = FlatLayout(b"TEST", 4, LAYOUT.sections, "test buffer")
+
+    with pytest.raises(ValueError, match="too short"):
+        FlatBuffer(LAYOUT, data[:8])
+    with pytest.raises(ValueError, match="not a test buffer"):
+        FlatBuffer(LAYOUT, b"XXXX" + data[4:])
+    with pytest.raises(ValueError, match="version 3"):
+        FlatBuffer(other_version, data)
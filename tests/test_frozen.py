@@ -0,0 +1,203 @@
+"""
+Tests for the frozen, thread-safe matcher and checker
+"""
+
+import pickle
+import random
+import threading
+
+import pytest
+from food_inspector.cross_reactivity import CrossReactivityChecker
+from food_inspector.frozen import FrozenChecker, FrozenMatcher
+from food_inspector.matcher import IngredientMatcher
+
+
+@pytest.fixture(scope="module")
+def checker():
+    """Create a CrossReactivityChecker with a transitive closure."""
+    return CrossReactivityChecker(closure_depth=3)
+
+
+def test_frozen_matches_source(matcher, label_texts):
+    """Test that every query of a frozen matcher agrees with its source matcher."""
+    frozen = matcher.freeze()
+
+    assert isinstance(frozen, FrozenMatcher)
+    assert frozen.fingerprint == matcher.fingerprint
+    for text in label_texts(50):
+        assert frozen.scan_text(text) == matcher.scan_text(text)
+        assert frozen.scan_compact(text).to_dict() == matcher.scan_text(text)
+        assert frozen.find_allergen_category(text, "dairy") == matcher.find_allergen_category(text, "dairy")
+        for term in ("WHEY", "malt", "flour"):
+            assert frozen.find_ingredient(text, term) == matcher.find_ingredient(text, term)
+    assert frozen.get_all_synonyms("dairy") == tuple(matcher.get_all_synonyms("dairy"))
+    assert frozen.get_allergen_for_ingredient("Whey") == matcher.get_allergen_for_ingredient("Whey")
+
+
+def test_frozen_matcher_is_immutable(matcher):
+    """Test that attributes and lookup tables of a frozen matcher cannot be changed."""
+    frozen = matcher.freeze()
+
+    with pytest.raises(AttributeError):
+        frozen.normalize = not frozen.normalize
+    with pytest.raises(TypeError):
+        frozen.synonyms["dairy"] = ("milk",)
+    with pytest.raises(TypeError):
+        frozen.reverse_map.pop("whey")
+    with pytest.raises(AttributeError):
+        frozen.get_all_synonyms("dairy").append("cream")
+    with pytest.raises(RuntimeError):
+        frozen.reload()
+
+    patterns = dict(frozen._index.patterns)
+    frozen.find_ingredient("Contains quinoa.", "quinoa")
+    assert dict(frozen._index.patterns) == patterns
+    assert frozen.freeze() is frozen
+
+
+def test_frozen_matcher_ignores_source_reload(tmp_path):
+    """Test that reloading the source matcher leaves a frozen copy unchanged."""
+    synonyms_file = tmp_path / "synonyms.yaml"
+    synonyms_file.write_text("dairy:\n  - milk\n")
+    matcher = IngredientMatcher(str(synonyms_file), engine="automaton")
+    frozen = matcher.freeze()
+
+    synonyms_file.write_text("dairy:\n  - milk\n  - whey\n")
+    assert matcher.reload(force=True) == ("dairy",)
+
+    assert "whey" in matcher.scan_text("whey")["dairy"]
+    assert frozen.scan_text("whey") == {}
+    assert frozen.get_all_synonyms("dairy") == ("milk",)
+
+
+def test_frozen_matcher_pickles(matcher, label_texts):
+    """Test that a frozen matcher survives pickling, e.g. into scan_many() workers."""
+    frozen = matcher.freeze()
+    restored = pickle.loads(pickle.dumps(frozen))
+
+    assert isinstance(restored, FrozenMatcher)
+    text = label_texts(1)[0]
+    assert restored.scan_text(text) == matcher.scan_text(text)
+    with pytest.raises(TypeError):
+        restored.synonyms["dairy"] = ()
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_scan_many_threaded_matches_serial(matcher, label_texts, workers):
+    """Test that threaded scans match serial scans, in input order."""
+    frozen = matcher.freeze()
+    texts = label_texts(300)
+
+    results = list(frozen.scan_many_threaded(iter(texts), workers=workers, chunksize=7))
+
+    assert results == [matcher.scan_text(text) for text in texts]
+
+
+def test_scan_many_threaded_validates_chunksize(matcher):
+    """Test that a chunksize below 1 is rejected."""
+    with pytest.raises(ValueError):
+        list(matcher.freeze().scan_many_threaded(["milk"], chunksize=0))
+
+
+def test_scan_many_threaded_stops_early(matcher, label_texts):
+    """Test that closing the result generator early stops reading the input."""
+    frozen = matcher.freeze()
+    consumed = []
+
+    def texts():
+        for text in label_texts(1000):
+            consumed.append(text)
+            yield text
+
+    results = frozen.scan_many_threaded(texts(), workers=2, chunksize=10)
+    next(results)
+    results.close()
+
+    assert len(consumed) < 1000
+
+
+def test_concurrent_scans_stress(matcher, label_texts, checker):
+    """Test many threads hammering one frozen matcher and checker at once."""
+    frozen = matcher.freeze()
+    frozen_checker = checker.freeze()
+    texts = label_texts(100, seed=3)
+    expected = [matcher.scan_text(text) for text in texts]
+    expected_found = [matcher.find_ingredient(text, "Wheat") for text in texts]
+    expected_reactions = {allergen: list(checker.get_potential_reactions(allergen, "medium"))
+                          for allergen in checker.rules_by_source}
+    expected_reachable = {allergen: checker.get_reachable([allergen], "low")
+                          for allergen in checker.rules_by_source}
+
+    threads = 8
+    start = threading.Barrier(threads)
+    failures = []
+
+    def worker(seed):
+        rng = random.Random(seed)
+        start.wait()
+        for _ in range(300):
+            i = rng.randrange(len(texts))
+            if frozen.scan_text(texts[i]) != expected[i]:
+                failures.append(("scan_text", i))
+            if frozen.find_ingredient(texts[i], "Wheat") != expected_found[i]:
+                failures.append(("find_ingredient", i))
+            allergen = rng.choice(list(expected_reactions))
+            if list(frozen_checker.get_potential_reactions(allergen, "medium")) != expected_reactions[allergen]:
+                failures.append(("get_potential_reactions", allergen))
+            if frozen_checker.get_reachable([allergen], "low") != expected_reachable[allergen]:
+                failures.append(("get_reachable", allergen))
+
+    pool = [threading.Thread(target=worker, args=(seed,)) for seed in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+
+    assert failures == []
+
+
+def test_frozen_checker_matches_source(checker):
+    """Test that a frozen checker answers queries like its source, with tuples."""
+    frozen = checker.freeze()
+
+    assert isinstance(frozen, FrozenChecker)
+    assert frozen.get_all_rules() == tuple(checker.get_all_rules())
+    for rule in checker.get_all_rules():
+        for confidence in ("low", "medium", "high"):
+            reactions = frozen.get_potential_reactions(rule.source, confidence)
+            assert isinstance(reactions, tuple)
+            assert reactions == checker.get_potential_reactions(rule.source, confidence)
+            assert frozen.get_sources_for_target(rule.target, confidence) == \
+                checker.get_sources_for_target(rule.target, confidence)
+        assert frozen.check_cross_reactivity(rule.source, rule.target) == \
+            checker.check_cross_reactivity(rule.source, rule.target)
+        assert frozen.get_transitive_reactions(rule.source) == checker.get_transitive_reactions(rule.source)
+    assert frozen.get_potential_reactions("unknown") == ()
+
+
+def test_frozen_checker_is_immutable(checker):
+    """Test that a frozen checker and its rules cannot be changed."""
+    frozen = checker.freeze()
+    rule = frozen.get_all_rules()[0]
+
+    with pytest.raises(AttributeError):
+        frozen.closure_depth = 1
+    with pytest.raises(TypeError):
+        frozen.rules_by_source[rule.source] = ()
+    with pytest.raises(AttributeError):
+        rule.confidence = "high"
+    with pytest.raises(RuntimeError):
+        frozen.reload()
+    assert pickle.loads(pickle.dumps(frozen)).get_all_rules() == frozen.get_all_rules()
+
+
+def test_frozen_contains_any(matcher, label_texts):
+    """Test that frozen early-exit queries agree with the source matcher without caching."""
+    frozen = matcher.freeze()
+
+    for text in label_texts(50):
+        for categories in ({"dairy"}, {"peanuts", "tree_nuts", "sesame"}, {"unknown"}, ()):
+            assert frozen.contains_any(text, categories) == matcher.contains_any(text, categories)
+            assert frozen.first_match(text, categories) == matcher.first_match(text, categories)
+        assert frozen.scan_categories(text, {"dairy", "soy"}) == matcher.scan_categories(text, {"dairy", "soy"})
+    assert frozen.sub_index_stats()["builds"] == 0
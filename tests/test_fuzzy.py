@@ -0,0 +1,106 @@
+"""
+Tests for OCR-tolerant fuzzy matching
+"""
+
+import pytest
+from food_inspector.fuzzy import FuzzyIndex, edit_distance
+from food_inspector.matcher import IngredientMatcher
+
+
+@pytest.fixture(params=["regex", "automaton"])
+def fuzzy_matcher(request):
+    """Create a fuzzy-enabled IngredientMatcher for each engine."""
+    return IngredientMatcher(engine=request.param, fuzzy_max_distance=1)
+
+
+def test_edit_distance():
+    """Test substitutions, insertions, deletions, transpositions and the cutoff."""
+    assert edit_distance("whey", "wbey", 2) == 1
+    assert edit_distance("casein", "casin", 2) == 1
+    assert edit_distance("casein", "caesin", 2) == 1
+    assert edit_distance("lecithin", "lecithin", 2) == 0
+    assert edit_distance("milk", "wheat", 2) == 3
+
+
+def test_lookup_returns_closest_terms():
+    """Test that only the closest non-exact terms are returned."""
+    index = FuzzyIndex(["whey", "casein", "wheat"], max_distance=1)
+
+    assert index.lookup("wbey") == [(0, 1)]
+    assert index.lookup("casien") == [(1, 1)]
+    assert index.lookup("whey") == []
+    assert index.lookup("sugar") == []
+
+
+def test_allowed_distance_scales_with_length():
+    """Test that each term allows one edit per chars_per_edit characters."""
+    index = FuzzyIndex(["malt", "casein", "soy lecithin"], max_distance=2)
+
+    assert index.lookup("salt") == []
+    assert index.lookup("caseln") == [(1, 1)]
+    assert index.lookup("cazeln") == []
+    assert index.lookup("soy lezithln") == [(2, 2)]
+
+
+@pytest.mark.parametrize("max_distance", [1, 2])
+@pytest.mark.parametrize("word", ["salt", "sugar", "oats", "palm", "soda", "water", "flour", "spices"])
+def test_common_label_words_are_not_fuzzy_matched(word, max_distance):
+    """Test that ordinary label words are not mistaken for nearby allergens."""
+    matcher = IngredientMatcher(engine="automaton", fuzzy_max_distance=max_distance)
+
+    assert matcher.scan_fuzzy(f"Ingredients: {word}, {word.capitalize()}.") == {}
+
+
+def test_short_terms_allow_only_ocr_confusions():
+    """Test that terms below chars_per_edit accept one misread glyph, not any edit."""
+    index = FuzzyIndex(["malt", "whey", "soya"], max_distance=2)
+
+    assert index.lookup("wbey") == [(1, 1)]
+    assert index.lookup("ma1t") == [(0, 1)]
+    assert index.lookup("salt") == []
+    assert index.lookup("soda") == []
+    assert index.lookup("hwey") == []
+
+
+def test_short_terms_are_not_indexed():
+    """Test that terms below the minimum length are never fuzzy matched."""
+    index = FuzzyIndex(["soy", "milk"], max_distance=1, min_length=4)
+
+    assert index.lookup("sey") == []
+    assert index.lookup("mllk") == [(1, 1)]
+
+
+def test_scan_fuzzy_reports_ocr_errors(fuzzy_matcher):
+    """Test that OCR misspellings are reported with their distance."""
+    results = fuzzy_matcher.scan_fuzzy("Ingredients: wbey protein, caseln, soy lecithln")
+
+    assert results["dairy"]["whey"] == [("wbey", 13, 17, 1)]
+    assert results["dairy"]["casein"] == [("caseln", 27, 33, 1)]
+    assert results["soy"]["soy lecithin"] == [("soy lecithln", 35, 47, 1)]
+
+
+def test_scan_fuzzy_skips_exact_matches(fuzzy_matcher):
+    """Test that correctly spelled synonyms are left to scan_text."""
+    assert fuzzy_matcher.scan_fuzzy("Contains: milk, whey, wheat flour") == {}
+
+
+def test_scan_fuzzy_maps_normalized_spans():
+    """Test that fuzzy hits on normalized text report original offsets."""
+    matcher = IngredientMatcher(engine="automaton", normalize=True, fuzzy_max_distance=1)
+    text = "Contains: soy  LECITHLN"
+
+    assert matcher.scan_fuzzy(text)["soy"]["soy lecithin"] == [("soy  LECITHLN", 10, 23, 1)]
+
+
+def test_scan_fuzzy_requires_index():
+    """Test that fuzzy scans need fuzzy_max_distance at construction."""
+    with pytest.raises(RuntimeError):
+        IngredientMatcher().scan_fuzzy("wbey")
+
+
+def test_negative_fuzzy_distance_rejected():
+    """Test that a negative maximum distance is rejected."""
+    with pytest.raises(ValueError):
+        IngredientMatcher(fuzzy_max_distance=-1)
+    with pytest.raises(ValueError):
+        IngredientMatcher(fuzzy_max_distance=1, fuzzy_chars_per_edit=0)
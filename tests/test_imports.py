@@ -0,0 +1,62 @@
+"""
+Tests for lazy package imports
+"""
+
+import io
+import subprocess
+import sys
+
+import pytest
+import food_inspector
+from food_inspector.loading import safe_load_yaml
+
+
+def _modules_after(statement):
+    """Return the food_inspector/yaml modules loaded by a statement in a fresh interpreter."""
+    code = (
+        f"{statement}\n"
+        "import sys\n"
+        "print(' '.join(sorted(m for m in sys.modules "
+        "if m.split('.')[0] in ('food_inspector', 'yaml'))))"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return set(output.stdout.split())
+
+
+def test_package_import_is_lazy():
+    """Test that importing the package loads no submodules or PyYAML."""
+    assert _modules_after("import food_inspector") == {"food_inspector"}
+
+
+def test_class_import_defers_yaml():
+    """Test that PyYAML is only imported once a file is actually parsed."""
+    loaded = _modules_after("from food_inspector import IngredientMatcher")
+
+    assert "food_inspector.matcher" in loaded
+    assert "food_inspector.cross_reactivity" not in loaded
+    assert "yaml" not in loaded
+
+
+def test_lazy_attributes_resolve():
+    """Test that lazily exported names resolve to the real classes."""
+    from food_inspector.matcher import IngredientMatcher
+    from food_inspector.cross_reactivity import CrossReactivityChecker
+
+    assert food_inspector.IngredientMatcher is IngredientMatcher
+    assert food_inspector.CrossReactivityChecker is CrossReactivityChecker
+    assert set(food_inspector.__all__) <= set(dir(food_inspector))
+
+
+def test_unknown_attribute():
+    """Test that unknown attributes still raise AttributeError."""
+    with pytest.raises(AttributeError):
+        food_inspector.DoesNotExist
+
+
+def test_safe_load_yaml_matches_safe_load():
+    """Test that the fast loader parses documents like yaml.safe_load."""
+    import yaml
+
+    document = "dairy:\n  - milk\n  - half-and-half\nsoy: [tofu]\n"
+
+    assert safe_load_yaml(io.StringIO(document)) == yaml.safe_load(document)
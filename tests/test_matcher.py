@@ -2,13 +2,15 @@
 Tests for IngredientMatcher
 """
 
+import random
+
 import pytest
 from food_inspector.matcher import IngredientMatcher
 
 
 @pytest.fixture
-def matcher():
-    """Create an IngredientMatcher instance for testing."""
+def regex_matcher():
+    """Create a default (regex engine) IngredientMatcher."""
     return IngredientMatcher()
 
 
@@ -20,73 +22,97 @@ def matcher_with_exceptions():
     return IngredientMatcher(exceptions=exceptions)
 
 
-def test_word_boundary_matching_basic(matcher):
+def test_word_boundary_matching_basic(regex_matcher):
     """Test that word boundaries are respected in basic cases."""
     text = "Contains malt extract and corn syrup"
     
     # Should find "malt extract"
-    matches = matcher.find_ingredient(text, "malt")
+    matches = regex_matcher.find_ingredient(text, "malt")
     assert len(matches) == 1
     assert matches[0][0].lower() == "malt"
     
     # Should find "malt extract"
-    matches = matcher.find_ingredient(text, "malt extract")
+    matches = regex_matcher.find_ingredient(text, "malt extract")
     assert len(matches) == 1
     assert matches[0][0].lower() == "malt extract"
 
 
-def test_word_boundary_prevents_false_match(matcher):
+def test_word_boundary_prevents_false_match(regex_matcher):
     """Test that 'malt' does NOT match 'maltodextrin' by default."""
     text = "Contains maltodextrin and corn syrup"
     
     # Should NOT find malt in maltodextrin
-    matches = matcher.find_ingredient(text, "malt")
+    matches = regex_matcher.find_ingredient(text, "malt")
     assert len(matches) == 0
 
 
-def test_malt_vs_maltodextrin_separate(matcher):
+def test_malt_vs_maltodextrin_separate(regex_matcher):
     """Test that both malt and maltodextrin can be in the same text."""
     text = "Contains malt extract, maltodextrin, and malt flavoring"
     
     # Should find two instances of "malt" (malt extract and malt flavoring)
     # but NOT in maltodextrin
-    matches = matcher.find_ingredient(text, "malt")
+    matches = regex_matcher.find_ingredient(text, "malt")
     assert len(matches) == 2
 
 
 def test_exception_allows_compound_match(matcher_with_exceptions):
-    """Test exception mechanism behavior for compound words.
-    
-    Note: Current implementation uses word boundaries, so 'maltodextrin' is
-    treated as a separate word from 'malt'. The exception mechanism is designed
-    for future enhancement where compound word matching might be needed.
-    For now, this test documents the current behavior.
-    """
+    """Test that an exception lets a term match inside a listed compound."""
     text = "Contains maltodextrin and corn syrup"
     
-    # Currently, maltodextrin does not match malt even with exceptions
-    # because word boundary matching prevents partial word matches
     matches = matcher_with_exceptions.find_ingredient(text, "malt")
-    assert len(matches) == 0  # Expected behavior: word boundaries prevent match
+    assert matches == [("malt", 9, 13)]
+    
+    # Other compounds are still protected by word boundaries
+    assert matcher_with_exceptions.find_ingredient("Contains maltose", "malt") == []
+
+
+@pytest.mark.parametrize("engine", ["regex", "automaton"])
+def test_exceptions_in_single_pass(engine):
+    """Test that compound overrides are reported by both engines' full scans."""
+    matcher = IngredientMatcher(engine=engine, exceptions={"malt": ["maltodextrin"]})
+    text = "malt extract, MALTODEXTRIN, maltose"
+
+    results = matcher.scan_text(text)
+
+    assert results["gluten"]["malt"] == [("malt", 0, 4), ("MALT", 14, 18)]
+    assert matcher.scan_compact(text).to_dict() == results
+
 
+@pytest.mark.parametrize("engine", ["regex", "automaton"])
+def test_allowed_phrases_suppress_term(engine):
+    """Test that a term inside an allowed phrase is not reported."""
+    matcher = IngredientMatcher(engine=engine, allowed_phrases={"milk": ["coconut milk", "milk thistle"]})
+    text = "Coconut Milk, milk thistle extract, skim milk"
 
-def test_case_insensitive_matching(matcher):
+    assert matcher.find_ingredient(text, "milk") == [("milk", 41, 45)]
+    assert matcher.scan_text(text)["dairy"]["milk"] == [("milk", 41, 45)]
+
+
+@pytest.mark.parametrize("option", ["exceptions", "allowed_phrases"])
+def test_invalid_override_rejected(option):
+    """Test that overrides not containing their term are rejected."""
+    with pytest.raises(ValueError):
+        IngredientMatcher(**{option: {"malt": ["barley"]}})
+
+
+def test_case_insensitive_matching(regex_matcher):
     """Test that matching is case-insensitive."""
     text = "Contains WHEY PROTEIN and Casein"
     
-    matches = matcher.find_ingredient(text, "whey")
+    matches = regex_matcher.find_ingredient(text, "whey")
     assert len(matches) == 1
     assert matches[0][0].upper() == "WHEY"
     
-    matches = matcher.find_ingredient(text, "casein")
+    matches = regex_matcher.find_ingredient(text, "casein")
     assert len(matches) == 1
 
 
-def test_find_allergen_category_dairy(matcher):
+def test_find_allergen_category_dairy(regex_matcher):
     """Test finding all dairy ingredients in text."""
     text = "Ingredients: milk, whey protein, casein, sugar, natural flavors"
     
-    results = matcher.find_allergen_category(text, "dairy")
+    results = regex_matcher.find_allergen_category(text, "dairy")
     
     assert "milk" in results
     assert "whey" in results
@@ -94,11 +120,11 @@ def test_find_allergen_category_dairy(matcher):
     assert len(results) >= 3
 
 
-def test_find_allergen_category_gluten(matcher):
+def test_find_allergen_category_gluten(regex_matcher):
     """Test finding all gluten ingredients in text."""
     text = "Contains: wheat flour, malt extract, barley, rye"
     
-    results = matcher.find_allergen_category(text, "gluten")
+    results = regex_matcher.find_allergen_category(text, "gluten")
     
     assert "wheat" in results
     assert "malt extract" in results
@@ -106,11 +132,11 @@ def test_find_allergen_category_gluten(matcher):
     assert "rye" in results
 
 
-def test_scan_text_multiple_allergens(matcher):
+def test_scan_text_multiple_allergens(regex_matcher):
     """Test scanning text for multiple allergen categories."""
     text = "Contains: wheat flour, soy lecithin, milk, eggs"
     
-    results = matcher.scan_text(text)
+    results = regex_matcher.scan_text(text)
     
     assert "gluten" in results  # wheat
     assert "soy" in results     # soy lecithin
@@ -118,81 +144,306 @@ def test_scan_text_multiple_allergens(matcher):
     assert "eggs" in results    # eggs
 
 
-def test_get_allergen_for_ingredient(matcher):
+def test_get_allergen_for_ingredient(regex_matcher):
     """Test reverse lookup: ingredient -> allergen category."""
-    assert matcher.get_allergen_for_ingredient("whey") == "dairy"
-    assert matcher.get_allergen_for_ingredient("lecithin") == "soy"
-    assert matcher.get_allergen_for_ingredient("semolina") == "gluten"
-    assert matcher.get_allergen_for_ingredient("unknown") is None
+    assert regex_matcher.get_allergen_for_ingredient("whey") == "dairy"
+    assert regex_matcher.get_allergen_for_ingredient("lecithin") == "soy"
+    assert regex_matcher.get_allergen_for_ingredient("semolina") == "gluten"
+    assert regex_matcher.get_allergen_for_ingredient("unknown") is None
 
 
-def test_get_all_synonyms(matcher):
+def test_get_all_synonyms(regex_matcher):
     """Test getting all synonyms for a category."""
-    dairy_synonyms = matcher.get_all_synonyms("dairy")
+    dairy_synonyms = regex_matcher.get_all_synonyms("dairy")
     assert "milk" in dairy_synonyms
     assert "whey" in dairy_synonyms
     assert "casein" in dairy_synonyms
     assert len(dairy_synonyms) > 10
 
 
-def test_hyphenated_words(matcher):
+def test_hyphenated_words(regex_matcher):
     """Test matching with hyphenated words."""
     text = "Contains half-and-half cream"
     
-    matches = matcher.find_ingredient(text, "half-and-half")
+    matches = regex_matcher.find_ingredient(text, "half-and-half")
     assert len(matches) == 1
 
 
-def test_multiple_occurrences(matcher):
+def test_multiple_occurrences(regex_matcher):
     """Test finding multiple occurrences of the same ingredient."""
     text = "milk chocolate (milk, sugar, milk solids)"
     
-    matches = matcher.find_ingredient(text, "milk")
+    matches = regex_matcher.find_ingredient(text, "milk")
     assert len(matches) >= 2  # At least 2 instances of "milk"
 
 
-def test_partial_word_no_match(matcher):
+def test_partial_word_no_match(regex_matcher):
     """Test that partial words don't match."""
     text = "Contains milkshake flavor"
     
     # "milk" should not match the "milk" in "milkshake"
     # This depends on word boundary detection
-    matches = matcher.find_ingredient(text, "milk")
+    matches = regex_matcher.find_ingredient(text, "milk")
     # milkshake is one word, so milk shouldn't match
     assert len(matches) == 0
 
 
-def test_apostrophe_handling(matcher):
+def test_apostrophe_handling(regex_matcher):
     """Test handling of words with apostrophes."""
     text = "Contains brewer's yeast"
     
-    matches = matcher.find_ingredient(text, "brewer's yeast")
+    matches = regex_matcher.find_ingredient(text, "brewer's yeast")
     assert len(matches) == 1
 
 
-def test_empty_text(matcher):
+def test_empty_text(regex_matcher):
     """Test handling of empty text."""
-    results = matcher.scan_text("")
+    results = regex_matcher.scan_text("")
     assert results == {}
 
 
-def test_no_allergens(matcher):
+def test_no_allergens(regex_matcher):
     """Test text with no allergens."""
     text = "Salt, water, vinegar"
     
-    results = matcher.scan_text(text)
+    results = regex_matcher.scan_text(text)
     # Should return empty or minimal results
     assert len(results) == 0 or all(len(v) == 0 for v in results.values())
 
 
-def test_soy_lecithin_vs_lecithin(matcher):
+def test_soy_lecithin_vs_lecithin(regex_matcher):
     """Test that both 'soy lecithin' and 'lecithin' are found as soy."""
     text1 = "Contains soy lecithin"
     text2 = "Contains lecithin"
     
-    results1 = matcher.find_allergen_category(text1, "soy")
-    results2 = matcher.find_allergen_category(text2, "soy")
+    results1 = regex_matcher.find_allergen_category(text1, "soy")
+    results2 = regex_matcher.find_allergen_category(text2, "soy")
     
     # Both should find soy-related ingredients
     assert len(results1) > 0
     assert len(results2) > 0
+
+
+@pytest.fixture
+def automaton_matcher():
+    """Create an IngredientMatcher using the single-pass automaton engine."""
+    return IngredientMatcher(engine="automaton")
+
+
+@pytest.mark.parametrize("text", [
+    "Contains: wheat flour, soy lecithin, milk, eggs",
+    "milk chocolate (MILK, sugar, Milk Solids), malt extract, maltodextrin",
+    "Contains milkshake flavor and half-and-half cream",
+    "Contains brewer's yeast, whey, casein",
+    "Salt, water, vinegar",
+    "",
+])
+def test_automaton_engine_matches_regex_engine(regex_matcher, automaton_matcher, text):
+    """Test that the automaton engine returns exactly the regex engine results."""
+    expected = regex_matcher.scan_text(text)
+    results = automaton_matcher.scan_text(text)
+
+    assert results == expected
+    assert list(results) == list(expected)
+    for category in results:
+        assert list(results[category]) == list(expected[category])
+
+
+@pytest.mark.parametrize("text", [
+    "İSTANBUL SPICE, istanbul spice",
+    "İx, ix, IX, İxİ",
+    "Contains: İstanbul Spice (ix)",
+])
+def test_engines_agree_on_length_changing_case(tmp_path, text):
+    """Test that both engines fold 'İ', whose lowercase is two characters, alike."""
+    synonyms = tmp_path / "synonyms.yaml"
+    synonyms.write_text("spices:\n  - İstanbul spice\n  - ix\n", encoding="utf-8")
+    regex = IngredientMatcher(str(synonyms), engine="regex")
+    automaton = IngredientMatcher(str(synonyms), engine="automaton")
+
+    expected = regex.scan_text(text)
+
+    assert expected
+    assert automaton.scan_text(text) == expected
+
+
+def test_automaton_engine_word_boundaries(automaton_matcher):
+    """Test that the automaton engine does not match inside longer words."""
+    results = automaton_matcher.scan_text("Contains maltodextrin and milkshake")
+
+    assert "malt" not in results.get("gluten", {})
+    assert "milk" not in results.get("dairy", {})
+
+
+def test_automaton_engine_reports_overlapping_synonyms(automaton_matcher):
+    """Test that nested synonyms are all reported with their positions."""
+    results = automaton_matcher.scan_text("Contains Milk Solids")
+
+    assert results["dairy"]["milk"] == [("Milk", 9, 13)]
+    assert results["dairy"]["milk solids"] == [("Milk Solids", 9, 20)]
+
+
+def test_invalid_engine():
+    """Test that an unknown engine is rejected."""
+    with pytest.raises(ValueError):
+        IngredientMatcher(engine="unknown")
+
+
+def test_vocabulary_patterns_bypass_global_cache(regex_matcher):
+    """Test that vocabulary terms use the regex_matcher's own compiled patterns."""
+    from food_inspector.matcher import _compile_word_boundary_pattern
+
+    _compile_word_boundary_pattern.cache_clear()
+    regex_matcher.scan_text("Contains: wheat flour, soy lecithin, milk, eggs")
+    regex_matcher.find_ingredient("Contains whey", "whey")
+
+    assert _compile_word_boundary_pattern.cache_info().currsize == 0
+
+
+def test_ad_hoc_terms_still_match(regex_matcher):
+    """Test that terms outside the vocabulary can still be searched for."""
+    matches = regex_matcher.find_ingredient("Contains Quinoa flakes", "quinoa")
+    assert matches == [("Quinoa", 9, 15)]
+
+
+def test_warmup_returns_matcher(regex_matcher):
+    """Test that warmup() builds the indexes and allows chaining."""
+    assert regex_matcher.warmup() is regex_matcher
+    assert set(regex_matcher._index.patterns) >= set(regex_matcher.get_all_synonyms("dairy"))
+
+
+def test_scan_many_serial_fallback(regex_matcher):
+    """Test that small batches are scanned in-process, in input order."""
+    texts = ["Contains milk", "Salt, water", "wheat flour, soy lecithin"]
+
+    results = list(regex_matcher.scan_many(texts, workers=4))
+
+    assert results == [regex_matcher.scan_text(t) for t in texts]
+
+
+def test_scan_many_process_pool(automaton_matcher):
+    """Test that pooled scanning returns results in input order."""
+    texts = [f"Ingredients {i}: milk, wheat" if i % 3 else f"Water {i}" for i in range(40)]
+
+    results = list(automaton_matcher.scan_many(texts, workers=2, chunksize=4, serial_threshold=10))
+
+    assert results == [automaton_matcher.scan_text(t) for t in texts]
+
+
+def test_scan_many_invalid_chunksize(regex_matcher):
+    """Test that a non-positive chunksize is rejected."""
+    with pytest.raises(ValueError):
+        list(regex_matcher.scan_many(["milk"], chunksize=0))
+
+
+@pytest.mark.parametrize("engine", ["regex", "automaton"])
+def test_contains_any_and_first_match(engine):
+    """Test early-exit queries restricted to a set of categories."""
+    matcher = IngredientMatcher(engine=engine)
+    text = "Ingredients: sugar, soy lecithin, whey, peanut oil"
+
+    assert matcher.contains_any(text, {"dairy", "peanuts"})
+    assert not matcher.contains_any(text, {"fish", "shellfish"})
+    assert not matcher.contains_any(text, [])
+    assert not matcher.contains_any(text, {"not-a-category"})
+    assert matcher.first_match(text, {"dairy", "peanuts"}) == ("dairy", "whey", "whey", 34, 38)
+    assert matcher.first_match(text, frozenset({"peanuts"})) == ("peanuts", "peanut", "peanut", 40, 46)
+    assert matcher.first_match("Salt, water", {"dairy"}) is None
+
+
+def test_first_match_waits_for_phrases():
+    """Test that a hit is not reported before a longer phrase can rule it out."""
+    matcher = IngredientMatcher(engine="automaton", normalize=True,
+                                allowed_phrases={"milk": ["milk thistle", "coconut milk"]},
+                                exceptions={"malt": ["maltodextrin"]})
+
+    assert not matcher.contains_any("Contains MILK  Thistle, coconut milk", {"dairy"})
+    assert matcher.first_match("milk thistle, Whey", {"dairy"}) == ("dairy", "whey", "Whey", 14, 18)
+    assert matcher.first_match("milk thistle, milk", {"dairy"}) == ("dairy", "milk", "milk", 14, 18)
+    assert matcher.first_match("Maltodextrin", {"gluten"}) == ("gluten", "malt", "Malt", 0, 4)
+
+
+@pytest.mark.parametrize("options", [{}, {"normalize": True, "allowed_phrases": {"milk": ["coconut milk"]}}])
+def test_contains_any_agrees_with_scan_text(options):
+    """Test that contains_any() and first_match() agree with full scans."""
+    matcher = IngredientMatcher(engine="automaton", **options)
+    rng = random.Random(7)
+    words = list(matcher.reverse_map) + ["coconut milk", "maltodextrin", "sugar", "salt"]
+    categories = list(matcher.synonyms)
+
+    for _ in range(300):
+        text = ", ".join(rng.choices(words, k=rng.randrange(4)))
+        wanted = rng.sample(categories, rng.randrange(1, 4))
+        results = matcher.scan_text(text)
+        found = matcher.first_match(text, wanted)
+
+        assert matcher.contains_any(text, wanted) == any(c in results for c in wanted)
+        if found is not None:
+            category, synonym, matched_text, start, end = found
+            assert (matched_text, start, end) in results[category][synonym]
+            assert end == min(match[2] for c in wanted for matches in results.get(c, {}).values()
+                              for match in matches)
+
+
+@pytest.mark.parametrize("engine", ["regex", "automaton"])
+def test_scan_categories_matches_scan_text(engine):
+    """Test that category-restricted scans return the matching part of a full scan."""
+    matcher = IngredientMatcher(engine=engine, exceptions={"malt": ["maltodextrin"]},
+                                allowed_phrases={"milk": ["coconut milk"]})
+    text = "Milk chocolate (coconut milk, whey), maltodextrin, soy lecithin, peanuts"
+    full = matcher.scan_text(text)
+
+    for categories in ({"dairy"}, {"gluten", "soy"}, {"fish"}, {"dairy", "unknown"}):
+        expected = {category: found for category, found in full.items() if category in categories}
+        assert matcher.scan_categories(text, categories) == expected
+    for category in matcher.synonyms:
+        assert matcher.find_allergen_category(text, category) == full.get(category, {})
+    assert matcher.find_allergen_category(text, "unknown") == {}
+
+
+@pytest.mark.parametrize("engine", ["regex", "automaton"])
+def test_find_allergen_category_matches_scan_text(engine, tmp_path):
+    """Test that category lookups agree with scan_text() on the same engine."""
+    synonyms = tmp_path / "synonyms.yaml"
+    synonyms.write_text("dairy:\n  - milk\n  - whey\nspices:\n  - İstanbul spice\n  - ix\n",
+                        encoding="utf-8")
+    matcher = IngredientMatcher(str(synonyms), engine=engine)
+
+    for text in ("Milk, WHEY, milkshake", "İSTANBUL SPICE, İx", "sugar", ""):
+        scan = matcher.scan_text(text)
+        for category in ("dairy", "spices", "unknown"):
+            assert matcher.find_allergen_category(text, category) == scan.get(category, {})
+
+
+def test_sub_index_cache_hits_and_evictions():
+    """Test that sub-indexes are cached per category set with LRU eviction."""
+    matcher = IngredientMatcher(engine="automaton", sub_index_cache_size=2)
+
+    matcher.scan_categories("milk", {"dairy", "soy"})
+    matcher.contains_any("milk", frozenset({"soy", "dairy"}))
+    matcher.find_allergen_category("milk", "dairy")
+    matcher.scan_categories("milk", {"dairy", "soy"})
+    matcher.first_match("milk", {"gluten"})
+
+    stats = matcher.sub_index_stats()
+    assert stats["builds"] == 3
+    assert stats["hits"] == 2
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    assert stats["hit_rate"] == pytest.approx(0.4)
+
+    matcher.find_allergen_category("milk", "dairy")
+    assert matcher.sub_index_stats()["builds"] == 4
+
+
+def test_sub_index_cache_can_be_disabled():
+    """Test that a cache size of 0 builds a sub-index for every query."""
+    matcher = IngredientMatcher(engine="automaton", sub_index_cache_size=0)
+
+    assert matcher.contains_any("whey", {"dairy"})
+    assert matcher.contains_any("whey", {"dairy"})
+    assert matcher.sub_index_stats()["builds"] == 2
+    assert matcher.sub_index_stats()["entries"] == 0
+
+    with pytest.raises(ValueError):
+        IngredientMatcher(sub_index_cache_size=-1)
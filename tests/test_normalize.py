@@ -0,0 +1,79 @@
+"""
+Tests for one-time text normalization
+"""
+
+import pytest
+from food_inspector.matcher import IngredientMatcher
+from food_inspector.normalize import normalize_term, normalize_text
+
+
+@pytest.fixture(params=["regex", "automaton"])
+def normalizing_matcher(request):
+    """Create a normalizing IngredientMatcher for each engine."""
+    return IngredientMatcher(engine=request.param, normalize=True)
+
+
+def test_ascii_fast_path_keeps_identity_offsets():
+    """Test that plain ASCII text is only lowercased, with no offset map."""
+    normalized = normalize_text("Contains: Milk, Wheat")
+
+    assert normalized.text == "contains: milk, wheat"
+    assert normalized.starts is None
+    assert normalized.original_span(10, 14) == (10, 14)
+
+
+def test_normalization_steps():
+    """Test casefolding, NFKC, whitespace collapse and punctuation unification."""
+    assert normalize_text("Milk\t\n  Solids").text == "milk solids"
+    assert normalize_text("ＷＨＥＡＴ").text == "wheat"
+    assert normalize_text("soy‑lecithin — peanut’s").text == "soy-lecithin - peanut's"
+    assert normalize_text("STRAẞE").text == "strasse"
+    assert normalize_text("soy­bean").text == "soybean"
+
+
+def test_offsets_map_back_to_original():
+    """Test that every normalized span maps back to the characters it came from."""
+    text = "ﬁsh,  Café́  MILK\n solids"
+    normalized = normalize_text(text)
+
+    start = normalized.text.index("milk solids")
+    original_start, original_end = normalized.original_span(start, start + len("milk solids"))
+
+    assert text[original_start:original_end] == "MILK\n solids"
+    assert normalized.original_span(0, 4) == (0, 3)
+
+
+def test_normalize_term_matches_text_pipeline():
+    """Test that terms and texts are normalized identically."""
+    assert normalize_term("Milk  Solids") == normalize_text("MILK SOLIDS").text
+
+
+def test_matcher_reports_original_spans(normalizing_matcher):
+    """Test that matches on normalized text report the original text and offsets."""
+    text = "Contains: MILK\n\n  solids, ﬁsh"
+    results = normalizing_matcher.scan_text(text)
+
+    assert results["dairy"]["milk solids"] == [("MILK\n\n  solids", 10, 24)]
+    assert results["fish"]["fish"] == [("ﬁsh", 26, 29)]
+
+
+def test_matcher_agrees_with_default_on_ascii(normalizing_matcher):
+    """Test that normalization does not change results for ordinary labels."""
+    default = IngredientMatcher(engine=normalizing_matcher.engine)
+    text = "milk chocolate (MILK, sugar, Milk Solids), malt extract, maltodextrin"
+
+    assert normalizing_matcher.scan_text(text) == default.scan_text(text)
+    assert normalizing_matcher.scan_compact(text).to_dict() == normalizing_matcher.scan_text(text)
+
+
+def test_find_ingredient_normalizes_query(normalizing_matcher):
+    """Test that ad-hoc and vocabulary lookups go through the same pipeline."""
+    text = "Contains Soy‑Lecithin and quinoa"
+
+    assert normalizing_matcher.find_ingredient(text, "QUINOA") == [("quinoa", 26, 32)]
+    assert normalizing_matcher.find_allergen_category(text, "soy") == {"lecithin": [("Lecithin", 13, 21)]}
+
+
+def test_normalize_changes_fingerprint():
+    """Test that cached results are not shared between normalizing and plain matchers."""
+    assert IngredientMatcher(normalize=True).fingerprint != IngredientMatcher().fingerprint
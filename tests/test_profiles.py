@@ -0,0 +1,94 @@
+"""
+Tests for vectorized profile matching
+"""
+
+import random
+
+import pytest
+from food_inspector.analysis import Analyzer
+from food_inspector.cross_reactivity import CrossReactivityChecker
+from food_inspector.matcher import IngredientMatcher
+
+np = pytest.importorskip("numpy")
+
+from food_inspector.profiles import ProfileMatrix  # noqa: E402
+
+LEVELS = CrossReactivityChecker.CONFIDENCE_LEVELS
+
+
+@pytest.fixture(scope="module")
+def analyzer():
+    """Create an Analyzer with the default data files."""
+    return Analyzer()
+
+
+def _affected_by_loop(analyzer, profiles, text):
+    """Reference answer: check every user against per-category rule queries."""
+    scan = analyzer.matcher.scan_text(text)
+    affected = []
+    for user, (avoided, min_confidence) in enumerate(profiles):
+        concerns = set(scan)
+        for category in scan:
+            concerns.update(rule.target for rule in analyzer.checker.get_potential_reactions(category, min_confidence))
+        if concerns & set(avoided):
+            affected.append(user)
+    return affected
+
+
+def test_matches_loop_over_users(analyzer):
+    """Test that the vectorized evaluation agrees with per-user loops."""
+    rng = random.Random(7)
+    names = ProfileMatrix.from_profiles(analyzer, []).names
+    profiles = [(rng.sample(names, rng.randint(0, 3)), rng.choice(list(LEVELS))) for _ in range(2000)]
+    matrix = ProfileMatrix.from_profiles(analyzer, profiles)
+
+    for text in ["Peanut butter, whey, shrimp", "wheat flour, sesame", "sugar, water"]:
+        assert matrix.affected(text).tolist() == _affected_by_loop(analyzer, profiles, text)
+
+
+def test_confidence_threshold(analyzer):
+    """Test that a user's minimum confidence filters cross-reactive hits."""
+    matrix = ProfileMatrix.from_profiles(analyzer, [
+        (["goat_milk"], "high"),
+        (["tree_nuts"], "high"),
+        (["tree_nuts"], "medium"),
+        (["dairy"], "high"),
+    ])
+
+    # dairy -> goat_milk is high, peanuts -> tree_nuts is medium
+    assert matrix.affected(analyzer.analyze("whey, peanut")).tolist() == [0, 2, 3]
+
+
+def test_category_ids_are_bit_positions(analyzer):
+    """Test that matcher categories keep their ids as bits and masks round-trip."""
+    matrix = ProfileMatrix.from_profiles(analyzer, [(["soy", "banana"], "low")])
+    categories = analyzer.matcher._index.category_names
+
+    assert matrix.names[:len(categories)] == categories
+    assert matrix.encode(["soy"])[0] == 1 << categories.index("soy")
+    assert matrix.decode(matrix.masks[0]) == ("soy", "banana")
+
+
+def test_wide_masks(tmp_path):
+    """Test that more allergens than fit in one word use several mask words."""
+    synonyms = tmp_path / "synonyms.yaml"
+    rules = tmp_path / "rules.yaml"
+    synonyms.write_text("latex: [latex]\n")
+    rules.write_text("cross_reactivity_rules:\n" + "".join(
+        f"  - {{source: latex, target: fruit{i}, confidence: low}}\n" for i in range(70)))
+    analyzer = Analyzer(IngredientMatcher(str(synonyms)), CrossReactivityChecker(str(rules)))
+    matrix = ProfileMatrix.from_profiles(analyzer, [(["fruit69"], "low"), (["fruit1"], "medium")])
+
+    assert matrix.words == 2
+    assert matrix.masks[0].tolist() == [0, 1 << 6]
+    assert matrix.affected("latex gloves").tolist() == [0]
+
+
+def test_invalid_profiles_rejected(analyzer):
+    """Test that unknown allergens, levels and mismatched arrays raise ValueError."""
+    with pytest.raises(ValueError):
+        ProfileMatrix.from_profiles(analyzer, [(["unicorn"], "low")])
+    with pytest.raises(ValueError):
+        ProfileMatrix.from_profiles(analyzer, [(["soy"], "certain")])
+    with pytest.raises(ValueError):
+        ProfileMatrix(analyzer, np.zeros((3, 1), dtype=np.uint64), np.ones(2, dtype=np.uint8))
@@ -0,0 +1,69 @@
+"""
+Tests for the memory-mapped reference data reader
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from food_inspector.reference_data import ReferenceData
+
+GENERATOR = Path(__file__).resolve().parent.parent / "tools" / "data-generator" / "generate_data.py"
+
+
+@pytest.fixture(scope="module")
+def output_dir(tmp_path_factory):
+    """Run the data generator once, writing both the JSON files and the binary bundle."""
+    output = tmp_path_factory.mktemp("generated")
+    subprocess.run(
+        [sys.executable, str(GENERATOR), "--format", "both", "--output", str(output)],
+        check=True, capture_output=True,
+    )
+    return output
+
+
+@pytest.fixture
+def data(output_dir):
+    """Map the generated bundle."""
+    with ReferenceData(str(output_dir / "reference-data.v1.bin")) as reference:
+        yield reference
+
+
+def test_round_trip_matches_json(output_dir, data):
+    """Test that the bundle decodes to exactly the JSON documents generated with it."""
+    documents = data.to_json_dicts()
+
+    for name in ("synonyms", "cross-reactivity", "scoring-policy"):
+        assert documents[name] == json.loads((output_dir / f"{name}.v1.json").read_text())
+
+
+def test_lookups(data):
+    """Test synonym, trigger and cross-reactivity lookups against the mapped tables."""
+    assert data.triggers_for("Whey") == (3,)
+    assert data.triggers_for("e621") == (10,)
+    assert data.triggers_for("unobtainium") == ()
+    assert data.trigger_name(15) == "Gluten"
+    assert data.synonyms_for(9) == ["tahini", "sesame oil", "sesame seed", "sesamol"]
+    assert [related for related, _ in data.related(8)] == [7]
+    assert data.scoring_policy()["flare_mode"]["escalation_multiplier"] == 1.5
+
+    with pytest.raises(KeyError):
+        data.trigger_name(99)
+
+
+@pytest.mark.skipif(sys.byteorder != "little", reason="big-endian hosts decode a copy")
+def test_tables_are_views(data):
+    """Test that integer tables are used in place rather than copied."""
+    assert isinstance(data.trigger_ids, memoryview)
+    assert list(data.trigger_ids) == sorted(data.trigger_ids)
+
+
+def test_rejects_other_files(tmp_path):
+    """Test that files without the bundle header raise ValueError."""
+    path = tmp_path / "synonyms.v1.json"
+    path.write_text('{"version": "1.0.0", "generated_at": "", "data": []}' + " " * 100)
+
+    with pytest.raises(ValueError):
+        ReferenceData(str(path))
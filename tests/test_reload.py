@@ -0,0 +1,172 @@
+"""
+Tests for hot reloading of synonym and rule files
+"""
+
+import os
+import threading
+
+import pytest
+from food_inspector.cache import ScanCache
+from food_inspector.cross_reactivity import CrossReactivityChecker
+from food_inspector.matcher import IngredientMatcher
+
+
+def _rewrite(path, content):
+    """Replace a file's content and make sure its modification time moves."""
+    stat = os.stat(path) if os.path.exists(path) else None
+    path.write_text(content)
+    if stat is not None:
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def synonyms_file(tmp_path):
+    """Write a small synonyms file."""
+    path = tmp_path / "synonyms.yaml"
+    _rewrite(path, "dairy: [milk, whey]\ngluten: [wheat]\n")
+    return path
+
+
+@pytest.fixture
+def rules_file(tmp_path):
+    """Write a small rules file."""
+    path = tmp_path / "rules.yaml"
+    _rewrite(path, "cross_reactivity_rules:\n"
+                   "  - {source: peanuts, target: lupin, confidence: medium}\n"
+                   "  - {source: latex, target: banana, confidence: high}\n")
+    return path
+
+
+@pytest.mark.parametrize("engine", ["regex", "automaton"])
+def test_matcher_reload_applies_changes(synonyms_file, engine):
+    """Test that reload() reports changed categories and matches the new vocabulary."""
+    matcher = IngredientMatcher(str(synonyms_file), engine=engine)
+    assert matcher.reload() == ()
+
+    _rewrite(synonyms_file, "dairy: [milk, casein]\ngluten: [wheat]\nsoy: [soy]\n")
+
+    assert matcher.reload() == ("dairy", "soy")
+    assert matcher.scan_text("whey, casein, soy") == {
+        "dairy": {"casein": [("casein", 6, 12)]},
+        "soy": {"soy": [("soy", 14, 17)]},
+    }
+    assert matcher.get_allergen_for_ingredient("whey") is None
+
+
+def test_matcher_reload_reuses_patterns(synonyms_file):
+    """Test that unchanged synonyms keep their compiled patterns."""
+    matcher = IngredientMatcher(str(synonyms_file))
+    wheat = matcher._index.patterns["wheat"]
+
+    _rewrite(synonyms_file, "dairy: [milk, whey, butter]\ngluten: [wheat]\n")
+    matcher.reload()
+
+    assert matcher._index.patterns["wheat"] is wheat
+    assert "butter" in matcher._index.patterns
+
+
+def test_matcher_reload_skips_unchanged_content(synonyms_file):
+    """Test that touching the file without changing it keeps the current index."""
+    matcher = IngredientMatcher(str(synonyms_file))
+    index = matcher._index
+
+    _rewrite(synonyms_file, synonyms_file.read_text())
+
+    assert matcher.reload() == ()
+    assert matcher._index is index
+
+
+def test_matcher_reload_invalidates_cache(synonyms_file):
+    """Test that cached results of the old vocabulary are not served after a reload."""
+    matcher = IngredientMatcher(str(synonyms_file), cache=ScanCache())
+    assert matcher.scan_text("whey") != {}
+
+    _rewrite(synonyms_file, "dairy: [milk]\n")
+    matcher.reload()
+
+    assert matcher.scan_text("whey") == {}
+
+
+def test_matcher_reload_keeps_old_index_on_error(synonyms_file):
+    """Test that an invalid file raises and leaves the loaded vocabulary in place."""
+    matcher = IngredientMatcher(str(synonyms_file))
+
+    _rewrite(synonyms_file, "dairy: milk\n")
+
+    with pytest.raises(ValueError):
+        matcher.reload()
+    assert matcher.get_all_synonyms("dairy") == ["milk", "whey"]
+
+
+def test_concurrent_scans_see_one_version(synonyms_file):
+    """Test that scans racing with reloads always see a complete version."""
+    versions = ["dairy: [milk, whey]\ngluten: [wheat]\n", "dairy: [cream]\nsoy: [soy, tofu]\n"]
+    matcher = IngredientMatcher(str(synonyms_file), engine="automaton")
+    text = "milk, whey, wheat, cream, soy, tofu"
+    expected = []
+    for version in versions:
+        _rewrite(synonyms_file, version)
+        matcher.reload()
+        expected.append(matcher.scan_text(text))
+
+    stop = threading.Event()
+    errors = []
+
+    def scan():
+        while not stop.is_set():
+            result = matcher.scan_text(text)
+            if result not in expected:
+                errors.append(result)
+
+    threads = [threading.Thread(target=scan) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for i in range(40):
+        _rewrite(synonyms_file, versions[i % 2])
+        matcher.reload()
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+
+
+def test_checker_reload_applies_changes(rules_file):
+    """Test that reload() swaps in new rules and reports the changed sources."""
+    checker = CrossReactivityChecker(str(rules_file), closure_depth=2)
+    assert checker.reload() == ()
+
+    _rewrite(rules_file, "cross_reactivity_rules:\n"
+                         "  - {source: peanuts, target: lupin, confidence: high}\n"
+                         "  - {source: latex, target: banana, confidence: high}\n"
+                         "  - {source: banana, target: avocado, confidence: high}\n")
+
+    assert checker.reload() == ("peanuts", "banana")
+    assert [r.target for r in checker.get_potential_reactions("peanuts", "high")] == ["lupin"]
+    assert checker.get_reachable(["latex"]) == {"banana", "avocado"}
+
+
+def test_checker_reload_reuses_unchanged_buckets(rules_file):
+    """Test that query results of unchanged sources are carried over as-is."""
+    checker = CrossReactivityChecker(str(rules_file))
+    latex = checker.get_potential_reactions("latex", "medium")
+
+    _rewrite(rules_file, rules_file.read_text() + "  - {source: kiwi, target: latex, confidence: low}\n")
+
+    assert checker.reload() == ("kiwi",)
+    assert checker.get_potential_reactions("latex", "medium") is latex
+
+
+def test_reload_rebuilds_cached_sub_indexes(tmp_path):
+    """Test that category-restricted scans see the reloaded vocabulary."""
+    synonyms_file = tmp_path / "synonyms.yaml"
+    synonyms_file.write_text("dairy:\n  - milk\n")
+    matcher = IngredientMatcher(str(synonyms_file))
+
+    assert not matcher.contains_any("whey", {"dairy"})
+    _rewrite(synonyms_file, "dairy:\n  - milk\n  - whey\n")
+    assert matcher.reload() == ("dairy",)
+
+    assert matcher.contains_any("whey", {"dairy"})
+    assert matcher.sub_index_stats()["builds"] == 2
+    assert matcher.sub_index_stats()["entries"] == 1
@@ -0,0 +1,62 @@
+"""
+Tests for compact scan results
+"""
+
+from array import array
+
+import pytest
+from food_inspector.results import ScanMatches
+
+
+@pytest.mark.parametrize("text", [
+    "Contains: wheat flour, soy lecithin, milk, eggs",
+    "milk chocolate (MILK, sugar, Milk Solids), malt extract, maltodextrin",
+    "Salt, water, vinegar",
+    "",
+])
+def test_to_dict_matches_scan_text(matcher, text):
+    """Test that the compact result converts back to the scan_text shape."""
+    expected = matcher.scan_text(text)
+    results = matcher.scan_compact(text).to_dict()
+
+    assert results == expected
+    assert list(results) == list(expected)
+
+
+def test_span_table_layout(matcher):
+    """Test that spans are stored as a flat integer array."""
+    result = matcher.scan_compact("Contains whey")
+
+    assert isinstance(result.spans, array)
+    assert result.spans.typecode == "i"
+    assert len(result.spans) == len(result) * ScanMatches.STRIDE
+
+
+def test_lazy_matched_text(matcher):
+    """Test that matched text is sliced from the source on access."""
+    result = matcher.scan_compact("Contains WHEY")
+
+    match = result[0]
+    assert (match.category, match.synonym) == ("dairy", "whey")
+    assert (match.start, match.end) == (9, 13)
+    assert match.matched_text == "WHEY"
+    assert result[-1].synonym == "whey"
+
+
+def test_categories_found(matcher):
+    """Test listing the distinct categories found."""
+    result = matcher.scan_compact("Contains: wheat flour, soy lecithin, milk, whey")
+
+    assert set(result.categories()) == {"gluten", "soy", "dairy"}
+
+
+def test_empty_result(matcher):
+    """Test an allergen-free scan."""
+    result = matcher.scan_compact("Salt, water")
+
+    assert not result
+    assert len(result) == 0
+    assert list(result) == []
+    assert result.to_dict() == {}
+    with pytest.raises(IndexError):
+        result[0]
@@ -0,0 +1,102 @@
+"""
+Tests for the fork-friendly shared index
+"""
+
+import gc
+import multiprocessing
+import sys
+
+import pytest
+from food_inspector.cross_reactivity import CrossReactivityChecker
+from food_inspector.matcher import IngredientMatcher
+from food_inspector.shared import SharedIndex, build_shared_index, prefork, save_shared_index
+
+
+@pytest.fixture(scope="module")
+def checker():
+    """Create a CrossReactivityChecker with the default rules."""
+    return CrossReactivityChecker()
+
+
+def test_scan_matches_matcher(matcher, label_texts, checker, tmp_path):
+    """Test that scans and lookups from a mapped file agree with the live objects."""
+    path = save_shared_index(matcher, str(tmp_path / "index.bin"), checker)
+
+    with SharedIndex(path) as shared:
+        for text in label_texts():
+            assert shared.scan_text(text) == matcher.scan_text(text)
+        assert shared.categories == tuple(matcher.synonyms)
+        assert shared.get_allergen_for_ingredient("WHEY") == matcher.get_allergen_for_ingredient("WHEY")
+        assert shared.get_allergen_for_ingredient("gravel") is None
+        assert list(shared.get_all_synonyms("soy")) == matcher.get_all_synonyms("soy")
+        for allergen in ("peanuts", "latex", "unknown"):
+            for confidence in (None, "medium", "high"):
+                assert shared.get_potential_reactions(allergen, confidence) == \
+                    checker.get_potential_reactions(allergen, confidence)
+
+
+def test_attach_to_shared_memory(checker):
+    """Test that an index placed in multiprocessing.shared_memory is used in place."""
+    shared_memory = pytest.importorskip("multiprocessing.shared_memory")
+    matcher = IngredientMatcher(engine="automaton")
+    data = build_shared_index(matcher, checker)
+    block = shared_memory.SharedMemory(create=True, size=len(data))
+    try:
+        block.buf[:len(data)] = data
+        shared = SharedIndex(buffer=block.buf)
+        assert shared.scan_text("whey, peanut") == matcher.scan_text("whey, peanut")
+        shared.close()
+    finally:
+        block.close()
+        block.unlink()
+
+
+def _scan_in_child(path, text, queue):
+    """Attach to the index file in a forked child and report a scan."""
+    with SharedIndex(path) as shared:
+        queue.put(shared.scan_text(text))
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fork is not available")
+def test_forked_workers_attach(tmp_path):
+    """Test that forked children attach to the same file and get the same results."""
+    matcher = IngredientMatcher(engine="automaton")
+    path = save_shared_index(matcher, str(tmp_path / "index.bin"))
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    text = "Contains wheat flour, whey and soy lecithin"
+
+    children = [context.Process(target=_scan_in_child, args=(path, text, queue)) for _ in range(2)]
+    for child in children:
+        child.start()
+    results = [queue.get(timeout=30) for _ in children]
+    for child in children:
+        child.join()
+
+    assert results == [matcher.scan_text(text)] * 2
+
+
+def test_rejects_other_buffers():
+    """Test that arbitrary bytes and missing sources raise ValueError."""
+    with pytest.raises(ValueError):
+        SharedIndex(buffer=b"not an index" * 20)
+    with pytest.raises(ValueError):
+        SharedIndex()
+
+
+@pytest.mark.skipif(not hasattr(gc, "freeze"), reason="gc.freeze needs Python 3.7+")
+def test_prefork_freezes_heap():
+    """Test that prefork() warms objects up and moves the heap to the permanent generation."""
+    calls = []
+
+    class Warmable:
+        def warmup(self):
+            calls.append(self)
+
+    warmable = Warmable()
+    try:
+        prefork(warmable, object())
+        assert calls == [warmable]
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
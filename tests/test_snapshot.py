@@ -0,0 +1,92 @@
+"""
+Tests for compiled index snapshots
+"""
+
+import os
+import shutil
+
+import pytest
+from food_inspector.matcher import IngredientMatcher
+from food_inspector.cross_reactivity import CrossReactivityChecker
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+@pytest.fixture
+def synonyms_file(tmp_path):
+    """Copy the synonyms file somewhere it can be edited."""
+    path = tmp_path / "ingredient_synonyms.yaml"
+    shutil.copy(os.path.join(DATA_DIR, "ingredient_synonyms.yaml"), path)
+    return str(path)
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path):
+    """Directory for snapshots."""
+    return str(tmp_path / "snapshots")
+
+
+@pytest.mark.parametrize("engine", ["regex", "automaton"])
+def test_matcher_snapshot_round_trip(synonyms_file, snapshot_dir, engine):
+    """Test that a matcher restored from a snapshot scans identically."""
+    text = "Contains: wheat flour, soy lecithin, milk solids, eggs"
+
+    built = IngredientMatcher(synonyms_file, engine=engine, snapshot_dir=snapshot_dir)
+    assert len(os.listdir(snapshot_dir)) == 1
+
+    restored = IngredientMatcher(synonyms_file, engine=engine, snapshot_dir=snapshot_dir)
+
+    assert restored.scan_text(text) == built.scan_text(text)
+    assert restored.reverse_map == built.reverse_map
+    assert restored.find_ingredient(text, "milk") == built.find_ingredient(text, "milk")
+
+
+def test_matcher_snapshot_is_used(synonyms_file, snapshot_dir, monkeypatch):
+    """Test that a fresh snapshot skips YAML parsing."""
+    IngredientMatcher(synonyms_file, snapshot_dir=snapshot_dir)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("YAML should not be parsed")
+
+    monkeypatch.setattr(IngredientMatcher, "_load_synonyms", fail)
+    IngredientMatcher(synonyms_file, snapshot_dir=snapshot_dir)
+
+
+def test_matcher_snapshot_rebuilds_when_yaml_changes(synonyms_file, snapshot_dir):
+    """Test that editing the synonyms file invalidates the snapshot."""
+    IngredientMatcher(synonyms_file, snapshot_dir=snapshot_dir)
+
+    with open(synonyms_file, "a") as f:
+        f.write("\nquinoa:\n  - quinoa\n")
+
+    matcher = IngredientMatcher(synonyms_file, snapshot_dir=snapshot_dir)
+
+    assert matcher.get_allergen_for_ingredient("quinoa") == "quinoa"
+    assert len(os.listdir(snapshot_dir)) == 2
+
+
+def test_corrupt_snapshot_is_rebuilt(synonyms_file, snapshot_dir):
+    """Test that an unreadable snapshot falls back to loading the YAML."""
+    IngredientMatcher(synonyms_file, snapshot_dir=snapshot_dir)
+    for name in os.listdir(snapshot_dir):
+        with open(os.path.join(snapshot_dir, name), "wb") as f:
+            f.write(b"not a snapshot")
+
+    matcher = IngredientMatcher(synonyms_file, snapshot_dir=snapshot_dir)
+
+    assert "dairy" in matcher.scan_text("Contains milk")
+
+
+def test_missing_file_with_snapshot_dir(snapshot_dir):
+    """Test that a missing synonyms file still raises FileNotFoundError."""
+    with pytest.raises(FileNotFoundError):
+        IngredientMatcher("missing.yaml", snapshot_dir=snapshot_dir)
+
+
+def test_checker_snapshot_round_trip(snapshot_dir):
+    """Test that a checker restored from a snapshot answers identically."""
+    built = CrossReactivityChecker(snapshot_dir=snapshot_dir)
+    restored = CrossReactivityChecker(snapshot_dir=snapshot_dir)
+
+    assert restored.get_all_rules() == built.get_all_rules()
+    assert restored.get_potential_reactions("dairy") == built.get_potential_reactions("dairy")
@@ -0,0 +1,142 @@
+"""
+Tests for hot-path instrumentation
+"""
+
+import json
+
+import pytest
+from food_inspector.matcher import IngredientMatcher
+from food_inspector.cross_reactivity import CrossReactivityChecker
+from food_inspector.stats import StatsCollector, StatsSink
+
+
+def _series(snapshot, kind, metric):
+    """Map each labelled series of a metric to its entry."""
+    return {tuple(sorted(e["labels"].items())): e for e in snapshot[kind].get(metric, [])}
+
+
+def test_collector_aggregates():
+    """Test counter and timing aggregation."""
+    stats = StatsCollector()
+    stats.count("hits")
+    stats.count("hits", 2)
+    stats.observe("work_seconds", 0.5, stage="a")
+    stats.observe("work_seconds", 1.5, stage="a")
+
+    snapshot = stats.snapshot()
+
+    assert snapshot["counters"]["hits"] == [{"labels": {}, "value": 3}]
+    assert snapshot["timings"]["work_seconds"] == [
+        {"labels": {"stage": "a"}, "count": 2, "sum_seconds": 2.0, "max_seconds": 1.5}
+    ]
+    assert json.loads(stats.to_json()) == snapshot
+
+    stats.reset()
+    assert stats.snapshot() == {"counters": {}, "timings": {}}
+
+
+def test_incomplete_sink_cannot_be_created():
+    """Test that a sink subclass missing a method fails at construction, not mid-scan."""
+    class CountsOnly(StatsSink):
+        def count(self, metric, value=1, **labels):
+            pass
+
+    class Complete(CountsOnly):
+        def observe(self, metric, seconds, **labels):
+            pass
+
+    with pytest.raises(TypeError):
+        CountsOnly()
+    with pytest.raises(TypeError):
+        StatsSink()
+    IngredientMatcher(engine="automaton", stats=Complete()).scan_text("milk")
+
+
+def test_prometheus_export():
+    """Test the Prometheus text exposition output."""
+    stats = StatsCollector()
+    stats.count("matches", 3, category='da"iry')
+    stats.observe("scan_seconds", 0.25, engine="regex")
+
+    text = stats.to_prometheus()
+
+    assert "# TYPE food_inspector_matches_total counter" in text
+    assert 'food_inspector_matches_total{category="da\\"iry"} 3' in text
+    assert "# TYPE food_inspector_scan_seconds summary" in text
+    assert 'food_inspector_scan_seconds_count{engine="regex"} 1' in text
+    assert 'food_inspector_scan_seconds_sum{engine="regex"} 0.25' in text
+    assert StatsCollector().to_prometheus() == ""
+
+
+def test_matcher_regex_instrumentation():
+    """Test per-category timings and counters from the regex engine."""
+    stats = StatsCollector()
+    matcher = IngredientMatcher(stats=stats)
+    stats.reset()
+
+    results = matcher.scan_text("Contains milk, whey and wheat")
+    snapshot = stats.snapshot()
+
+    category_times = _series(snapshot, "timings", "matcher_category_scan_seconds")
+    assert (("category", "dairy"),) in category_times
+    evaluated = _series(snapshot, "counters", "matcher_patterns_evaluated")
+    assert evaluated[(("category", "dairy"),)]["value"] == len(matcher.synonyms["dairy"])
+    matches = _series(snapshot, "counters", "matcher_matches")
+    assert matches[(("category", "dairy"),)]["value"] == 2
+    assert snapshot["counters"]["matcher_pattern_cache_hits"][0]["value"] == len(matcher.reverse_map)
+    assert results == IngredientMatcher().scan_text("Contains milk, whey and wheat")
+
+
+def test_matcher_automaton_instrumentation():
+    """Test that automaton scans and index builds are recorded."""
+    stats = StatsCollector()
+    matcher = IngredientMatcher(engine="automaton", stats=stats)
+
+    matcher.scan_text("Contains milk")
+    matcher.find_ingredient("Contains quinoa", "quinoa")
+    snapshot = stats.snapshot()
+
+    stages = {e["labels"]["stage"] for e in snapshot["timings"]["matcher_index_build_seconds"]}
+    assert stages == {"load", "patterns", "owner_index", "automaton"}
+    assert snapshot["counters"]["matcher_automaton_passes"][0]["value"] == 1
+    assert snapshot["counters"]["matcher_pattern_cache_misses"][0]["value"] == 1
+
+
+def test_matcher_without_stats_records_nothing():
+    """Test that instrumentation is off by default."""
+    matcher = IngredientMatcher()
+
+    assert matcher.stats is None
+    assert "dairy" in matcher.scan_text("Contains milk")
+
+
+def test_matcher_with_stats_can_use_process_pool():
+    """Test that worker copies of an instrumented matcher drop the sink."""
+    stats = StatsCollector()
+    matcher = IngredientMatcher(engine="automaton", stats=stats)
+    texts = ["milk"] * 8
+
+    results = list(matcher.scan_many(texts, workers=2, serial_threshold=4))
+
+    assert results == [matcher.scan_text(t) for t in texts]
+
+
+def test_checker_instrumentation():
+    """Test checker build stages and query hit/miss counters."""
+    stats = StatsCollector()
+    checker = CrossReactivityChecker(closure_depth=2, stats=stats)
+
+    checker.get_potential_reactions("dairy", "medium")
+    checker.get_potential_reactions("unknown")
+    checker.check_cross_reactivity("peanuts", "tree_nuts")
+    snapshot = stats.snapshot()
+
+    stages = {e["labels"]["stage"] for e in snapshot["timings"]["checker_index_build_seconds"]}
+    assert stages == {"load", "indexes", "closure"}
+    queries = _series(snapshot, "counters", "checker_queries")
+    assert queries[(("method", "get_potential_reactions"),)]["value"] == 2
+    hits = _series(snapshot, "counters", "checker_index_hits")
+    misses = _series(snapshot, "counters", "checker_index_misses")
+    assert hits[(("method", "get_potential_reactions"),)]["value"] == 1
+    assert misses[(("method", "get_potential_reactions"),)]["value"] == 1
+    assert hits[(("method", "check_cross_reactivity"),)]["value"] == 1
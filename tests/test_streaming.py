@@ -0,0 +1,128 @@
+"""
+Tests for streaming scans
+"""
+
+import io
+import json
+
+import pytest
+from food_inspector.cache import ScanCache
+from food_inspector.matcher import IngredientMatcher
+
+
+def _flatten(results):
+    """Flatten a scan_text result into sorted (category, synonym, match) tuples."""
+    return sorted(
+        (category, synonym, match)
+        for category, synonyms in results.items()
+        for synonym, matches in synonyms.items()
+        for match in matches
+    )
+
+
+def test_scan_stream_jsonl(matcher, tmp_path):
+    """Test scanning a JSONL dump record by record."""
+    path = tmp_path / "products.jsonl"
+    records = [
+        {"id": 1, "ingredients": "milk, sugar"},
+        {"id": 2, "ingredients": "water, salt"},
+        {"id": 3},
+    ]
+    path.write_text("\n".join(json.dumps(r) for r in records) + "\n")
+
+    results = list(matcher.scan_stream(str(path), field="ingredients"))
+
+    assert [record["id"] for record, _ in results] == [1, 2, 3]
+    assert "dairy" in results[0][1]
+    assert results[1][1] == {}
+    assert results[2][1] == {}
+
+
+def test_scan_stream_csv(matcher, tmp_path):
+    """Test scanning a CSV dump by column name."""
+    path = tmp_path / "products.csv"
+    path.write_text('id,ingredients\n1,"wheat flour, soy lecithin"\n2,vinegar\n')
+
+    results = list(matcher.scan_stream(str(path), field="ingredients"))
+
+    assert set(results[0][1]) == {"gluten", "soy"}
+    assert results[1][1] == {}
+
+
+def test_scan_stream_plain_lines(matcher):
+    """Test scanning an open text file with one label per line."""
+    handle = io.StringIO("Contains eggs\nSalt\n")
+
+    results = list(matcher.scan_stream(handle, format="text"))
+
+    assert [record for record, _ in results] == ["Contains eggs", "Salt"]
+    assert "eggs" in results[0][1]
+
+
+def test_scan_stream_with_workers(matcher):
+    """Test that pooled streaming keeps input order across batches."""
+    records = [{"text": f"milk {i}" if i % 2 else "water"} for i in range(25)]
+
+    results = list(matcher.scan_stream(records, field="text", batch_size=7, workers=2))
+
+    assert [record for record, _ in results] == records
+    assert [r for _, r in results] == [matcher.scan_text(r["text"]) for r in records]
+
+
+def test_scan_stream_requires_field_for_dicts(matcher):
+    """Test that dictionary records need a field name."""
+    with pytest.raises(ValueError):
+        list(matcher.scan_stream([{"text": "milk"}]))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 16, 1000])
+def test_scan_text_stream_matches_across_chunk_boundaries(matcher, chunk_size):
+    """Test that synonyms split across chunks are found exactly once."""
+    text = "Ingredients: milk solids, whey, maltodextrin, soy lecithin, wheat. " * 3
+
+    found = list(matcher.scan_text_stream(io.StringIO(text), chunk_size=chunk_size))
+
+    assert sorted(found) == _flatten(matcher.scan_text(text))
+
+
+def test_scan_text_stream_from_iterable(matcher):
+    """Test streaming from pre-split chunks, including a split synonym."""
+    found = list(matcher.scan_text_stream(["contains mi", "lk sol", "ids"]))
+
+    assert ("dairy", "milk solids", ("milk solids", 9, 20)) in found
+    assert ("dairy", "milk", ("milk", 9, 13)) in found
+
+
+def test_scan_text_stream_bypasses_result_cache():
+    """Test that chunk buffers are not stored in the matcher's result cache."""
+    cache = ScanCache()
+    matcher = IngredientMatcher(cache=cache)
+
+    found = list(matcher.scan_text_stream(io.StringIO("contains milk and wheat. " * 20), chunk_size=16))
+
+    assert found
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 11])
+def test_scan_text_stream_keeps_override_context(chunk_size):
+    """Test that compound and phrase overrides see their full context across chunks."""
+    matcher = IngredientMatcher(engine="automaton", exceptions={"malt": ["maltodextrin"]},
+                                allowed_phrases={"milk": ["coconut milk"]})
+    text = "maltodextrin, coconut milk, milk. " * 3
+
+    found = list(matcher.scan_text_stream(io.StringIO(text), chunk_size=chunk_size))
+
+    assert sorted(found) == _flatten(matcher.scan_text(text))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 16])
+def test_scan_text_stream_normalized_whitespace_runs(chunk_size):
+    """Test that matches spanning long whitespace runs survive chunking when normalizing."""
+    matcher = IngredientMatcher(normalize=True, allowed_phrases={"milk": ["coconut milk"]})
+    text = "contains milk" + " " * 40 + "solids, coconut" + "\n" * 30 + "milk."
+
+    found = list(matcher.scan_text_stream(io.StringIO(text), chunk_size=chunk_size))
+
+    assert sorted(found) == _flatten(matcher.scan_text(text))
+    assert ("dairy", "milk solids", ("milk" + " " * 40 + "solids", 9, 59)) in found
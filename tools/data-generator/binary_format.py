@@ -0,0 +1,123 @@
+"""Encoder for the binary, memory-mappable reference data bundle.
+
+The bundle holds the synonyms, cross-reactivity and scoring policy data in
+one file that consumers can mmap and query in place. All integers are
+little-endian, and every table starts on a 4-byte boundary.
+
+Layout:
+    header          HEADER: magic, format version, then (offset, count) of
+                    each section below
+    string_offsets  u32[count]: start of each string in string_data, plus
+                    the end of the last one
+    string_data     UTF-8 bytes of every distinct string
+    datasets        3 x (name, version, generated_at) string ids, in the
+                    order synonyms, cross-reactivity, scoring-policy
+    triggers        (trigger_id, name, first synonym, end synonym) per
+                    trigger, in trigger id order
+    synonyms        string id of each synonym, grouped by trigger
+    synonym_index   (lowercased synonym, trigger index) pairs sorted by the
+                    UTF-8 bytes of the synonym, for binary search
+    edges           (primary trigger index, related trigger index,
+                    description) per rule, in input order
+    adjacency       u32[triggers + 1] offsets into adjacency_edges per
+                    primary trigger
+    adjacency_edges edge indices grouped by primary trigger
+    policy          POLICY block, then (key, value) string ids for each
+                    severity level
+
+The layout constants live in food_inspector/reference_data.py, which reads
+the bundle, and the header, string table and u32 packing are shared with the
+package through food_inspector/flat_format.py.
+"""
+
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+# The package sources, for the layout shared with the reader
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent / 'src'))
+
+from food_inspector.flat_format import StringTable, pack_u32
+from food_inspector.reference_data import LAYOUT, POLICY
+
+DATASETS = ('synonyms', 'cross-reactivity', 'scoring-policy')
+
+
+def encode_reference_data(synonyms: Dict, cross_reactivity: Dict, scoring_policy: Dict) -> bytes:
+    """
+    Encode the three generated datasets as one binary bundle.
+
+    Args:
+        synonyms: Output of generate_synonyms_json()
+        cross_reactivity: Output of generate_cross_reactivity_json()
+        scoring_policy: Output of generate_scoring_policy_json()
+
+    Returns:
+        The bundle's bytes
+
+    Raises:
+        ValueError: If a rule refers to a trigger id with no synonyms entry
+    """
+    strings = StringTable()
+
+    datasets = []
+    for name, data in zip(DATASETS, (synonyms, cross_reactivity, scoring_policy)):
+        datasets += [strings(name), strings(data['version']), strings(data['generated_at'])]
+
+    entries = sorted(synonyms['data'], key=lambda entry: entry['trigger_id'])
+    trigger_index = {entry['trigger_id']: i for i, entry in enumerate(entries)}
+
+    triggers = []
+    synonym_ids = []
+    index_entries = []
+    for i, entry in enumerate(entries):
+        start = len(synonym_ids)
+        for synonym in entry['synonyms']:
+            synonym_ids.append(strings(synonym))
+            index_entries.append((synonym.lower().encode('utf-8'), i))
+        triggers += [entry['trigger_id'], strings(entry['canonical_name']), start, len(synonym_ids)]
+
+    synonym_index = []
+    for key, i in sorted(index_entries):
+        synonym_index += [strings(key.decode('utf-8')), i]
+
+    edges = []
+    by_primary: List[List[int]] = [[] for _ in entries]
+    for edge_id, rule in enumerate(cross_reactivity['data']):
+        for trigger_id in (rule['primary_trigger_id'], rule['related_trigger_id']):
+            if trigger_id not in trigger_index:
+                raise ValueError(f"Cross-reactivity rule refers to unknown trigger id {trigger_id}.")
+        primary = trigger_index[rule['primary_trigger_id']]
+        edges += [primary, trigger_index[rule['related_trigger_id']], strings(rule['description'])]
+        by_primary[primary].append(edge_id)
+
+    adjacency = [0]
+    adjacency_edges = []
+    for edge_ids in by_primary:
+        adjacency_edges += edge_ids
+        adjacency.append(len(adjacency_edges))
+
+    thresholds = scoring_policy['scoring_thresholds']
+    flare_mode = scoring_policy['flare_mode']
+    levels = scoring_policy['severity_levels']
+    policy = POLICY.pack(
+        thresholds['critical'], thresholds['high'], thresholds['medium'], thresholds['low'],
+        flare_mode['default_threshold'], flare_mode['min_threshold'], flare_mode['max_threshold'],
+        flare_mode['escalation_multiplier'], strings(flare_mode['description']), len(levels),
+    ) + pack_u32(string_id for key, value in levels.items() for string_id in (strings(key), strings(value)))
+
+    string_offsets, string_data = strings.encode()
+    sections = {
+        'string_offsets': (pack_u32(string_offsets), len(string_offsets)),
+        'string_data': (string_data, len(string_data)),
+        'datasets': (pack_u32(datasets), len(DATASETS)),
+        'triggers': (pack_u32(triggers), len(entries)),
+        'synonyms': (pack_u32(synonym_ids), len(synonym_ids)),
+        'synonym_index': (pack_u32(synonym_index), len(index_entries)),
+        'edges': (pack_u32(edges), len(cross_reactivity['data'])),
+        'adjacency': (pack_u32(adjacency), len(adjacency)),
+        'adjacency_edges': (pack_u32(adjacency_edges), len(adjacency_edges)),
+        'policy': (policy, len(policy)),
+    }
+
+    return LAYOUT.pack(sections)
@@ -5,12 +5,23 @@ Main script for generating versioned JSON data files.
 Usage:
     python generate_data.py --version 1 --output ../output
     python generate_data.py --type synonyms --version 1
+    python generate_data.py --format both --version 1
+
+Outputs are regenerated only when their inputs change: manifest.json in the
+output directory records a hash of each artifact's generator sources and
+settings and of the bytes written.
 """
 
 import argparse
+import hashlib
 import json
+import os
+import subprocess
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Dict, Iterable, Optional
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
@@ -18,6 +29,132 @@ sys.path.insert(0, str(Path(__file__).parent))
 from generators.synonyms import generate_synonyms_json
 from generators.cross_reactivity import generate_cross_reactivity_json
 from generators.scoring_policy import generate_scoring_policy_json
+from binary_format import encode_reference_data
+
+GENERATOR_DIR = Path(__file__).parent
+
+# Sources every artifact depends on: this script renders and writes them all
+COMMON_SOURCES = ('generate_data.py', 'models/__init__.py')
+
+# Generator function and source files each data type is generated from
+GENERATORS = {
+    'synonyms': (generate_synonyms_json, ('generators/synonyms.py',) + COMMON_SOURCES),
+    'cross-reactivity': (generate_cross_reactivity_json, ('generators/cross_reactivity.py',) + COMMON_SOURCES),
+    'scoring-policy': (generate_scoring_policy_json, ('generators/scoring_policy.py',) + COMMON_SOURCES),
+}
+# The bundle layout and flat-table helpers come from the package
+BINARY_SOURCES = ('binary_format.py', '../../src/food_inspector/reference_data.py',
+                  '../../src/food_inspector/flat_format.py') + COMMON_SOURCES
+
+# generated_at when SOURCE_DATE_EPOCH is unset and git history is unavailable
+DEFAULT_SOURCE_DATE_EPOCH = 0
+
+MANIFEST_NAME = 'manifest.json'
+
+
+def sha256_hex(content: bytes) -> str:
+    """Hex SHA-256 digest of some bytes."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def input_digest(sources: Iterable[str], *settings: str) -> str:
+    """
+    Hash the generator sources and settings an artifact is produced from.
+    
+    Args:
+        sources: Source files, relative to the data-generator directory
+        settings: Other values that change the output bytes
+        
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    for source in sources:
+        digest.update(source.encode('utf-8') + b'\0')
+        digest.update((GENERATOR_DIR / source).read_bytes() + b'\0')
+    for setting in settings:
+        digest.update(setting.encode('utf-8') + b'\0')
+    return digest.hexdigest()
+
+
+def commit_epoch(sources: Iterable[str]) -> Optional[int]:
+    """Commit time of the last commit touching the sources, or None outside a git checkout."""
+    try:
+        result = subprocess.run(
+            ['git', 'log', '-1', '--format=%ct', '--', *sources],
+            cwd=GENERATOR_DIR, capture_output=True, text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    output = result.stdout.strip()
+    return int(output) if output else None
+
+
+def source_date(sources: Iterable[str]) -> str:
+    """
+    Deterministic generated_at timestamp for a set of sources.
+    
+    Uses SOURCE_DATE_EPOCH when set (the reproducible-builds convention),
+    otherwise the time of the last commit touching the sources, and
+    DEFAULT_SOURCE_DATE_EPOCH outside a git checkout. File modification
+    times are never used, so a fresh clone or a touch does not change the
+    output.
+    
+    Args:
+        sources: Source files, relative to the data-generator directory
+        
+    Returns:
+        ISO 8601 UTC timestamp
+    """
+    epoch = os.environ.get('SOURCE_DATE_EPOCH')
+    if epoch is None:
+        epoch = commit_epoch(sources)
+    if epoch is None:
+        epoch = DEFAULT_SOURCE_DATE_EPOCH
+    return datetime.fromtimestamp(int(epoch), timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def load_manifest(path: Path) -> Dict[str, Dict[str, str]]:
+    """Read the artifact manifest, or start an empty one."""
+    try:
+        with open(path) as f:
+            return json.load(f).get('artifacts', {})
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def is_fresh(path: Path, entry: Optional[Dict[str, str]], inputs: str) -> bool:
+    """True when an artifact was built from these inputs and has not been modified since."""
+    if entry is None or entry.get('inputs') != inputs or not path.exists():
+        return False
+    return sha256_hex(path.read_bytes()) == entry.get('output')
+
+
+def write_if_changed(path: Path, content: bytes) -> bool:
+    """
+    Atomically replace a file, unless it already holds exactly this content.
+    
+    Returns:
+        True if the file was written
+    """
+    if path.exists() and path.read_bytes() == content:
+        return False
+    temporary = path.with_name(path.name + '.tmp')
+    temporary.write_bytes(content)
+    os.replace(temporary, path)
+    return True
+
+
+def render_json(data: Dict, pretty: bool) -> bytes:
+    """Serialize generated data exactly as it is written to disk."""
+    if pretty:
+        return (json.dumps(data, indent=2) + '\n').encode('utf-8')
+    return json.dumps(data).encode('utf-8')
+
+
+def generate(data_type: str, version: str, generated_at: str) -> Dict:
+    """Run one generator (module-level so it can run in a worker process)."""
+    return GENERATORS[data_type][0](version=version, generated_at=generated_at)
 
 
 def main():
@@ -47,9 +184,30 @@ def main():
         action='store_true',
         help='Pretty-print JSON with indentation'
     )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Generators to run in parallel (default: number of CPUs)'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Regenerate every artifact even if the manifest says it is up to date'
+    )
+    parser.add_argument(
+        '--format',
+        choices=['json', 'binary', 'both'],
+        default='json',
+        help='Output format: one JSON file per type, one memory-mappable binary '
+             'bundle of all types, or both (default: json)'
+    )
     
     args = parser.parse_args()
     
+    if args.format != 'json' and args.type != 'all':
+        parser.error('the binary bundle contains every data type; use --type all')
+    
     # Create output directory if it doesn't exist
     output_dir = Path(args.output)
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -57,15 +215,8 @@ def main():
     # Determine semantic version string
     version_str = f"{args.version}.0.0"
     
-    # Generate requested data
-    generators = {
-        'synonyms': (generate_synonyms_json, f'synonyms.v{args.version}.json'),
-        'cross-reactivity': (generate_cross_reactivity_json, f'cross-reactivity.v{args.version}.json'),
-        'scoring-policy': (generate_scoring_policy_json, f'scoring-policy.v{args.version}.json'),
-    }
-    
     if args.type == 'all':
-        types_to_generate = generators.keys()
+        types_to_generate = list(GENERATORS)
     else:
         types_to_generate = [args.type]
     
@@ -73,30 +224,80 @@ def main():
     print(f"Output directory: {output_dir.absolute()}")
     print()
     
-    for data_type in types_to_generate:
-        generator_func, filename = generators[data_type]
-        
-        print(f"Generating {data_type}...", end=' ')
+    manifest_path = output_dir / MANIFEST_NAME
+    manifest = load_manifest(manifest_path)
+    
+    # Work out which artifacts are out of date
+    artifacts = {}
+    inputs = {}
+    # Part of every artifact's inputs, so a new timestamp regenerates it
+    generated_at = {data_type: source_date(GENERATORS[data_type][1]) for data_type in GENERATORS}
+    for data_type in GENERATORS:
+        sources = GENERATORS[data_type][1]
+        inputs[data_type] = input_digest(sources, version_str, generated_at[data_type])
+        if args.format != 'binary' and data_type in types_to_generate:
+            artifacts[f'{data_type}.v{args.version}.json'] = (
+                data_type, input_digest(sources, version_str, generated_at[data_type], f'pretty={args.pretty}')
+            )
+    if args.format != 'json':
+        artifacts[f'reference-data.v{args.version}.bin'] = (
+            None, input_digest(BINARY_SOURCES, *(inputs[t] for t in GENERATORS))
+        )
+    
+    stale = {
+        filename: artifact for filename, artifact in artifacts.items()
+        if args.force or not is_fresh(output_dir / filename, manifest.get(filename), artifact[1])
+    }
+    for filename in artifacts:
+        if filename not in stale:
+            print(f"= {output_dir / filename} (unchanged)")
+    
+    # Only generate the data the stale artifacts need; the bundle needs all of it
+    needed = {data_type for data_type, _ in stale.values() if data_type is not None}
+    if any(data_type is None for data_type, _ in stale.values()):
+        needed = set(GENERATORS)
+    needed = [data_type for data_type in GENERATORS if data_type in needed]
+    
+    generated = {}
+    try:
+        jobs = min(args.jobs, len(needed))
+        calls = [(data_type, version_str, generated_at[data_type]) for data_type in needed]
+        if jobs > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                results = list(pool.map(generate, *zip(*calls)))
+        else:
+            results = [generate(*call) for call in calls]
+        generated = dict(zip(needed, results))
+    except Exception as e:
+        print(f"✗ Error: {e}")
+        sys.exit(1)
+    
+    for filename, (data_type, digest) in stale.items():
+        print(f"Generating {filename}...", end=' ')
         
         try:
-            # Generate data
-            data = generator_func(version=version_str)
+            if data_type is None:
+                content = encode_reference_data(
+                    generated['synonyms'], generated['cross-reactivity'], generated['scoring-policy']
+                )
+            else:
+                content = render_json(generated[data_type], args.pretty)
             
             # Write to file
             output_path = output_dir / filename
-            with open(output_path, 'w') as f:
-                if args.pretty:
-                    json.dump(data, f, indent=2)
-                    f.write('\n')  # Add trailing newline
-                else:
-                    json.dump(data, f)
+            written = write_if_changed(output_path, content)
+            manifest[filename] = {'inputs': digest, 'output': sha256_hex(content)}
             
-            print(f"✓ {output_path}")
+            print(f"✓ {output_path}" if written else f"= {output_path} (same content)")
             
         except Exception as e:
             print(f"✗ Error: {e}")
             sys.exit(1)
     
+    if stale:
+        manifest_content = json.dumps({'artifacts': manifest}, indent=2, sort_keys=True) + '\n'
+        write_if_changed(manifest_path, manifest_content.encode('utf-8'))
+    
     print()
     print("Generation complete!")
     print()
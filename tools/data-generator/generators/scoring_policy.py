@@ -3,7 +3,7 @@
 import json
 import sys
 from datetime import datetime
-from typing import Dict
+from typing import Dict, Optional
 from pathlib import Path
 
 # Add parent to path for imports
@@ -12,12 +12,13 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from models import ScoringThresholds, FlareMode
 
 
-def generate_scoring_policy_json(version: str = "1.0.0") -> Dict:
+def generate_scoring_policy_json(version: str = "1.0.0", generated_at: Optional[str] = None) -> Dict:
     """
     Generate scoring policy JSON data compatible with MAUI app.
     
     Args:
         version: Semantic version string (MAJOR.MINOR.PATCH)
+        generated_at: ISO 8601 timestamp to embed (default: current UTC time)
         
     Returns:
         Dictionary ready for JSON serialization
@@ -42,7 +43,7 @@ def generate_scoring_policy_json(version: str = "1.0.0") -> Dict:
     # Build output structure
     output = {
         "version": version,
-        "generated_at": datetime.utcnow().isoformat() + "Z",
+        "generated_at": generated_at or datetime.utcnow().isoformat() + "Z",
         "scoring_thresholds": {
             "critical": thresholds.critical,
             "high": thresholds.high,
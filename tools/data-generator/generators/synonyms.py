@@ -3,7 +3,7 @@
 import json
 import sys
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional
 from pathlib import Path
 
 # Add parent to path for imports
@@ -12,12 +12,13 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from models import IngredientTrigger, Synonym
 
 
-def generate_synonyms_json(version: str = "1.0.0") -> Dict:
+def generate_synonyms_json(version: str = "1.0.0", generated_at: Optional[str] = None) -> Dict:
     """
     Generate synonyms JSON data compatible with MAUI app.
     
     Args:
         version: Semantic version string (MAJOR.MINOR.PATCH)
+        generated_at: ISO 8601 timestamp to embed (default: current UTC time)
         
     Returns:
         Dictionary ready for JSON serialization
@@ -195,7 +196,7 @@ def generate_synonyms_json(version: str = "1.0.0") -> Dict:
     # Build output structure
     output = {
         "version": version,
-        "generated_at": datetime.utcnow().isoformat() + "Z",
+        "generated_at": generated_at or datetime.utcnow().isoformat() + "Z",
         "data": list(grouped_synonyms.values())
     }
     